@@ -0,0 +1,199 @@
+"""
+myAgentAI - Admission Control
+===============================
+Per-user concurrency and rate limits, so one user can't monopolise the
+OpenAI quota or the DB pool. Limits come from the user's plan
+(PLAN_LIMITS in app/utils/constants.py), per scope ("pipeline", "read").
+
+    @router.post("/feedback", dependencies=[Depends(admission("pipeline"))])
+
+or, where only some callers do the work (a coalesced /email/run), inside
+the handler with `async with admitted(user, "pipeline"):`.
+
+A request is admitted only if the user has a free concurrency slot AND a
+token in the scope's bucket; otherwise it gets 429 with Retry-After.
+
+State lives in a small SQLite file (ADMISSION_DB_PATH) so every uvicorn
+worker on the host sees the same counters; each check is one short
+`BEGIN IMMEDIATE` transaction. Slots are leases that expire after
+ADMISSION_LEASE_SECONDS, so a crashed worker can't leak them. If the
+limiter store itself fails, requests are let through (logged) rather than
+taking the API down.
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.response import error_response
+from app.core.security import get_current_user
+from app.models.user import User
+from app.utils.constants import DEFAULT_PLAN, PLAN_LIMITS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS buckets (
+        user_id INTEGER NOT NULL,
+        scope TEXT NOT NULL,
+        tokens REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (user_id, scope)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leases (
+        lease_id TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        scope TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS leases_user_scope ON leases (user_id, scope)",
+)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def plan_limits(plan: Optional[str], scope: str) -> Dict[str, int]:
+    """Limits for `scope` under `plan`; unknown plans get the default plan's."""
+    return PLAN_LIMITS.get(plan or DEFAULT_PLAN, PLAN_LIMITS[DEFAULT_PLAN])[scope]
+
+
+class AdmissionController:
+    """Cross-process per-user limiter backed by SQLite."""
+
+    def __init__(self, path: str, lease_seconds: float):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()   # One connection per threadpool thread
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, user_id: int, scope: str, limits: Dict[str, int]) -> str:
+        """Take a slot and a token; returns the lease id or raises AdmissionRejected."""
+        conn = self._connection()
+        now = time.time()
+        per_second = limits["per_minute"] / 60.0
+
+        conn.execute("BEGIN IMMEDIATE")  # Serialises all workers for this check
+        try:
+            conn.execute(
+                "DELETE FROM leases WHERE user_id = ? AND scope = ? AND expires_at <= ?",
+                (user_id, scope, now),
+            )
+            (in_flight,) = conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE user_id = ? AND scope = ?",
+                (user_id, scope),
+            ).fetchone()
+            if in_flight >= limits["concurrency"]:
+                raise AdmissionRejected(
+                    f"Too many concurrent requests ({limits['concurrency']} allowed)",
+                    settings.ADMISSION_BUSY_RETRY_SECONDS,
+                )
+
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE user_id = ? AND scope = ?",
+                (user_id, scope),
+            ).fetchone()
+            capacity = float(limits["per_minute"])
+            tokens = capacity if row is None else min(
+                capacity, row[0] + max(0.0, now - row[1]) * per_second
+            )
+            if tokens < 1:
+                raise AdmissionRejected(
+                    f"Rate limit exceeded ({limits['per_minute']} requests/minute)",
+                    (1 - tokens) / per_second,
+                )
+
+            lease_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (user_id, scope, tokens, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (user_id, scope, tokens - 1, now),
+            )
+            conn.execute(
+                "INSERT INTO leases (lease_id, user_id, scope, expires_at) VALUES (?, ?, ?, ?)",
+                (lease_id, user_id, scope, now + self.lease_seconds),
+            )
+            conn.execute("COMMIT")
+            return lease_id
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release(self, lease_id: str) -> None:
+        self._connection().execute("DELETE FROM leases WHERE lease_id = ?", (lease_id,))
+
+
+admission_controller = AdmissionController(
+    path=settings.ADMISSION_DB_PATH,
+    lease_seconds=settings.ADMISSION_LEASE_SECONDS,
+)
+
+
+@asynccontextmanager
+async def admitted(user: User, scope: str) -> AsyncIterator[None]:
+    """Hold one of `user`'s `scope` slots for the block, or raise 429."""
+    if not settings.ADMISSION_ENABLED:
+        yield
+        return
+
+    limits = plan_limits(user.plan, scope)
+    lease_id = None
+    try:
+        lease_id = await run_in_threadpool(
+            admission_controller.acquire, user.id, scope, limits
+        )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=error_response(message=e.reason),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"Admission store unavailable, admitting request: {e}")
+
+    try:
+        yield
+    finally:
+        if lease_id is not None:
+            try:
+                await run_in_threadpool(admission_controller.release, lease_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to release admission lease: {e}")  # Expires on its own
+
+
+def admission(scope: str):
+    """FastAPI dependency: admit the current user for `scope` or answer 429."""
+
+    async def dependency(current_user: User = Depends(get_current_user)):
+        async with admitted(current_user, scope):
+            yield
+
+    return dependency
@@ -0,0 +1,74 @@
+"""
+myAgentAI - Background Jobs
+=============================
+Minimal in-process scheduler for periodic maintenance jobs and
+long-running one-off tasks (e.g. inbox backfills).
+
+Jobs are started from the app startup hook and cancelled on shutdown.
+A failing run is logged and retried on the next tick — it never kills the loop.
+Finished one-off tasks drop out of the registry, so per-user / per-job
+names (push:{user_id}, backfill:{job_id}) don't accumulate.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+async def _run_periodically(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable[None]],
+) -> None:
+    """Run `job` every `interval_seconds`, first run one interval after start."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background job '{name}' failed: {e}")
+
+
+def start_periodic_task(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable[None]],
+) -> None:
+    """Schedule a periodic job. Starting a job twice is a no-op."""
+    if name in _tasks and not _tasks[name].done():
+        return
+    _tasks[name] = asyncio.create_task(
+        _run_periodically(name, interval_seconds, job), name=name
+    )
+    logger.info(f"Background job '{name}' scheduled every {interval_seconds}s")
+
+
+def start_background_task(name: str, job: Callable[[], Awaitable[None]]) -> bool:
+    """Run `job` once in the background. Returns False if `name` is already running."""
+    if name in _tasks and not _tasks[name].done():
+        return False
+    task = asyncio.create_task(job(), name=name)
+    task.add_done_callback(lambda done: _forget(name, done))
+    _tasks[name] = task
+    return True
+
+
+def _forget(name: str, task: asyncio.Task) -> None:
+    # A newer task may already be registered under the same name
+    if _tasks.get(name) is task:
+        del _tasks[name]
+
+
+async def stop_background_tasks() -> None:
+    """Cancel all running background jobs and wait for them to exit."""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,48 @@
+"""
+myAgentAI - HTTP Conditional Requests
+=======================================
+ETag / If-None-Match helpers for polled read endpoints.
+
+An endpoint derives a cheap version stamp (e.g. row count and max id of the
+user's data), turns it into an ETag, and returns 304 before doing any real
+work when the client already holds that version.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"  # Always revalidate; never share across users
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the given version components."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
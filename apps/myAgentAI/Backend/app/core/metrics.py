@@ -0,0 +1,245 @@
+"""
+myAgentAI - Metrics
+=====================
+Lightweight in-process metrics with Prometheus text exposition.
+
+  - Histogram / Counter / Gauge primitives with optional labels
+  - A process-wide `registry` rendered by GET /metrics
+  - `track_stage()` — times a pipeline stage into a histogram and, when a
+    run is being collected, into that run's per-stage breakdown
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[str, ...]
+GaugeCallback = Callable[[], Union[float, Dict[LabelValues, float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, k)} {v}" for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """
+    Point-in-time value, either set directly or read from a callback.
+    A labelled gauge's callback returns {label_values_tuple: value}.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Optional[GaugeCallback] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            value = self._callback()
+            if not isinstance(value, dict):
+                return self.header() + [f"{self.name} {value}"]
+            items = list(value.items())
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, k)} {v}" for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (seconds by convention)."""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            inf = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[GaugeCallback] = None,
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names, callback=callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets=buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ── Pipeline Stage Timing ────────────────────────────────
+
+STAGE_LATENCY = registry.histogram(
+    "pipeline_stage_duration_seconds",
+    "Latency of individual pipeline stages.",
+    ["stage"],
+)
+
+
+class StageTimings:
+    """Per-run accumulator of stage durations."""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        entry = self._stages.setdefault(stage, {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += seconds * 1000
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {"count": int(e["count"]), "total_ms": round(e["total_ms"], 2)}
+            for stage, e in self._stages.items()
+        }
+
+
+_current_run: ContextVar[Optional[StageTimings]] = ContextVar(
+    "current_run_timings", default=None
+)
+
+
+@contextmanager
+def collect_stage_timings() -> Iterator[StageTimings]:
+    """Collect every `track_stage` inside this block into one breakdown."""
+    timings = StageTimings()
+    token = _current_run.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """Time a block as `stage`. Works in both sync and async code."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, stage=stage)
+        run = _current_run.get()
+        if run is not None:
+            run.add(stage, elapsed)
@@ -0,0 +1,46 @@
+"""
+myAgentAI - Work Priority Gate
+================================
+Lets low-priority background work (e.g. inbox backfill) yield to
+interactive requests in the same process.
+
+    async with pipeline_gate.interactive():   # user-facing run
+        ...
+    await pipeline_gate.wait_for_idle()       # background job, between units
+
+Background work only starts a new unit while no interactive run is
+active; it never pre-empts a unit already in flight.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class PriorityGate:
+    """Counts active interactive runs; background work waits for zero."""
+
+    def __init__(self):
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @asynccontextmanager
+    async def interactive(self):
+        self._active += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if self._active == 0:
+                self._idle.set()
+
+    async def wait_for_idle(self) -> None:
+        await self._idle.wait()
+
+
+pipeline_gate = PriorityGate()
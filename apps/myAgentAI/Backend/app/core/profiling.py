@@ -0,0 +1,278 @@
+"""
+myAgentAI - On-Demand Request Profiling
+=========================================
+Statistical sampling profiler for individual requests, safe to leave
+enabled in production.
+
+A request is profiled when it carries `X-Profile-Token: <PROFILING_ADMIN_TOKEN>`
+or is picked by PROFILING_SAMPLE_RATE. Every other request pays one header
+scan and (if sampling is on) one random() call.
+
+While a request is profiled, a sampler thread wakes every
+PROFILING_INTERVAL_MS and records one stack per sample:
+
+  [cpu];…        the request (or a task it spawned) is running on the loop
+  [await];…      it is suspended — the coroutine await chain, e.g. waiting
+                 on the DB, OpenAI or a threadpool call
+
+so the profile covers wall time, not just CPU. Tasks spawned while handling
+the request (single-flight runs, background work) are attributed to it via
+a task factory installed only while a profile is active.
+
+Stopping never blocks the event loop: the sampler is signalled, and after
+its last tick it hands the profile back to the loop, which files it in a
+bounded in-memory ring (PROFILING_MAX_PROFILES) as collapsed stacks — the
+input format of flamegraph.pl and speedscope. The admin endpoints in
+app/routers/profiling.py serve them (same `X-Profile-Token` header; those
+reads are never profiled themselves). The response carries `X-Profile-Id`.
+"""
+
+import asyncio
+import contextvars
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_PROFILE_HEADER = b"x-profile-token"
+_ADMIN_PREFIX = "/admin/profiles"
+_active_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename.replace(os.sep, "/")
+    short = "/".join(path.rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({short}:{code.co_firstlineno})".replace(";", ":")
+
+
+_LOOP_CALLBACK = asyncio.events.Handle._run.__code__  # Frames above it are loop machinery
+
+
+def _thread_stack(frame, max_depth: int) -> List[str]:
+    labels = []
+    while frame is not None and frame.f_code is not _LOOP_CALLBACK and len(labels) < max_depth:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return labels[::-1]
+
+
+def _await_stack(task: asyncio.Task, max_depth: int) -> List[str]:
+    """Where a suspended task is waiting, outermost coroutine first."""
+    labels = []
+    awaitable: Any = task.get_coro()
+    while awaitable is not None and len(labels) < max_depth:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame.f_code))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    if awaitable is not None:
+        labels.append(f"<{type(awaitable).__name__}>")  # Future, Task, …
+    return labels
+
+
+# ── Profile + sampler ────────────────────────────────────
+
+class RequestProfile:
+    """Collapsed stacks for one request, filled by a sampler thread."""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.status_code: Optional[int] = None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+        self._stop = threading.Event()
+        self._on_stopped: Optional[Callable[["RequestProfile"], None]] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task) -> None:
+        self.tasks.add(task)
+        threading.Thread(
+            target=self._sample_loop,
+            args=(loop, threading.get_ident()),
+            name=f"profiler-{self.id}",
+            daemon=True,
+        ).start()
+
+    def stop(
+        self, duration_ms: float, on_stopped: Callable[["RequestProfile"], None]
+    ) -> None:
+        """
+        Signal the sampler and return at once (no join on the event loop).
+        `on_stopped(profile)` runs on the loop after the last sample is taken.
+        """
+        self.duration_ms = round(duration_ms, 2)
+        self._on_stopped = on_stopped
+        self._stop.set()
+
+    def _sample_loop(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        try:
+            self._sample(loop, loop_thread_id)
+        finally:
+            try:
+                loop.call_soon_threadsafe(self._on_stopped, self)
+            except RuntimeError:
+                pass  # Loop closed (shutdown): nothing left to file it with
+
+    def _sample(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int) -> None:
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        depth = settings.PROFILING_MAX_DEPTH
+        while not self._stop.wait(interval):
+            try:
+                running = asyncio.current_task(loop)
+                for task in list(self.tasks):
+                    if task.done():
+                        continue
+                    if task is running:
+                        frame = sys._current_frames().get(loop_thread_id)
+                        stack = ["[cpu]"] + _thread_stack(frame, depth)
+                    else:
+                        stack = ["[await]"] + _await_stack(task, depth)
+                    self.stacks[";".join(stack)] += 1
+                self.samples += 1
+            except Exception:
+                continue  # Frames/tasks changed under us; skip this tick
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status_code": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "samples": self.samples,
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+        }
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format: `frame;frame;frame count`."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded ring of finished profiles, newest last."""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        return [p.summary() for p in reversed(self._profiles.values())]
+
+
+profile_store = ProfileStore(settings.PROFILING_MAX_PROFILES)
+
+
+# ── Task attribution (installed only while profiling) ────
+
+_active_count = 0
+_previous_factory = None
+
+
+def _profiling_task_factory(loop, coro, **kwargs):
+    task = (
+        _previous_factory(loop, coro, **kwargs) if _previous_factory is not None
+        else asyncio.Task(coro, loop=loop, **kwargs)
+    )
+    profile = _active_profile.get()  # Runs in the creating task's context
+    if profile is not None:
+        profile.tasks.add(task)
+    return task
+
+
+def _attach_factory(loop) -> None:
+    global _active_count, _previous_factory
+    if _active_count == 0:
+        _previous_factory = loop.get_task_factory()
+        loop.set_task_factory(_profiling_task_factory)
+    _active_count += 1
+
+
+def _detach_factory(loop) -> None:
+    global _active_count, _previous_factory
+    _active_count -= 1
+    if _active_count == 0:
+        loop.set_task_factory(_previous_factory)
+        _previous_factory = None
+
+
+# ── ASGI middleware ──────────────────────────────────────
+
+def is_admin_token(token: str) -> bool:
+    expected = settings.PROFILING_ADMIN_TOKEN
+    return bool(expected) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware: profiles triggered requests, passes others straight through."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _trigger(self, scope) -> Optional[str]:
+        if scope["path"].startswith(_ADMIN_PREFIX):
+            return None  # Reading profiles must not push them out of the ring
+        for name, value in scope["headers"]:
+            if name == _PROFILE_HEADER:
+                return "header" if is_admin_token(value.decode("latin-1")) else None
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate > 0 and random.random() < rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        trigger = self._trigger(scope)
+        if trigger is None or _active_count >= settings.PROFILING_MAX_CONCURRENT:
+            return await self.app(scope, receive, send)
+
+        loop = asyncio.get_running_loop()
+        profile = RequestProfile(scope["method"], scope["path"], trigger)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.id.encode("ascii"))
+                ]
+            await send(message)
+
+        token = _active_profile.set(profile)
+        _attach_factory(loop)
+        started = time.perf_counter()
+        profile.start(loop, asyncio.current_task())
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.stop((time.perf_counter() - started) * 1000, on_stopped=profile_store.add)
+            _detach_factory(loop)
+            _active_profile.reset(token)
@@ -2,17 +2,23 @@
 myAgentAI - Security Module
 ============================
 JWT authentication, password hashing, and current-user dependency.
+
+Authenticated users are cached in-process for a short TTL (keyed by the
+JWT `sub` + `exp`), so polling endpoints don't hit the users table on every
+request. bcrypt runs in the threadpool to keep the event loop responsive.
 """
 
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, event
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
 from app.db.session import get_db
@@ -25,15 +31,16 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 # ── Password Utilities ──────────────────────────────────
+# bcrypt is deliberately slow (~100ms+); run it off the event loop.
 
-def hash_password(password: str) -> str:
+async def hash_password(password: str) -> str:
     """Hash a plaintext password using bcrypt."""
-    return pwd_context.hash(password)
+    return await run_in_threadpool(pwd_context.hash, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plaintext password against its bcrypt hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await run_in_threadpool(pwd_context.verify, plain_password, hashed_password)
 
 
 # ── JWT Utilities ────────────────────────────────────────
@@ -48,6 +55,49 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+# ── Authenticated-User Cache ────────────────────────────
+
+# (sub, exp) → (detached User, expires_at monotonic)
+_user_cache: Dict[Tuple[str, int], Tuple[User, float]] = {}
+
+
+def _cache_get(key: Tuple[str, int]) -> Optional[User]:
+    entry = _user_cache.get(key)
+    if entry is None:
+        return None
+    if entry[1] <= time.monotonic():
+        _user_cache.pop(key, None)
+        return None
+    return entry[0]
+
+
+def _cache_put(key: Tuple[str, int], user: User, token_exp: int) -> None:
+    token_ttl = token_exp - datetime.now(timezone.utc).timestamp()
+    ttl = min(settings.USER_CACHE_TTL_SECONDS, token_ttl)
+    if ttl <= 0:
+        return
+    if len(_user_cache) >= settings.USER_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for k in [k for k, (_, exp) in _user_cache.items() if exp <= now]:
+            del _user_cache[k]
+        while len(_user_cache) >= settings.USER_CACHE_MAX_ENTRIES:
+            del _user_cache[next(iter(_user_cache))]  # Oldest insertion
+    _user_cache[key] = (user, time.monotonic() + ttl)
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Drop every cached token entry for this user."""
+    sub = str(user_id)
+    for key in [k for k in _user_cache if k[0] == sub]:
+        _user_cache.pop(key, None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user_cache(target.id)
+
+
 # ── Dependency: Current User ────────────────────────────
 
 async def get_current_user(
@@ -56,7 +106,7 @@ async def get_current_user(
 ) -> User:
     """
     FastAPI dependency that extracts and validates the current user
-    from the JWT Bearer token.
+    from the JWT Bearer token. Served from the user cache when possible.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -73,8 +123,17 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
+    cache_key = (user_id, int(payload.get("exp", 0)))
+    user = _cache_get(cache_key)
+    if user is not None:
+        return user
+
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+
+    # Detach so the cached instance is never tied to a closed session
+    db.expunge(user)
+    _cache_put(cache_key, user, cache_key[1])
     return user
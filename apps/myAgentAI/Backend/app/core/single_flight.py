@@ -0,0 +1,106 @@
+"""
+myAgentAI - Single-Flight Coalescing
+======================================
+Collapses concurrent calls for the same key into one execution.
+
+    result, shared = await run_flights.do(("email_run", user_id), work)
+
+The first caller starts `work()` in its own task; callers arriving while it
+is in flight attach to that task and receive the same result (or
+exception). A caller that disconnects only stops waiting — the work keeps
+running for everyone else. A caller whose request `fingerprint` differs from
+the flight's is not attached to it: FlightConflict is raised instead, so
+nobody gets the result of a run with other parameters.
+
+`IdempotencyCache` extends this across retries: the finished result is kept
+for a while under a client-supplied key, with a fingerprint of the request
+so a reused key with different parameters is rejected instead of replayed.
+
+Both are per process.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class FlightConflict(Exception):
+    """A flight for the key is running with different request parameters."""
+
+
+class SingleFlight:
+    """At most one in-flight execution per key."""
+
+    def __init__(self):
+        # key → (task, request fingerprint)
+        self._inflight: Dict[Hashable, Tuple[asyncio.Task, str]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        work: Callable[[], Awaitable[T]],
+        fingerprint: str = "",
+    ) -> Tuple[T, bool]:
+        """
+        Run or join the flight for `key`. Returns (result, shared).
+        Raises FlightConflict if the flight in progress has another fingerprint.
+        """
+        entry = self._inflight.get(key)
+        shared = entry is not None
+        if entry is None:
+            task = asyncio.create_task(work())
+            self._inflight[key] = (task, fingerprint)
+            task.add_done_callback(lambda t: self._landed(key, t))
+        else:
+            task, running_fingerprint = entry
+            if running_fingerprint != fingerprint:
+                raise FlightConflict("A run with different parameters is already in progress")
+        # shield: cancelling this caller must not cancel the shared task
+        return await asyncio.shield(task), shared
+
+    def _landed(self, key: Hashable, task: asyncio.Task) -> None:
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved even if every caller went away
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+
+class IdempotencyCache:
+    """TTL cache of finished results keyed by (scope, idempotency key)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key → (request fingerprint, result, expires_at monotonic)
+        self._entries: Dict[Hashable, Tuple[str, Any, float]] = {}
+
+    def get(self, key: Hashable, fingerprint: str) -> Optional[Any]:
+        """
+        Cached result for `key`, or None. Raises ValueError if the key was
+        used for a request with a different fingerprint.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_fingerprint, result, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        if stored_fingerprint != fingerprint:
+            raise ValueError("Idempotency-Key was already used with different parameters")
+        return result
+
+    def put(self, key: Hashable, fingerprint: str, result: Any) -> None:
+        if len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            for k in [k for k, (_, _, exp) in self._entries.items() if exp <= now]:
+                del self._entries[k]
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]  # Oldest insertion
+        self._entries[key] = (fingerprint, result, time.monotonic() + self.ttl_seconds)
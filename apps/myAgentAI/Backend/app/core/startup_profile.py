@@ -0,0 +1,75 @@
+"""
+myAgentAI - Startup Profiling
+===============================
+Records how long a worker takes to become ready.
+
+  profile_phase(name)  — times a startup phase (e.g. init_models)
+  get_startup_report() — phases + which heavy SDKs are already imported
+  measure_import_costs — per-module import cost of `app.main`, measured in
+                         a fresh interpreter via `python -X importtime`
+
+Heavy SDKs (qdrant_client, openai, googleapiclient, google-auth) are
+imported on first use, so none of them should appear as loaded right
+after startup. If one does, an eager import has crept back in.
+"""
+
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+HEAVY_MODULES = ("qdrant_client", "openai", "googleapiclient", "google.auth", "httpx")
+
+_PROCESS_START = time.perf_counter()
+_phases: Dict[str, float] = {}
+
+
+@contextmanager
+def profile_phase(name: str):
+    """Record the wall-clock duration of a startup phase (milliseconds)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def mark_phase(name: str, since: float = _PROCESS_START) -> None:
+    """Record a phase that started at `since` (perf_counter) and ends now."""
+    _phases[name] = round((time.perf_counter() - since) * 1000, 2)
+
+
+def get_startup_report() -> Dict[str, Any]:
+    return {
+        "phases_ms": dict(_phases),
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+
+
+def measure_import_costs(target: str = "app.main", top: int = 20) -> List[Dict[str, Any]]:
+    """
+    Import `target` in a fresh interpreter and return the `top` most
+    expensive modules by cumulative import time (microseconds).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{proc.stderr[-2000:]}")
+
+    costs = []
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        costs.append({
+            "module": module.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    costs.sort(key=lambda c: c["cumulative_us"], reverse=True)
+    return costs[:top]
@@ -4,11 +4,22 @@ from app.db.session import engine
 # Import all models to ensure they are registered with Base metadata
 from app.models.user import User
 from app.models.api_keys import UserAPIKey
-from app.sections.personal_management.email_housekeeper.models import EmailRecord, FeedbackRecord
+from app.models.job_lease import JobLease
+from app.sections.personal_management.email_housekeeper.models import (
+    EmailRecord, EmailThreadRecord, FeedbackRecord, EmailHistoryRecord, BackfillJob,
+    GmailPushState,
+)
+from app.sections.personal_management.email_housekeeper.archival import (
+    ensure_default_history_partition,
+)
 
 async def init_models():
-    """Create tables if they don't exist."""
+    """
+    Create tables if they don't exist. Changes to existing tables are
+    Alembic revisions (`alembic upgrade head`, see migrations/).
+    """
     async with engine.begin() as conn:
         # await conn.run_sync(Base.metadata.drop_all) # Optional: reset
         await conn.run_sync(Base.metadata.create_all)
+        await ensure_default_history_partition(conn)
     print("✅ Database Tables Created Successfully")
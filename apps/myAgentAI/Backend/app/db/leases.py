@@ -0,0 +1,96 @@
+"""
+myAgentAI - Cross-Worker Job Leases
+=====================================
+Periodic jobs are scheduled in every uvicorn worker; a lease makes sure
+only one of them actually runs a given job at a time.
+
+    async with job_lease("memory_compaction") as lease:
+        if lease is None:
+            return                      # Another worker holds it
+        for unit in work:
+            ...
+            if not await lease.renew():
+                return                  # Lease lost (expired and taken over)
+
+A lease is a row in `job_leases` with an expiry, so a crashed worker's
+lease frees itself after JOB_LEASE_SECONDS. Acquire / renew / release are
+single conditional statements, each in its own short transaction — they
+work the same on Postgres and SQLite.
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.job_lease import JobLease
+
+settings = get_settings()
+
+
+class Lease:
+    """A held job lease; renew it between units of work."""
+
+    def __init__(self, name: str, owner: str, ttl_seconds: float):
+        self.name = name
+        self.owner = owner
+        self.ttl_seconds = ttl_seconds
+
+    def _expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+
+    async def renew(self) -> bool:
+        """Extend the lease; False if it expired and another run took it."""
+        async with async_session_factory() as db:
+            result = await db.execute(
+                update(JobLease)
+                .where(JobLease.name == self.name, JobLease.owner == self.owner)
+                .values(expires_at=self._expiry())
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def release(self) -> None:
+        async with async_session_factory() as db:
+            await db.execute(
+                delete(JobLease).where(JobLease.name == self.name, JobLease.owner == self.owner)
+            )
+            await db.commit()
+
+
+async def acquire_lease(name: str, ttl_seconds: Optional[float] = None) -> Optional[Lease]:
+    """Take the lease for `name` if it is free or expired; None if it is held."""
+    lease = Lease(name, uuid.uuid4().hex, ttl_seconds or settings.JOB_LEASE_SECONDS)
+    now = datetime.now(timezone.utc)
+
+    async with async_session_factory() as db:
+        try:
+            db.add(JobLease(name=name, owner=lease.owner, expires_at=lease._expiry()))
+            await db.commit()
+            return lease
+        except IntegrityError:
+            await db.rollback()  # Row exists — take it over only if expired
+
+        result = await db.execute(
+            update(JobLease)
+            .where(JobLease.name == name, JobLease.expires_at < now)
+            .values(owner=lease.owner, expires_at=lease._expiry())
+        )
+        await db.commit()
+    return lease if result.rowcount == 1 else None
+
+
+@asynccontextmanager
+async def job_lease(name: str, ttl_seconds: Optional[float] = None) -> AsyncIterator[Optional[Lease]]:
+    """Hold the lease for the duration of the block (yields None if unavailable)."""
+    lease = await acquire_lease(name, ttl_seconds)
+    try:
+        yield lease
+    finally:
+        if lease is not None:
+            await lease.release()
@@ -2,27 +2,40 @@
 myAgentAI - Database Session Management
 =========================================
 Async engine + session factory + FastAPI dependency for DB injection.
+
+Two dependencies:
+  get_db      — read-write session on the primary; commits on success
+  get_read_db — read-only session; never flushes or commits, and routes to
+                READ_REPLICA_URL (own pool) when configured
+
+Every engine reports pool saturation and statement latency (app/db/telemetry.py).
 """
 
+from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import get_settings
+from app.db.telemetry import instrument_engine, pool_args
 
 settings = get_settings()
 
-connect_args = {}
-pool_args = {}
 
-if "sqlite" in settings.DATABASE_URL:
-    connect_args = {"check_same_thread": False}
-else:
-    pool_args = {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": True}
+def _engine_args(url: str, name: str, pool_size: int, max_overflow: int) -> dict:
+    if "sqlite" in url:
+        return {"connect_args": {"check_same_thread": False}}
+    return pool_args(name, pool_size=pool_size, max_overflow=max_overflow)
+
 
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    connect_args=connect_args,
-    **pool_args,
+    **_engine_args(
+        settings.DATABASE_URL,
+        "primary",
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    ),
 )
+instrument_engine(engine, "primary")
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -31,6 +44,45 @@ async_session_factory = async_sessionmaker(
 )
 
 
+# ── Read-only sessions ───────────────────────────────────
+
+if settings.READ_REPLICA_URL:
+    read_engine = create_async_engine(
+        settings.READ_REPLICA_URL,
+        echo=settings.DEBUG,
+        **_engine_args(
+            settings.READ_REPLICA_URL,
+            "replica",
+            pool_size=settings.READ_POOL_SIZE,
+            max_overflow=settings.READ_MAX_OVERFLOW,
+        ),
+    )
+    instrument_engine(read_engine, "replica")
+else:
+    read_engine = engine
+
+if read_engine.dialect.name == "postgresql":
+    # Server-enforced: transactions start as READ ONLY
+    read_engine = read_engine.execution_options(postgresql_readonly=True)
+
+
+class ReadOnlySession(Session):
+    """Session that refuses to write — catches misuse of get_read_db."""
+
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Attempted to write through a read-only session")
+
+
+read_session_factory = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
 async def get_db():
     """
     FastAPI dependency that yields an async database session.
@@ -45,3 +97,16 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+async def get_read_db():
+    """
+    FastAPI dependency that yields a read-only session.
+    Skips flush/commit; the transaction is simply rolled back on exit.
+    """
+    async with read_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
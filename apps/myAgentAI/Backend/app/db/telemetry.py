@@ -0,0 +1,178 @@
+"""
+myAgentAI - Database Telemetry
+================================
+Pool and statement metrics for every engine, exposed on GET /metrics.
+
+  db_pool_checkout_wait_seconds{engine}      time spent waiting for a connection
+  db_pool_checkout_timeouts_total{engine}    checkouts that hit DB_POOL_TIMEOUT
+  db_pool_in_use{engine}                     connections checked out right now
+  db_pool_overflow{engine}                   connections above pool_size
+  db_pool_size{engine}                       configured pool_size
+  db_statement_duration_seconds{engine, fingerprint, statement}
+
+Statements are grouped by a normalised fingerprint: literals and bind
+markers become `?` (dropping the `::TYPE` casts asyncpg puts on every bind),
+IN-lists and multi-row VALUES collapse, whitespace is folded. Anything slower than DB_SLOW_QUERY_MS is logged with its
+fingerprint — never with parameter values.
+
+Wiring: engines are created with `pool_args(name)` (instrumented pool class)
+and passed to `instrument_engine(engine, name)` (statement events + gauges).
+"""
+
+import hashlib
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import get_settings
+from app.core.metrics import registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_engines: Dict[str, Any] = {}   # name → AsyncEngine with a QueuePool
+
+# ── Metrics ──────────────────────────────────────────────
+
+POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT.",
+    ["engine"],
+)
+STATEMENT_LATENCY = registry.histogram(
+    "db_statement_duration_seconds",
+    "Statement execution time by normalised SQL fingerprint.",
+    ["engine", "fingerprint", "statement"],
+)
+
+
+def _pool_stat(stat: str):
+    def read() -> Dict[Tuple[str, ...], float]:
+        return {(name,): getattr(engine.sync_engine.pool, stat)() for name, engine in _engines.items()}
+    return read
+
+
+registry.gauge("db_pool_in_use", "Connections currently checked out.",
+               ["engine"], callback=_pool_stat("checkedout"))
+registry.gauge("db_pool_overflow", "Connections open beyond pool_size (negative: unused base slots).",
+               ["engine"], callback=_pool_stat("overflow"))
+registry.gauge("db_pool_size", "Configured pool_size.",
+               ["engine"], callback=_pool_stat("size"))
+
+
+# ── Instrumented pool ────────────────────────────────────
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times every checkout (incl. queueing)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        engine_name = getattr(self, "logging_name", None) or "default"
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(engine=engine_name)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, engine=engine_name)
+
+
+def pool_args(name: str, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """create_async_engine kwargs for an instrumented QueuePool."""
+    return {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_logging_name": name,   # Survives pool.recreate(); labels the metrics
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+
+# ── Statement fingerprints ───────────────────────────────
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_BIND = re.compile(r"\$\d+|%\(\w+\)s|%s")
+# `?::VARCHAR`, `?::TIMESTAMP WITH TIME ZONE`, `?::NUMERIC(10, 2)`, `?::INTEGER[]`
+_CAST = re.compile(
+    r"\?\s*::\s*[a-z_]\w*"
+    r"(?:\s+precision|\s+varying)?"
+    r"(?:\s*\(\s*[\d?]+(?:\s*,\s*[\d?]+)?\s*\))?"
+    r"(?:\s+with(?:out)?\s+time\s+zone)?"
+    r"(?:\s*\[\s*\])*",
+    re.I,
+)
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """(short hash, normalised SQL) for a statement string."""
+    sql = _COMMENT.sub(" ", statement)
+    sql = _STRING.sub("?", sql)
+    sql = _BIND.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _CAST.sub("?", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    sql = _IN_LIST.sub("(?+)", sql)
+    sql = _ROWS.sub(r"\1, ...", sql)
+    return hashlib.sha1(sql.encode("utf-8")).hexdigest()[:12], sql
+
+
+# ── Engine events ────────────────────────────────────────
+
+def instrument_engine(engine, name: str) -> None:
+    """Attach statement timing and (for QueuePool engines) pool gauges."""
+    sync_engine = engine.sync_engine
+    seen_fingerprints = set()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        digest, sql = fingerprint(statement)
+
+        # Bound label cardinality: unseen fingerprints past the cap share one series
+        if digest not in seen_fingerprints and len(seen_fingerprints) < settings.DB_MAX_FINGERPRINTS:
+            seen_fingerprints.add(digest)
+        label = digest if digest in seen_fingerprints else "other"
+        STATEMENT_LATENCY.observe(
+            elapsed,
+            engine=name,
+            fingerprint=label,
+            statement=sql[:settings.DB_STATEMENT_LABEL_CHARS] if label != "other" else "",
+        )
+
+        if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow query on {name}: {elapsed * 1000:.0f} ms "
+                f"[{digest}]{' x many' if executemany else ''} {sql[:1000]}"
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()  # after_cursor_execute won't fire
+
+    if isinstance(sync_engine.pool, InstrumentedAsyncPool):
+        _engines[name] = engine
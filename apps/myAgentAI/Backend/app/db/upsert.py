@@ -0,0 +1,19 @@
+"""
+myAgentAI - Dialect Upserts
+=============================
+`INSERT … ON CONFLICT` is dialect-specific in SQLAlchemy. insert_for()
+returns the Postgres or SQLite construct for the session's engine — both
+take the same on_conflict_do_update / on_conflict_do_nothing arguments —
+so concurrent writers resolve a unique-key race in one statement instead
+of an IntegrityError that aborts the whole transaction.
+"""
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_for(db: AsyncSession, table):
+    """Dialect-specific insert() for `table` (a model or Table)."""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -13,16 +13,27 @@ To add a new utility:
   3. Import and include the router below
 """
 
+import time
+
+from app.core.startup_profile import get_startup_report, mark_phase, profile_phase
+
+_import_start = time.perf_counter()
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.core.config import get_settings
 from app.core.response import error_response
+from app.core.metrics import registry as metrics_registry
+from app.services.rate_limiter import get_limiter_states
+from app.services.openai_clients import openai_clients
+from app.core.profiling import ProfilingMiddleware
 
 # ── Core Routers ─────────────────────────────────────────
 from app.routers.auth import router as auth_router
 from app.routers.api_keys import router as api_keys_router
+from app.routers.profiling import router as profiling_router
 
 # ── Section Routers ──────────────────────────────────────
 # Personal Management
@@ -31,6 +42,7 @@ from app.sections.personal_management.email_housekeeper.router import (
 )
 
 settings = get_settings()
+mark_phase("import_app", since=_import_start)
 
 # ── App Initialization ───────────────────────────────────
 
@@ -49,12 +61,51 @@ app = FastAPI(
 # ── App Initialization ───────────────────────────────────
 
 from app.db.init_db import init_models
+from app.core.background import start_periodic_task, stop_background_tasks
+from app.sections.personal_management.email_housekeeper.memory_compaction import (
+    run_memory_compaction,
+)
+from app.sections.personal_management.email_housekeeper.archival import (
+    run_email_archival,
+)
+from app.sections.personal_management.email_housekeeper.backfill import (
+    resume_backfill_jobs,
+)
 
 @app.on_event("startup")
 async def startup_event():
     """Run startup tasks."""
     print("🚀 App Starting Up...")
-    await init_models()
+    with profile_phase("init_models"):
+        await init_models()
+
+    if settings.MEMORY_COMPACTION_ENABLED:
+        start_periodic_task(
+            "memory_compaction",
+            settings.MEMORY_COMPACTION_INTERVAL_MINUTES * 60,
+            run_memory_compaction,
+        )
+
+    if settings.EMAIL_ARCHIVAL_ENABLED:
+        start_periodic_task(
+            "email_archival",
+            settings.EMAIL_ARCHIVAL_INTERVAL_MINUTES * 60,
+            run_email_archival,
+        )
+
+    await resume_backfill_jobs()
+    start_periodic_task(
+        "backfill_resume",
+        settings.BACKFILL_LEASE_SECONDS,
+        resume_backfill_jobs,
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background jobs and release pooled connections."""
+    await stop_background_tasks()
+    await openai_clients.aclose()
 
 # ── CORS Middleware ──────────────────────────────────────
 
@@ -66,6 +117,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Request Profiling ────────────────────────────────────
+# Added last so it is outermost: the profile covers CORS and routing too.
+# Untriggered requests pass straight through (see app/core/profiling.py).
+
+app.add_middleware(ProfilingMiddleware)
+
 
 # ── Global Exception Handler ────────────────────────────
 
@@ -85,6 +142,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Core
 app.include_router(auth_router)
 app.include_router(api_keys_router)
+app.include_router(profiling_router)
 
 # Personal Management section
 app.include_router(email_housekeeper_router)
@@ -122,3 +180,35 @@ async def health_check():
         "message": "All systems operational",
         "data": {"status": "healthy", "version": settings.APP_VERSION},
     }
+
+
+@app.get("/health/rate-limits", tags=["Health"])
+async def rate_limit_state():
+    """Current OpenAI limiter state per API key fingerprint."""
+    return {
+        "success": True,
+        "message": "OpenAI rate limiter state",
+        "data": {
+            "limiters": get_limiter_states(),
+            "client_pool": openai_clients.stats(),
+        },
+    }
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint (pipeline stage latency histograms)."""
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/health/startup", tags=["Health"])
+async def startup_report():
+    """Startup phase timings and which heavy SDKs have been imported so far."""
+    return {
+        "success": True,
+        "message": "Startup profile",
+        "data": get_startup_report(),
+    }
@@ -7,7 +7,7 @@ Rules:
   - Gmail:  MUST be user-provided (no fallback)
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -25,7 +25,7 @@ class UserAPIKey(Base):
         index=True,
     )
     service_name = Column(String(50), nullable=False)   # "openai" | "gmail"
-    encrypted_key = Column(String(500), nullable=False)
+    encrypted_key = Column(Text, nullable=False)          # Fernet token (credential_service)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -0,0 +1,20 @@
+"""
+myAgentAI - Job Lease Model
+=============================
+One row per exclusive background job (see app/db/leases.py).
+"""
+
+from sqlalchemy import Column, String, DateTime
+
+from app.db.base import Base
+
+
+class JobLease(Base):
+    __tablename__ = "job_leases"
+
+    name = Column(String(100), primary_key=True)      # e.g. "memory_compaction"
+    owner = Column(String(64), nullable=False)        # Random id of the holding run
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<JobLease(name={self.name}, expires_at={self.expires_at})>"
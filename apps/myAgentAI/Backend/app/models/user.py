@@ -19,6 +19,7 @@ class User(Base):
     username = Column(String(100), unique=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
+    plan = Column(String(20), default="free", server_default="free", nullable=False)  # Key of PLAN_LIMITS
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
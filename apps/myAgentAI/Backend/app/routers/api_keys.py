@@ -14,10 +14,11 @@ from sqlalchemy import select
 
 from app.core.security import get_current_user
 from app.core.response import success_response, error_response
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.models.api_keys import UserAPIKey
 from app.schemas.user import APIKeyCreate, APIKeyResponse
+from app.services.credential_service import credentials, encrypt_secret
 from app.utils.constants import SUPPORTED_SERVICES
 
 
@@ -49,26 +50,29 @@ async def store_api_key(
     )
     existing = result.scalar_one_or_none()
 
+    encrypted = encrypt_secret(key_data.api_key)
     if existing:
-        existing.encrypted_key = key_data.api_key  # TODO: encrypt in production
+        existing.encrypted_key = encrypted
         message = f"{key_data.service_name} API key updated successfully"
     else:
         new_key = UserAPIKey(
             user_id=current_user.id,
             service_name=key_data.service_name,
-            encrypted_key=key_data.api_key,  # TODO: encrypt in production
+            encrypted_key=encrypted,
         )
         db.add(new_key)
         message = f"{key_data.service_name} API key stored successfully"
 
-    await db.flush()
+    # Commit before invalidating so a concurrent lookup can't re-cache the old key
+    await db.commit()
+    credentials.invalidate(current_user.id, key_data.service_name)
     return success_response(message=message)
 
 
 @router.get("/")
 async def list_api_keys(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """List all stored API keys for the current user (keys are masked)."""
 
@@ -116,4 +120,6 @@ async def delete_api_key(
         )
 
     await db.delete(key)
+    await db.commit()
+    credentials.invalidate(current_user.id, service_name)
     return success_response(message=f"{service_name} API key deleted successfully")
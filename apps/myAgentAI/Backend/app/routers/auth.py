@@ -44,7 +44,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password(user_data.password),
     )
     db.add(user)
     await db.flush()
@@ -67,7 +67,7 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == credentials.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=error_response(message="Invalid email or password"),
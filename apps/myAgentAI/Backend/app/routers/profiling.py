@@ -0,0 +1,74 @@
+"""
+myAgentAI - Profiling Admin Router
+=====================================
+Read back request profiles captured by ProfilingMiddleware.
+
+All endpoints require `X-Profile-Token: <PROFILING_ADMIN_TOKEN>` — the
+same header that triggers a profile; with no token configured they answer
+404, as if they did not exist. A profile is listed a moment after its
+response, once the sampler thread has taken its last sample.
+
+  GET /admin/profiles          newest first, metadata only
+  GET /admin/profiles/{id}     collapsed stacks (flamegraph.pl / speedscope)
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.profiling import is_admin_token, profile_store
+from app.core.response import success_response, error_response
+
+settings = get_settings()
+
+
+async def require_profiling_admin(x_profile_token: Optional[str] = Header(None)):
+    if not settings.PROFILING_ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_response(message="Not found"),
+        )
+    if not x_profile_token or not is_admin_token(x_profile_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=error_response(message="Invalid admin token"),
+        )
+
+
+router = APIRouter(
+    prefix="/admin/profiles",
+    tags=["Profiling"],
+    dependencies=[Depends(require_profiling_admin)],
+)
+
+
+@router.get("/")
+async def list_profiles():
+    """Captured profiles, newest first."""
+    profiles = profile_store.list()
+    return success_response(
+        message=f"{len(profiles)} profile(s) captured",
+        data={"profiles": profiles},
+    )
+
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str, format: str = "collapsed"):
+    """One profile as collapsed stacks (default) or JSON with metadata."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_response(message="Profile not found"),
+        )
+    if format == "json":
+        return success_response(
+            message="Request profile",
+            data={**profile.summary(), "stacks": dict(profile.stacks.most_common())},
+        )
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile.id}.folded"'},
+    )
@@ -0,0 +1,190 @@
+"""
+Email Housekeeper - Record Archival
+======================================
+Keeps `email_records` / `feedback_records` small regardless of account age.
+
+Every hot query (dedup, stats, review) looks at the last 24 hours, so rows
+older than EMAIL_HOT_RETENTION_DAYS are moved — together with their
+feedback — into `email_record_history`: one zlib-compressed JSON blob per
+user per day.
+
+  Postgres — history is RANGE-partitioned by day; monthly partitions are
+             created on demand (plus a DEFAULT catch-all), so old months
+             can be detached or dropped without touching live tables.
+  SQLite   — history is a plain table and the hot tables act as a
+             rolling window.
+
+Runs hold the "email_archival" lease (app/db/leases.py), renewed between
+batches, so workers never race on the same history rows or deletes.
+"""
+
+import json
+import logging
+import zlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.sections.personal_management.email_housekeeper.models import (
+    EmailHistoryRecord, EmailRecord, EmailThreadRecord, FeedbackRecord,
+)
+from app.db.leases import Lease, job_lease
+from app.db.session import async_session_factory
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+HISTORY_TABLE = EmailHistoryRecord.__tablename__
+
+
+def _row_to_dict(row: Any) -> Dict[str, Any]:
+    return {c.name: getattr(row, c.name) for c in row.__table__.columns}
+
+
+def _compress(data: Dict[str, List[Dict[str, Any]]]) -> bytes:
+    return zlib.compress(json.dumps(data, default=str).encode("utf-8"), 6)
+
+
+def decompress_history(payload: bytes) -> Dict[str, List[Dict[str, Any]]]:
+    """Inverse of the archive encoding — {"records": [...], "feedback": [...]}."""
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+# ── Postgres partition management ────────────────────────
+
+def _month_bounds(day: date) -> Tuple[date, date]:
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+async def ensure_default_history_partition(conn) -> None:
+    """Create the catch-all partition (Postgres only; called at startup)."""
+    if conn.dialect.name != "postgresql":
+        return
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {HISTORY_TABLE}_default "
+        f"PARTITION OF {HISTORY_TABLE} DEFAULT"
+    ))
+
+
+async def _ensure_month_partition(db: AsyncSession, day: date) -> None:
+    if db.bind.dialect.name != "postgresql":
+        return
+    start, end = _month_bounds(day)
+    name = f"{HISTORY_TABLE}_{start:%Y_%m}"
+    await db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {HISTORY_TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+
+
+# ── Archival job ─────────────────────────────────────────
+
+class EmailArchivalService:
+    """Moves cold email/feedback rows into the compressed history table."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def archive_expired(self, lease: Optional[Lease] = None) -> Dict[str, int]:
+        """
+        Archive everything older than the hot retention window, in batches.
+        With a `lease`, it is renewed before each batch and the run stops if
+        it was lost.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.EMAIL_HOT_RETENTION_DAYS)
+        totals = {"records": 0, "feedback": 0}
+        while True:
+            if lease is not None and not await lease.renew():
+                logger.warning("Email archival lease lost; stopping this run")
+                return totals
+            moved = await self._archive_batch(cutoff)
+            await self.db.commit()  # One transaction per batch keeps locks short
+            totals["records"] += moved[0]
+            totals["feedback"] += moved[1]
+            if moved[0] < settings.EMAIL_ARCHIVAL_BATCH_SIZE:
+                break
+
+        # Thread decisions are only reused for recent mail; drop stale ones
+        await self.db.execute(
+            delete(EmailThreadRecord).where(EmailThreadRecord.updated_at < cutoff)
+        )
+        await self.db.commit()
+        if totals["records"]:
+            logger.info(f"Archived {totals['records']} email records, {totals['feedback']} feedback")
+        return totals
+
+    async def _archive_batch(self, cutoff: datetime) -> Tuple[int, int]:
+        result = await self.db.execute(
+            select(EmailRecord)
+            .where(EmailRecord.processed_at < cutoff)
+            .order_by(EmailRecord.id)
+            .limit(settings.EMAIL_ARCHIVAL_BATCH_SIZE)
+        )
+        records = result.scalars().all()
+        if not records:
+            return 0, 0
+
+        record_ids = [r.id for r in records]
+        feedback_q = await self.db.execute(
+            select(FeedbackRecord).where(FeedbackRecord.email_record_id.in_(record_ids))
+        )
+        feedback = feedback_q.scalars().all()
+
+        # Group into (user_id, day) buckets
+        buckets: Dict[Tuple[int, date], Dict[str, list]] = defaultdict(
+            lambda: {"records": [], "feedback": []}
+        )
+        day_of_record = {}
+        for r in records:
+            key = (r.user_id, r.processed_at.date())
+            day_of_record[r.id] = key
+            buckets[key]["records"].append(_row_to_dict(r))
+        for f in feedback:
+            buckets[day_of_record[f.email_record_id]]["feedback"].append(_row_to_dict(f))
+
+        for (user_id, day), data in buckets.items():
+            await self._merge_into_history(user_id, day, data)
+
+        await self.db.execute(
+            delete(FeedbackRecord).where(FeedbackRecord.email_record_id.in_(record_ids))
+        )
+        await self.db.execute(delete(EmailRecord).where(EmailRecord.id.in_(record_ids)))
+        return len(records), len(feedback)
+
+    async def _merge_into_history(
+        self, user_id: int, day: date, data: Dict[str, list]
+    ) -> None:
+        """Append to the (user, day) history row, creating it if needed."""
+        await _ensure_month_partition(self.db, day)
+        existing = await self.db.get(EmailHistoryRecord, (user_id, day))
+        if existing:
+            merged = decompress_history(existing.payload)
+            merged["records"].extend(data["records"])
+            merged["feedback"].extend(data["feedback"])
+            existing.payload = _compress(merged)
+            existing.record_count = len(merged["records"])
+            existing.feedback_count = len(merged["feedback"])
+        else:
+            self.db.add(EmailHistoryRecord(
+                user_id=user_id,
+                day=day,
+                record_count=len(data["records"]),
+                feedback_count=len(data["feedback"]),
+                payload=_compress(data),
+            ))
+        await self.db.flush()
+
+
+async def run_email_archival() -> None:
+    """Entry point for the periodic background job."""
+    async with job_lease("email_archival") as lease:
+        if lease is None:
+            return  # Another worker is archiving
+        async with async_session_factory() as session:
+            await EmailArchivalService(session).archive_expired(lease)
@@ -0,0 +1,275 @@
+"""
+Email Housekeeper - Inbox Backfill
+=====================================
+Walks months of a user's mailbox through the classification pipeline so
+new users don't start with empty thread decisions and reinforcement memory.
+
+  - Paginated `messages.list` (newest first), committed in chunks of
+    BACKFILL_CHUNK_SIZE: the page's last chunk and the next `page_token`
+    commit together, so a crashed or restarted job resumes at the first
+    unfinished page.
+  - Throughput ceiling: BACKFILL_MESSAGES_PER_MINUTE per job.
+  - Low priority: a page only starts while no interactive /email/run is
+    in flight (pipeline_gate).
+  - Never auto-executes; records are stored with their message date so
+    they stay out of the 24h dashboards and age into the archive.
+
+Ownership is a lease on `updated_at`: a runner claims its job with a
+conditional UPDATE and remembers the stamp it wrote. Every later write —
+each chunk of a page, the page checkpoint, the failure status — is
+`UPDATE … WHERE id = ? AND updated_at = <stamp>` and sets a new stamp in
+the same transaction, so a runner whose lease was taken over rolls back
+instead of writing. The lease is also renewed every BACKFILL_LEASE_SECONDS/3
+while waiting on the priority gate or the throughput ceiling. Jobs that are
+pending, or running with a lease older than BACKFILL_LEASE_SECONDS (crashed
+worker), are picked up at startup and by a periodic sweep.
+
+Records are unique per (user_id, email_id), so a page re-run after a
+takeover or crash skips messages that were already stored.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.background import start_background_task
+from app.core.config import get_settings
+from app.core.priority import pipeline_gate
+from app.db.session import async_session_factory
+from app.services.credential_service import credentials
+from app.services.rate_limiter import TokenBucket
+from app.sections.personal_management.email_housekeeper.models import (
+    BackfillJob, BackfillStatus,
+)
+from app.sections.personal_management.email_housekeeper.factory import build_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (BackfillStatus.PENDING.value, BackfillStatus.RUNNING.value)
+
+
+def backfill_query(months: int) -> str:
+    """Inbox from `months` ago up to the live 24h window (which /email/run owns)."""
+    now = datetime.now(timezone.utc)
+    after = int((now - timedelta(days=30 * months)).timestamp())
+    before = int((now - timedelta(hours=24)).timestamp())
+    return f"in:inbox after:{after} before:{before}"
+
+
+def job_to_dict(job: BackfillJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "query": job.query,
+        "pages_done": job.pages_done or 0,
+        "messages_seen": job.messages_seen or 0,
+        "messages_processed": job.messages_processed or 0,
+        "last_error": job.last_error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+
+
+# ── Job management (used by the router) ──────────────────
+
+async def create_backfill_job(db: AsyncSession, user_id: int, months: int) -> BackfillJob:
+    """Create a job; raises ValueError if the user already has one active."""
+    active = await db.execute(
+        select(BackfillJob.id).where(
+            BackfillJob.user_id == user_id,
+            BackfillJob.status.in_(ACTIVE_STATUSES),
+        )
+    )
+    if active.first() is not None:
+        raise ValueError("A backfill is already in progress for this user")
+
+    job = BackfillJob(
+        user_id=user_id,
+        status=BackfillStatus.PENDING.value,
+        query=backfill_query(months),
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+async def get_latest_backfill_job(db: AsyncSession, user_id: int) -> Optional[BackfillJob]:
+    result = await db.execute(
+        select(BackfillJob)
+        .where(BackfillJob.user_id == user_id)
+        .order_by(BackfillJob.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+def start_backfill(job_id: int) -> bool:
+    """Run the job in the background (no-op if it is already running here)."""
+    return start_background_task(f"backfill:{job_id}", BackfillRunner(job_id).run)
+
+
+def _claimable():
+    """Pending jobs, or running jobs whose lease has expired."""
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.BACKFILL_LEASE_SECONDS)
+    return or_(
+        BackfillJob.status == BackfillStatus.PENDING.value,
+        (BackfillJob.status == BackfillStatus.RUNNING.value)
+        & (BackfillJob.updated_at < stale_before),
+    )
+
+
+async def resume_backfill_jobs() -> None:
+    """Startup hook / periodic sweep: pick up interrupted or orphaned jobs."""
+    async with async_session_factory() as db:
+        result = await db.execute(select(BackfillJob.id).where(_claimable()))
+        job_ids = result.scalars().all()
+    for job_id in job_ids:
+        start_backfill(job_id)
+    if job_ids:
+        logger.info(f"Resuming {len(job_ids)} backfill job(s)")
+
+
+# ── Runner ───────────────────────────────────────────────
+
+class LeaseLost(Exception):
+    """Another runner took over the job (our lease expired)."""
+
+
+class BackfillRunner:
+    """Processes one BackfillJob page by page from its checkpoint."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.throughput = TokenBucket(settings.BACKFILL_MESSAGES_PER_MINUTE)
+        self.renew_every = settings.BACKFILL_LEASE_SECONDS / 3
+        self.lease_stamp: Optional[datetime] = None   # updated_at we last wrote
+
+    async def run(self) -> None:
+        async with async_session_factory() as db:
+            # Claim the lease atomically — another worker may race us
+            stamp = datetime.now(timezone.utc)
+            claimed = await db.execute(
+                update(BackfillJob)
+                .where(BackfillJob.id == self.job_id, _claimable())
+                .values(status=BackfillStatus.RUNNING.value, updated_at=stamp)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            if claimed.rowcount == 0:
+                return
+            self.lease_stamp = stamp
+            job = await db.get(BackfillJob, self.job_id)
+            try:
+                await self._run(db, job)
+            except asyncio.CancelledError:
+                # Shutdown: status stays "running"; resumed once the lease expires
+                raise
+            except LeaseLost:
+                logger.warning(f"Backfill job {self.job_id}: lease taken over, stopping")
+            except Exception as e:
+                logger.error(f"Backfill job {self.job_id} failed: {e}")
+                await db.rollback()
+                try:
+                    await self._commit_owned(
+                        db, status=BackfillStatus.FAILED.value, last_error=str(e)[:2000]
+                    )
+                except LeaseLost:
+                    pass  # The new owner decides the job's fate
+
+    async def _run(self, db: AsyncSession, job: BackfillJob) -> None:
+        from app.sections.personal_management.email_housekeeper.gmail_client import GmailClient
+
+        user_id, query, page_token = job.user_id, job.query, job.page_token
+        token = await credentials.gmail_token(db, user_id)
+        if not token:
+            raise ValueError("No Gmail token configured for this user")
+        client = GmailClient(token)
+        service = await build_service(user_id, db)
+
+        while True:
+            await self._wait_for_idle(db)
+            await self._throttle(db, settings.BACKFILL_PAGE_SIZE)
+
+            emails, next_token = await run_in_threadpool(
+                client.fetch_page, query, page_token, settings.BACKFILL_PAGE_SIZE
+            )
+            processed = 0
+            chunk_size = max(1, settings.BACKFILL_CHUNK_SIZE)
+            for start in range(0, len(emails), chunk_size):
+                if start:
+                    await self._commit_owned(db)  # Chunk's records + lease renewal
+                stats = await service.process_batch(
+                    user_id=user_id,
+                    db=db,
+                    emails=emails[start:start + chunk_size],
+                    auto_mode=False,
+                    historical=True,
+                )
+                processed += stats["total_processed"]
+
+            # Last chunk + checkpoint (+ lease renewal) in one transaction
+            done = next_token is None
+            await self._commit_owned(
+                db,
+                page_token=next_token,
+                pages_done=BackfillJob.pages_done + 1,
+                messages_seen=BackfillJob.messages_seen + len(emails),
+                messages_processed=BackfillJob.messages_processed + processed,
+                **({
+                    "status": BackfillStatus.COMPLETED.value,
+                    "completed_at": datetime.now(timezone.utc),
+                } if done else {}),
+            )
+            page_token = next_token
+
+            if done:
+                logger.info(f"Backfill job {self.job_id} completed")
+                return
+
+    # ── Lease ────────────────────────────────────────────
+
+    async def _commit_owned(self, db: AsyncSession, **values: Any) -> None:
+        """
+        Commit the open transaction with `values` applied to the job — only
+        if we still hold the lease; otherwise roll back and raise LeaseLost.
+        """
+        stamp = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(BackfillJob)
+            .where(
+                BackfillJob.id == self.job_id,
+                BackfillJob.status == BackfillStatus.RUNNING.value,
+                BackfillJob.updated_at == self.lease_stamp,
+            )
+            .values(updated_at=stamp, **values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await db.rollback()
+            raise LeaseLost()
+        await db.commit()
+        self.lease_stamp = stamp
+
+    async def _wait_for_idle(self, db: AsyncSession) -> None:
+        """Wait for the priority gate, renewing the lease while blocked."""
+        while True:
+            try:
+                await asyncio.wait_for(pipeline_gate.wait_for_idle(), self.renew_every)
+                return
+            except asyncio.TimeoutError:
+                await self._commit_owned(db)
+
+    async def _throttle(self, db: AsyncSession, messages: int) -> None:
+        """Block until `messages` fit under the per-job throughput ceiling."""
+        while (wait := self.throughput.wait_time(messages, time.monotonic())) > 0:
+            await asyncio.sleep(min(wait, self.renew_every))
+            if wait > self.renew_every:
+                await self._commit_owned(db)
+        self.throughput.consume(messages)
@@ -2,12 +2,31 @@
 Email Housekeeper - Email Classifier
 ========================================
 Uses OpenAI to classify emails by priority and suggest actions.
+
+Output is constrained by a strict JSON schema, so responses always parse.
+In compact mode (default) the schema omits `reasoning`, which otherwise
+dominates output tokens. Snippets are trimmed to a token budget first.
+
+Obvious emails are settled by a cheap first tier; only low-confidence
+ones reach the stronger (more expensive) model.
+
+Pipeline runs never ask for reasoning. `explain()` produces it on demand
+for the review items a person actually opens.
 """
 
-import json
-from typing import Dict, Any
+import logging
+import time
+from typing import Dict, Any, Optional
 
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import OpenAIService, is_rate_limit_error
+from app.sections.personal_management.email_housekeeper.heuristics import (
+    HeuristicScorer,
+)
+from app.utils.tokens import estimate_cost_usd, truncate_to_tokens
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 CLASSIFICATION_PROMPT = """
@@ -15,68 +34,234 @@ You are an email classification assistant. Analyze the following email and provi
 
 1. priority (1-5): 1=Critical, 2=High, 3=Medium, 4=Low, 5=Spam
 2. action: "keep", "delete", or "needs_review"
-3. confidence (0.0-1.0): How confident you are in your classification
-4. reasoning: Brief explanation
+3. confidence (0.0-1.0): How confident you are in your classification{reasoning_line}
 
 Email:
 Subject: {subject}
 From: {sender}
 Preview: {snippet}
+"""
+
+REASONING_LINE = "\n4. reasoning: Brief explanation"
 
-Respond ONLY in valid JSON:
-{{"priority": <int>, "action": "<string>", "confidence": <float>, "reasoning": "<string>"}}
+_BASE_PROPERTIES = {
+    "priority": {"type": "integer", "enum": [1, 2, 3, 4, 5]},
+    "action": {"type": "string", "enum": ["keep", "delete", "needs_review"]},
+    "confidence": {"type": "number"},
+}
+
+COMPACT_SCHEMA = {
+    "type": "object",
+    "properties": _BASE_PROPERTIES,
+    "required": list(_BASE_PROPERTIES),
+    "additionalProperties": False,
+}
+
+FULL_SCHEMA = {
+    "type": "object",
+    "properties": {**_BASE_PROPERTIES, "reasoning": {"type": "string"}},
+    "required": [*_BASE_PROPERTIES, "reasoning"],
+    "additionalProperties": False,
+}
+
+EXPLANATION_PROMPT = """
+An email was classified as priority {priority} (1=Critical … 5=Spam) with
+suggested action "{action}". In two or three sentences, explain to the
+recipient why, pointing at the specific words or sender that drove it.
+
+Email:
+Subject: {subject}
+From: {sender}
+Preview: {snippet}
 """
 
+# Output caps — a compact answer is ~20 tokens, reasoning adds a sentence or two.
+COMPACT_MAX_TOKENS = 40
+FULL_MAX_TOKENS = 200
+EXPLANATION_MAX_TOKENS = 150
+
 
 class EmailClassifier:
-    """Classifies emails using OpenAI LLM."""
+    """
+    Classifies emails with a confidence-gated cascade:
+      tier 1 — HeuristicScorer or a cheap model (CASCADE_FIRST_TIER)
+      tier 2 — OPENAI_MODEL, only when tier 1 confidence is below
+               CASCADE_CONFIDENCE_THRESHOLD
+    """
 
     def __init__(self, openai_service: OpenAIService):
         self.openai_service = openai_service
+        self.heuristics = HeuristicScorer()
 
     async def classify(
-        self, subject: str, sender: str, snippet: str
+        self,
+        subject: str,
+        sender: str,
+        snippet: str,
+        compact: Optional[bool] = None,
+        token_budget: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Classify a single email. Returns dict with:
-        priority, action, confidence, reasoning.
+        priority, action, confidence, reasoning, usage,
+        tier, cost_usd, latency_ms.
+        `snippet` may also be a fetched body; `token_budget` caps it
+        (default CLASSIFIER_SNIPPET_TOKEN_BUDGET).
         """
-        prompt = CLASSIFICATION_PROMPT.format(
-            subject=subject or "No Subject",
-            sender=sender or "Unknown",
-            snippet=snippet or "No preview available",
-        )
+        token_budget = token_budget or settings.CLASSIFIER_SNIPPET_TOKEN_BUDGET
+        compact = settings.CLASSIFIER_COMPACT_MODE if compact is None else compact
+        start = time.perf_counter()
+        spent = {"prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
 
         try:
-            response = await self.openai_service.chat_completion(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a precise email classifier. Always respond in valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
-            )
+            if settings.CASCADE_ENABLED:
+                result = await self._first_tier(
+                    subject, sender, snippet, compact, token_budget, spent
+                )
+                if result["confidence"] >= settings.CASCADE_CONFIDENCE_THRESHOLD:
+                    return self._finish(result, spent, start)
 
-            result = json.loads(response)
+            result = await self._llm_classify(
+                self.openai_service.model, subject, sender, snippet,
+                compact, token_budget, spent,
+            )
+            result["tier"] = "strong"
+            return self._finish(result, spent, start)
 
-            # Validate and sanitize
-            result["priority"] = max(1, min(5, int(result.get("priority", 3))))
-            result["confidence"] = max(
-                0.0, min(1.0, float(result.get("confidence", 0.5)))
+        except Exception as e:
+            if is_rate_limit_error(e):
+                # Quota exhausted even after retries — let the batch skip this
+                # email so the next run retries it, rather than storing a
+                # zero-confidence guess.
+                raise
+            # Graceful fallback — never crash the pipeline
+            logger.warning(f"Classification failed: {e}")
+            return self._finish(
+                {
+                    "priority": 3,
+                    "action": "needs_review",
+                    "confidence": 0.0,
+                    "reasoning": f"Classification failed: {str(e)}",
+                    "tier": "failed",
+                },
+                spent,
+                start,
             )
-            if result.get("action") not in ("keep", "delete", "needs_review"):
-                result["action"] = "needs_review"
-            result["reasoning"] = result.get("reasoning", "No reasoning provided")
 
+    async def _first_tier(
+        self,
+        subject: str,
+        sender: str,
+        snippet: str,
+        compact: bool,
+        token_budget: int,
+        spent: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Cheap pass. Failures return zero confidence so the email escalates."""
+        if settings.CASCADE_FIRST_TIER == "heuristic":
+            result = self.heuristics.score(subject, sender, snippet)
+            result["reasoning"] = ""
+            result["tier"] = "heuristic"
             return result
 
-        except (json.JSONDecodeError, Exception) as e:
-            # Graceful fallback — never crash the pipeline
-            return {
-                "priority": 3,
-                "action": "needs_review",
-                "confidence": 0.0,
-                "reasoning": f"Classification failed: {str(e)}",
-            }
+        try:
+            result = await self._llm_classify(
+                settings.CASCADE_FIRST_TIER, subject, sender, snippet,
+                compact, token_budget, spent,
+            )
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise
+            logger.warning(f"First-tier classification failed, escalating: {e}")
+            return {"priority": 3, "action": "needs_review", "confidence": 0.0}
+        result["tier"] = "cheap"
+        return result
+
+    async def _llm_classify(
+        self,
+        model: str,
+        subject: str,
+        sender: str,
+        snippet: str,
+        compact: bool,
+        token_budget: int,
+        spent: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """One schema-enforced LLM call; adds its usage and cost to `spent`."""
+        prompt = CLASSIFICATION_PROMPT.format(
+            subject=subject or "No Subject",
+            sender=sender or "Unknown",
+            snippet=truncate_to_tokens(
+                snippet or "No preview available",
+                token_budget,
+            ),
+            reasoning_line="" if compact else REASONING_LINE,
+        )
+
+        result, usage = await self.openai_service.structured_completion(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a precise email classifier.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            schema=COMPACT_SCHEMA if compact else FULL_SCHEMA,
+            schema_name="email_classification",
+            temperature=0.1,
+            max_tokens=COMPACT_MAX_TOKENS if compact else FULL_MAX_TOKENS,
+            model=model,
+        )
+        spent["prompt_tokens"] += usage["prompt_tokens"]
+        spent["completion_tokens"] += usage["completion_tokens"]
+        spent["cost_usd"] += estimate_cost_usd(model, usage)
+
+        # Schema guarantees shape; clamp the one unconstrained value
+        result["confidence"] = max(0.0, min(1.0, float(result["confidence"])))
+        result["reasoning"] = result.get("reasoning", "")
+        return result
+
+    async def explain(
+        self,
+        subject: str,
+        sender: str,
+        snippet: str,
+        priority: int,
+        action: str,
+    ) -> str:
+        """Explain an existing decision (on demand, not during runs)."""
+        prompt = EXPLANATION_PROMPT.format(
+            priority=priority,
+            action=action,
+            subject=subject or "No Subject",
+            sender=sender or "Unknown",
+            snippet=truncate_to_tokens(
+                snippet or "No preview available",
+                settings.CLASSIFIER_SNIPPET_TOKEN_BUDGET,
+            ),
+        )
+        explanation = await self.openai_service.chat_completion(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You explain email triage decisions concisely.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.2,
+            max_tokens=EXPLANATION_MAX_TOKENS,
+        )
+        return (explanation or "").strip()
+
+    @staticmethod
+    def _finish(
+        result: Dict[str, Any], spent: Dict[str, Any], start: float
+    ) -> Dict[str, Any]:
+        """Attach cumulative usage, cost and latency across all tiers tried."""
+        result["usage"] = {
+            "prompt_tokens": spent["prompt_tokens"],
+            "completion_tokens": spent["completion_tokens"],
+        }
+        result["cost_usd"] = round(spent["cost_usd"], 8)
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
@@ -0,0 +1,124 @@
+"""
+Email Housekeeper - Near-Duplicate Clustering
+================================================
+Groups near-identical emails within one batch (marketing blasts that differ
+only by name, order number, etc.) so the pipeline classifies one
+representative per cluster.
+
+MinHash over word shingles of subject + snippet (digits normalised), then
+LSH banding to find candidate pairs; a candidate joins a cluster only if its
+estimated Jaccard similarity clears NEAR_DUP_THRESHOLD. Texts are only
+compared within the same group (the pipeline passes the sender address):
+a shared template from two senders is not the same email. Pure Python — a
+batch is at most a few hundred emails.
+"""
+
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def _shingles(text: str, size: int) -> Set[str]:
+    words = _WORD.findall(_DIGITS.sub("0", (text or "").lower()))
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _base_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class NearDuplicateClusterer:
+    """MinHash/LSH clustering of short email texts."""
+
+    def __init__(
+        self,
+        threshold: float = settings.NEAR_DUP_THRESHOLD,
+        num_perm: int = settings.NEAR_DUP_NUM_PERM,
+        bands: int = settings.NEAR_DUP_BANDS,
+        shingle_size: int = settings.NEAR_DUP_SHINGLE_SIZE,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Fixed seed: signatures are comparable across calls and processes
+        rng = random.Random(1)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Optional[List[int]]:
+        """MinHash signature, or None for text with no words (never clustered)."""
+        hashes = [_base_hash(s) for s in _shingles(text, self.shingle_size)]
+        if not hashes:
+            return None
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def similarity(self, sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / self.num_perm
+
+    def cluster(
+        self, texts: List[str], groups: Optional[List[str]] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Cluster `texts` by index. Each cluster is [(index, similarity), ...]
+        with the representative (earliest index) first at similarity 1.0;
+        members carry their similarity to the representative. With `groups`,
+        only texts with the same group value can share a cluster.
+        """
+        signatures = [self.signature(t) for t in texts]
+        groups = groups or [""] * len(texts)
+
+        # LSH: texts in one group sharing any identical band are candidate pairs
+        buckets: Dict[Tuple[str, int, Tuple[int, ...]], List[int]] = {}
+        for i, sig in enumerate(signatures):
+            if sig is None:
+                continue
+            for band in range(self.bands):
+                key = (groups[i], band, tuple(sig[band * self.rows:(band + 1) * self.rows]))
+                buckets.setdefault(key, []).append(i)
+
+        # Greedy assignment in batch order: a text joins the most similar
+        # earlier representative, so clusters never chain.
+        clusters: Dict[int, List[Tuple[int, float]]] = {}
+        for i, sig in enumerate(signatures):
+            if sig is None:
+                clusters[i] = [(i, 1.0)]
+                continue
+            candidates: Set[int] = set()
+            for band in range(self.bands):
+                key = (groups[i], band, tuple(sig[band * self.rows:(band + 1) * self.rows]))
+                candidates.update(j for j in buckets[key] if j < i and j in clusters)
+
+            best, best_score = None, 0.0
+            for rep in candidates:
+                score = self.similarity(sig, signatures[rep])
+                if score >= self.threshold and score > best_score:
+                    best, best_score = rep, score
+
+            if best is None:
+                clusters[i] = [(i, 1.0)]
+            else:
+                clusters[best].append((i, round(best_score, 3)))
+
+        return list(clusters.values())
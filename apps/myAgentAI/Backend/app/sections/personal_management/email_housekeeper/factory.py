@@ -0,0 +1,56 @@
+"""
+Email Housekeeper - Service Factory
+======================================
+Builds an EmailHousekeeperService with all dependencies wired up.
+Shared by the API router and background jobs (backfill, push, compaction).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.sections.personal_management.email_housekeeper.service import (
+    EmailHousekeeperService,
+)
+from app.sections.personal_management.email_housekeeper.classifier import (
+    EmailClassifier,
+)
+from app.sections.personal_management.email_housekeeper.reinforcement import (
+    ReinforcementService,
+)
+from app.sections.personal_management.email_housekeeper.vector_service import (
+    EmailVectorService,
+)
+from app.services.openai_service import OpenAIService
+from app.services.credential_service import credentials
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def create_vector_service(openai_service: OpenAIService):
+    """Vector memory backend selected by VECTOR_BACKEND (qdrant | pgvector)."""
+    if settings.VECTOR_BACKEND == "pgvector":
+        from app.sections.personal_management.email_housekeeper.pgvector_service import (
+            PgVectorService,
+        )
+        return PgVectorService(openai_service=openai_service)
+    if settings.VECTOR_BACKEND != "qdrant":
+        raise ValueError(f"Unknown VECTOR_BACKEND: {settings.VECTOR_BACKEND!r}")
+    return EmailVectorService(openai_service=openai_service)
+
+
+async def build_service(user_id: int, db: AsyncSession) -> EmailHousekeeperService:
+    """
+    Factory: builds the service for one user.
+    Resolves OpenAI key per user (fallback to system default).
+    """
+    openai_key = await credentials.openai_key(db, user_id)
+    openai_service = OpenAIService(api_key=openai_key)
+    vector_service = create_vector_service(openai_service)
+    classifier = EmailClassifier(openai_service=openai_service)
+    reinforcement = ReinforcementService(vector_service=vector_service)
+
+    return EmailHousekeeperService(
+        classifier=classifier,
+        reinforcement=reinforcement,
+        vector_service=vector_service,
+    )
@@ -1,16 +1,31 @@
-from typing import Any, Dict, Optional
-import google_auth_oauthlib.flow
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import html
 import json
 import logging
+import re
+from email import policy
+from email.parser import BytesFeedParser
+
+# google-auth / googleapiclient are imported on first use (see methods below):
+# they add noticeable import time and most API workers never touch Gmail.
 
 from app.core.config import get_settings
+from app.core.metrics import track_stage
+from app.utils.tokens import CHARS_PER_TOKEN, truncate_to_tokens
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+_FEED_CHUNK = 64 * 1024  # base64 chars decoded per BytesFeedParser.feed()
+_TAG = re.compile(r"<(script|style)[^>]*>.*?</\1>|<[^>]+>", re.S | re.I)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class HistoryExpired(Exception):
+    """`history.list` 404: the start historyId is older than Gmail keeps (~1 week)."""
+
+
 class GmailClient:
     """
     Wrapper for Gmail API with automatic token refreshing.
@@ -29,6 +44,8 @@ class GmailClient:
         1. Try parsing as full JSON (access_token, refresh_token, etc.)
         2. If just a string, assume it's a raw access token (legacy/manual mode).
         """
+        from google.oauth2.credentials import Credentials
+
         try:
             data = json.loads(self.token_data)
             
@@ -53,6 +70,9 @@ class GmailClient:
 
     def get_service(self):
         """Get the Gmail service resource, refreshing token if expired."""
+        from googleapiclient.discovery import build
+        from google.auth.transport.requests import Request
+
         if not self.creds:
             raise ValueError("No credentials loaded")
 
@@ -61,7 +81,8 @@ class GmailClient:
             if self.creds.refresh_token:
                 try:
                     logger.info("Access token expired. Refreshing...")
-                    self.creds.refresh(Request())
+                    with track_stage("gmail.token_refresh"):
+                        self.creds.refresh(Request())
                     logger.info("Token refreshed successfully.")
                     # meaningful TODO: Update DB with new token if refresh happened
                 except Exception as e:
@@ -70,7 +91,8 @@ class GmailClient:
             else:
                  logger.warning("Token expired and no refresh token available.")
 
-        return build('gmail', 'v1', credentials=self.creds)
+        with track_stage("gmail.build"):
+            return build('gmail', 'v1', credentials=self.creds)
 
     def fetch_emails(self, max_results: int = 50) -> list[Dict[str, Any]]:
         """Fetch emails from Inbox received in the last 24 hours."""
@@ -85,46 +107,191 @@ class GmailClient:
             
             logger.info(f"Fetching emails with query: {query}")
             
-            results = service.users().messages().list(
-                userId='me', 
-                q=query,
-                labelIds=['INBOX'], 
-                maxResults=max_results
-            ).execute()
+            with track_stage("gmail.list"):
+                results = service.users().messages().list(
+                    userId='me', 
+                    q=query,
+                    labelIds=['INBOX'], 
+                    maxResults=max_results
+                ).execute()
             
             messages = results.get('messages', [])
             logger.info(f"Found {len(messages)} messages.")
             
-            emails = []
-            for msg in messages:
-                try:
-                    txt = service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
-                    payload = txt.get('payload', {})
-                    headers = payload.get('headers', [])
-                    
-                    subject = next((h['value'] for h in headers if h['name'] == 'Subject'), '(No Subject)')
-                    sender = next((h['value'] for h in headers if h['name'] == 'From'), '(Unknown)')
-                    snippet = txt.get('snippet', '')
-                    
-                    emails.append({
-                        "email_id": msg['id'],
-                        "subject": subject,
-                        "sender": sender,
-                        "snippet": snippet
-                    })
-                except Exception as e:
-                    logger.warning(f"Failed to fetch email details for {msg['id']}: {e}")
-                    continue
-                    
+            return [e for e in (self._get_metadata(service, m) for m in messages) if e]
+
         except Exception as e:
             logger.error(f"Gmail API Error: {e}")
             raise
 
+    def fetch_page(
+        self,
+        query: str,
+        page_token: Optional[str] = None,
+        page_size: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of `messages.list` (newest first) with metadata for each
+        message. Returns (emails, next_page_token); the token is None on
+        the last page.
+        """
+        service = self.get_service()
+        with track_stage("gmail.list"):
+            results = service.users().messages().list(
+                userId='me',
+                q=query,
+                maxResults=page_size,
+                pageToken=page_token,
+            ).execute()
+        messages = results.get('messages', [])
+        emails = [e for e in (self._get_metadata(service, m) for m in messages) if e]
+        return emails, results.get('nextPageToken')
+
+    def fetch_history(
+        self, start_history_id: int, max_results: int = 100
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Inbox messages added after `start_history_id` (push-triggered runs),
+        oldest first, in whole history records up to about `max_results`.
+
+        Returns (emails, checkpoint, complete). `checkpoint` is the historyId
+        this batch covers up to — the last history record taken, or the
+        mailbox's current historyId once everything is taken (`complete`).
+        When not complete, call again from `checkpoint` for the rest.
+
+        Gmail keeps history for about a week; an expired checkpoint raises
+        HistoryExpired so the caller can resync from a listing.
+        """
+        from googleapiclient.errors import HttpError
+
+        service = self.get_service()
+        message_ids: Dict[str, None] = {}   # Ordered set, oldest first
+        checkpoint = start_history_id
+        complete = True
+        page_token = None
+        try:
+            while complete:
+                with track_stage("gmail.history"):
+                    results = service.users().history().list(
+                        userId='me',
+                        startHistoryId=str(start_history_id),
+                        historyTypes=['messageAdded'],
+                        labelId='INBOX',
+                        pageToken=page_token,
+                    ).execute()
+                for record in results.get('history', []):
+                    if len(message_ids) >= max_results:
+                        complete = False
+                        break
+                    for added in record.get('messagesAdded', []):
+                        message_ids[added['message']['id']] = None
+                    checkpoint = int(record['id'])
+                page_token = results.get('nextPageToken')
+                if complete and not page_token:
+                    checkpoint = max(checkpoint, int(results.get('historyId', checkpoint)))
+                    break
+        except HttpError as e:
+            if e.resp.status == 404:
+                raise HistoryExpired(f"History {start_history_id} has expired") from e
+            raise
+
+        logger.info(
+            f"History since {start_history_id}: {len(message_ids)} new messages"
+            f"{'' if complete else ' (more pending)'}"
+        )
+        emails = [e for e in (self._get_metadata(service, {"id": m}) for m in message_ids) if e]
+        return emails, checkpoint, complete
+
+    def current_history_id(self) -> int:
+        """The mailbox's latest historyId (a fresh push checkpoint)."""
+        service = self.get_service()
+        with track_stage("gmail.profile"):
+            return int(service.users().getProfile(userId='me').execute()['historyId'])
+
+    def watch(self, topic_name: str) -> Dict[str, Any]:
+        """
+        (Re)register Gmail push notifications for the inbox on a Pub/Sub
+        topic. Returns {"historyId", "expiration"}; watches lapse after 7
+        days unless renewed.
+        """
+        service = self.get_service()
+        with track_stage("gmail.watch"):
+            return service.users().watch(
+                userId='me',
+                body={"topicName": topic_name, "labelIds": ["INBOX"]},
+            ).execute()
+
+    def _get_metadata(self, service, msg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Headers + snippet of one listed message; None if it can't be read."""
+        try:
+            with track_stage("gmail.get"):
+                # Headers + snippet only; bodies are fetched lazily (fetch_body)
+                txt = service.users().messages().get(
+                    userId='me', id=msg['id'], format='metadata',
+                    metadataHeaders=['Subject', 'From'],
+                ).execute()
+        except Exception as e:
+            logger.warning(f"Failed to fetch email details for {msg['id']}: {e}")
+            return None
+
+        headers = txt.get('payload', {}).get('headers', [])
+        return {
+            "email_id": msg['id'],
+            "thread_id": txt.get('threadId') or msg.get('threadId'),
+            "internal_date": int(txt.get('internalDate', 0)),
+            "subject": next((h['value'] for h in headers if h['name'] == 'Subject'), '(No Subject)'),
+            "sender": next((h['value'] for h in headers if h['name'] == 'From'), '(Unknown)'),
+            "snippet": txt.get('snippet', ''),
+        }
+
+    def fetch_body(self, email_id: str, max_tokens: int) -> str:
+        """
+        Plain-text body of one message, capped at `max_tokens`.
+
+        The raw RFC 822 message is decoded and fed to BytesFeedParser in
+        chunks; only inline text/plain (or text/html as fallback) parts are
+        decoded — attachments and other MIME parts are skipped unread.
+        """
+        service = self.get_service()
+        with track_stage("gmail.get_raw"):
+            raw = service.users().messages().get(
+                userId='me', id=email_id, format='raw'
+            ).execute().get('raw', '')
+
+        parser = BytesFeedParser(policy=policy.default)
+        raw = raw + "=" * (-len(raw) % 4)
+        for start in range(0, len(raw), _FEED_CHUNK):
+            parser.feed(base64.urlsafe_b64decode(raw[start:start + _FEED_CHUNK]))
+        message = parser.close()
+
+        plain, markup = [], []
+        budget = max_tokens * CHARS_PER_TOKEN
+        for part in message.walk():
+            if part.is_multipart() or part.get_content_disposition() == "attachment":
+                continue
+            content_type = part.get_content_type()
+            if content_type not in ("text/plain", "text/html"):
+                continue
+            try:
+                text = part.get_content()
+            except (LookupError, ValueError):
+                continue  # Unknown charset / broken encoding
+            (plain if content_type == "text/plain" else markup).append(text)
+            if content_type == "text/plain" and sum(map(len, plain)) >= budget:
+                break  # Enough text for the token budget
+
+        if plain:
+            body = "\n".join(plain)
+        else:
+            body = html.unescape(_TAG.sub(" ", "\n".join(markup)))
+        return truncate_to_tokens(_WHITESPACE.sub(" ", body).strip(), max_tokens)
+
     def trash_email(self, email_id: str) -> bool:
         """Move an email to Trash."""
         try:
             service = self.get_service()
-            service.users().messages().trash(userId='me', id=email_id).execute()
+            with track_stage("gmail.trash"):
+                service.users().messages().trash(userId='me', id=email_id).execute()
             logger.info(f"Email moved to trash: {email_id}")
             return True
         except Exception as e:
@@ -0,0 +1,69 @@
+"""
+Email Housekeeper - Heuristic Scorer
+=======================================
+Zero-cost first tier of the classification cascade.
+
+Keyword and sender rules catch the obvious cases (spam blasts, promos,
+production alerts, security notices). Anything the rules are unsure about
+comes back with low confidence and is escalated to the LLM.
+
+Some keywords are only trustworthy from the right sender: "urgent" is as
+common in marketing subject lines as in pages. Such rules name a sender
+pattern; without a match they return _UNCONFIRMED confidence, which is
+below any sensible CASCADE_CONFIDENCE_THRESHOLD, so the LLM decides.
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+_UNCONFIRMED = 0.5
+
+_ALERT_SENDER = re.compile(
+    r"^(alerts?|alerting|monitoring|noc|oncall|ops|incidents?|status)@"
+    r"|@([\w-]+\.)*(pagerduty|opsgenie|statuspage|datadoghq|sentry)\.",
+    re.I,
+)
+
+# (pattern, priority, action, confidence, required sender) — first match
+# wins, most specific first
+_RULES: List[Tuple[re.Pattern, int, str, float, Optional[re.Pattern]]] = [
+    (re.compile(r"\b(you('|’)ve won|claim your (free|prize)|lottery|click here to claim)\b"),
+     5, "delete", 0.95, None),
+    (re.compile(r"\b(production (alert|down)|server down|outage|incident|urgent)\b"),
+     1, "keep", 0.85, _ALERT_SENDER),
+    (re.compile(r"\b(password reset|security alert|verification code|2fa|sign-in attempt)\b"),
+     2, "keep", 0.85, None),
+    (re.compile(r"\b(\d{1,2}% off|clearance|limited time|flash sale|promo code|use code)\b"),
+     4, "delete", 0.85, None),
+    (re.compile(r"\b(newsletter|weekly digest|unsubscribe)\b"),
+     4, "delete", 0.7, None),
+    (re.compile(r"\b(invoice|receipt|payment due|order #|has shipped)\b"),
+     3, "keep", 0.75, None),
+]
+
+_BULK_SENDER = re.compile(r"^(no-?reply|newsletter|deals|promo|marketing|offers)@", re.I)
+
+
+class HeuristicScorer:
+    """Rule-based classifier returning the same shape as the LLM tier."""
+
+    def score(self, subject: str, sender: str, snippet: str) -> Dict[str, Any]:
+        text = f"{subject or ''} {snippet or ''}".lower()
+        address = (sender or "").split("<")[-1].strip(" >")
+
+        for pattern, priority, action, confidence, sender_rule in _RULES:
+            if pattern.search(text):
+                if sender_rule is not None and not sender_rule.search(address):
+                    confidence = min(confidence, _UNCONFIRMED)
+                elif action == "delete" and not _BULK_SENDER.match(address):
+                    confidence -= 0.1  # Personal senders deserve a second look
+                return {
+                    "priority": priority,
+                    "action": action,
+                    "confidence": round(confidence, 2),
+                }
+
+        if _BULK_SENDER.match(address):
+            return {"priority": 4, "action": "delete", "confidence": 0.6}
+
+        return {"priority": 3, "action": "needs_review", "confidence": 0.0}
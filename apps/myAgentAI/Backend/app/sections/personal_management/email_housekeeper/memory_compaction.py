@@ -0,0 +1,234 @@
+"""
+Email Housekeeper - Memory Compaction
+========================================
+Background maintenance for the per-user feedback memory (Qdrant or pgvector).
+
+Every correction appends a new point, so heavy users pile up near-identical
+memories. Compaction, per user:
+  1. Age-out — drop memories older than MEMORY_MAX_AGE_DAYS, then pre-cap
+     to the MEMORY_COMPACTION_MAX_INPUT strongest so clustering stays bounded
+  2. Cluster — greedily group same-action memories whose cosine similarity
+     to a cluster centroid is >= MEMORY_MERGE_THRESHOLD
+  3. Merge   — replace each multi-member cluster with one vote-weighted
+     representative carrying the summed vote count
+  4. Cap     — keep at most MEMORY_MAX_PER_USER memories (most votes,
+     most recent first)
+
+The job is scheduled in every worker, so each run first takes the
+"memory_compaction" lease (app/db/leases.py) and renews it between users;
+two workers never merge the same user's points at once. Clustering is pure
+Python over full-size embeddings, so the per-user plan is computed in the
+threadpool; only the vector-store I/O runs on the event loop.
+"""
+
+import logging
+import math
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.sections.personal_management.email_housekeeper.vector_service import (
+    EmailVectorService,
+)
+from app.sections.personal_management.email_housekeeper.factory import (
+    create_vector_service,
+)
+from app.services.openai_service import OpenAIService
+from app.core.config import get_settings
+from app.db.leases import Lease, job_lease
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class _Cluster:
+    """Running vote-weighted centroid of a group of memories."""
+
+    def __init__(self, memory: Dict[str, Any], unit: List[float]):
+        self.members: List[Dict[str, Any]] = []
+        self._sum: List[float] = [0.0] * len(unit)
+        self.centroid: List[float] = []
+        self.add(memory, unit)
+
+    def add(self, memory: Dict[str, Any], unit: List[float]) -> None:
+        votes = memory["payload"].get("votes", 1)
+        self._sum = [s + votes * u for s, u in zip(self._sum, unit)]
+        self.centroid = _normalize(self._sum)
+        self.members.append(memory)
+
+    def representative(self, user_id: int) -> Dict[str, Any]:
+        """Build the merged memory point for this cluster."""
+        votes = sum(m["payload"].get("votes", 1) for m in self.members)
+        priorities: Counter = Counter()
+        for m in self.members:
+            priorities[m["payload"].get("priority", 3)] += m["payload"].get("votes", 1)
+
+        strongest = max(self.members, key=lambda m: m["payload"].get("votes", 1))
+        timestamps = [
+            ts for ts in (
+                _parse_timestamp(m["payload"].get("created_at")) for m in self.members
+            ) if ts
+        ]
+        created_at = max(timestamps) if timestamps else datetime.now(timezone.utc)
+
+        return {
+            "id": str(uuid.uuid4()),
+            "vector": self.centroid,
+            "payload": {
+                "user_id": user_id,
+                "text": strongest["payload"].get("text", ""),
+                "action": strongest["payload"].get("action", "needs_review"),
+                "priority": priorities.most_common(1)[0][0],
+                "votes": votes,
+                "created_at": created_at.isoformat(),
+                "source": "compaction",
+            },
+        }
+
+
+class MemoryCompactionService:
+    """Merges, caps and ages out a user's feedback memories."""
+
+    def __init__(self, vector_service: EmailVectorService):
+        self.vector_service = vector_service
+
+    async def compact_all_users(self, lease: Optional[Lease] = None) -> Dict[str, int]:
+        """
+        Compact every user's memory. Returns aggregate counts.
+        With a `lease`, it is renewed before each user and the run stops if
+        it was lost.
+        """
+        totals = {"users": 0, "merged": 0, "expired": 0, "evicted": 0}
+        for user_id in await self.vector_service.list_user_ids():
+            if lease is not None and not await lease.renew():
+                logger.warning("Memory compaction lease lost; stopping this run")
+                break
+            result = await self.compact_user(user_id)
+            totals["users"] += 1
+            for key in ("merged", "expired", "evicted"):
+                totals[key] += result[key]
+        logger.info(f"Memory compaction finished: {totals}")
+        return totals
+
+    async def compact_user(self, user_id: int) -> Dict[str, int]:
+        """Run age-out, merge and cap for a single user."""
+        memories = await self.vector_service.scroll_user_memories(user_id)
+        to_write, to_delete, counts = await run_in_threadpool(self._plan, user_id, memories)
+
+        # Write representatives before deleting members so a crash
+        # mid-compaction can only duplicate memory, never lose it.
+        await self.vector_service.upsert_memories(to_write)
+        await self.vector_service.delete_memories(user_id, sorted(set(to_delete)))
+        return counts
+
+    def _plan(
+        self, user_id: int, memories: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, int]]:
+        """CPU-bound part of compact_user: (to_write, to_delete, counts)."""
+        to_delete: List[str] = []
+        to_write: List[Dict[str, Any]] = []
+
+        # Step 1: Age-out
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.MEMORY_MAX_AGE_DAYS)
+        fresh = []
+        for m in memories:
+            created_at = _parse_timestamp(m["payload"].get("created_at"))
+            if created_at and created_at < cutoff:
+                to_delete.append(m["id"])
+            else:
+                fresh.append(m)
+        expired = len(to_delete)
+
+        # Pre-cap: clustering is quadratic, so only the strongest are clustered
+        evicted = 0
+        if len(fresh) > settings.MEMORY_COMPACTION_MAX_INPUT:
+            fresh.sort(key=self._strength, reverse=True)
+            overflow = fresh[settings.MEMORY_COMPACTION_MAX_INPUT:]
+            fresh = fresh[:settings.MEMORY_COMPACTION_MAX_INPUT]
+            to_delete.extend(m["id"] for m in overflow)
+            evicted = len(overflow)
+
+        # Step 2 + 3: Cluster and merge (never across different actions)
+        clusters = self._cluster(fresh)
+        survivors: List[Dict[str, Any]] = []
+        merged = 0
+        for cluster in clusters:
+            if len(cluster.members) == 1:
+                survivors.append(cluster.members[0])
+                continue
+            representative = cluster.representative(user_id)
+            to_write.append(representative)
+            to_delete.extend(m["id"] for m in cluster.members)
+            survivors.append(representative)
+            merged += len(cluster.members) - 1
+
+        # Step 4: Per-user cap
+        if len(survivors) > settings.MEMORY_MAX_PER_USER:
+            survivors.sort(key=self._strength, reverse=True)
+            dropped = survivors[settings.MEMORY_MAX_PER_USER:]
+            dropped_ids = {m["id"] for m in dropped}
+            new_ids = {m["id"] for m in to_write}
+            evicted += len(dropped)
+            to_write = [m for m in to_write if m["id"] not in dropped_ids]
+            to_delete.extend(dropped_ids - new_ids)  # Unwritten reps need no delete
+
+        return to_write, to_delete, {"merged": merged, "expired": expired, "evicted": evicted}
+
+    @staticmethod
+    def _strength(memory: Dict[str, Any]) -> Tuple[int, str]:
+        """Eviction order: most votes, then most recent, survive."""
+        return (memory["payload"].get("votes", 1), memory["payload"].get("created_at") or "")
+
+    def _cluster(self, memories: List[Dict[str, Any]]) -> List[_Cluster]:
+        """Greedy leader clustering, strongest memories seed clusters first."""
+        ordered = sorted(
+            memories, key=lambda m: m["payload"].get("votes", 1), reverse=True
+        )
+        clusters: Dict[str, List[_Cluster]] = {}
+        for memory in ordered:
+            action = memory["payload"].get("action", "needs_review")
+            unit = _normalize(memory["vector"])
+            candidates = clusters.setdefault(action, [])
+
+            best, best_score = None, settings.MEMORY_MERGE_THRESHOLD
+            for cluster in candidates:
+                score = _dot(unit, cluster.centroid)
+                if score >= best_score:
+                    best, best_score = cluster, score
+
+            if best:
+                best.add(memory, unit)
+            else:
+                candidates.append(_Cluster(memory, unit))
+
+        return [c for group in clusters.values() for c in group]
+
+
+async def run_memory_compaction() -> None:
+    """Entry point for the periodic background job."""
+    async with job_lease("memory_compaction") as lease:
+        if lease is None:
+            return  # Another worker is compacting
+        vector_service = create_vector_service(OpenAIService())
+        await MemoryCompactionService(vector_service).compact_all_users(lease)
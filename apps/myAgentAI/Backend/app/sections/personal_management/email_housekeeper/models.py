@@ -1,13 +1,13 @@
 """
 Email Housekeeper - ORM Models
 ================================
-Database models for email records and user feedback.
+Database models for email records, Gmail thread decisions and user feedback.
 """
 
 import enum
 from sqlalchemy import (
-    Column, Integer, String, Float, Boolean,
-    DateTime, Text, ForeignKey,
+    Column, Integer, BigInteger, String, Float, Boolean,
+    Date, DateTime, Text, ForeignKey, Index, LargeBinary, UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -44,6 +44,9 @@ class EmailRecord(Base):
         index=True,
     )
     email_id = Column(String(255), nullable=False)
+    thread_id = Column(String(255))               # Gmail threadId (see EmailThreadRecord)
+    duplicate_of = Column(String(255))            # Representative email_id (near-duplicate)
+    duplicate_similarity = Column(Float)          # Estimated Jaccard to the representative
     subject = Column(String(500))
     sender = Column(String(255))
     snippet = Column(Text)
@@ -58,16 +61,76 @@ class EmailRecord(Base):
     rule_weight = Column(Float, default=0.0)
     final_score = Column(Float, default=0.0)
 
+    # LLM token usage for this classification
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+
+    # Classification cascade accounting
+    classifier_tier = Column(String(20))          # heuristic | cheap | strong | failed
+    classification_cost_usd = Column(Float, default=0.0)
+    classification_latency_ms = Column(Float, default=0.0)
+    body_escalated = Column(Boolean, default=False)  # Reclassified on the full body
+
+    # Generated lazily by GET /email/review/{id}/explain, then cached here
+    explanation = Column(Text)
+    explained_at = Column(DateTime(timezone=True))
+
     auto_executed = Column(Boolean, default=False)
     processed_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="email_records")
 
+    # Every hot query filters by user and a processed_at window; one record
+    # per message, however many runs (live, push, backfill) see it at once
+    __table_args__ = (
+        Index("ix_email_records_user_processed", "user_id", "processed_at"),
+        Index("uq_email_records_user_email", "user_id", "email_id", unique=True),
+    )
+
     def __repr__(self) -> str:
         return f"<EmailRecord(id={self.id}, subject={self.subject[:30]})>"
 
 
+# ── Email Thread Record ──────────────────────────────────
+
+class EmailThreadRecord(Base):
+    """
+    One classification per Gmail thread. Every message in the thread gets
+    this decision; it is reused until a newer message arrives.
+    """
+    __tablename__ = "email_thread_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    thread_id = Column(String(255), nullable=False)
+    last_message_id = Column(String(255), nullable=False)   # Message classified
+    last_internal_date = Column(BigInteger, default=0)      # Gmail internalDate (ms)
+    message_count = Column(Integer, default=0)
+
+    priority = Column(Integer, default=3)
+    action = Column(String(20), default=EmailAction.REVIEW.value)
+    llm_confidence = Column(Float, default=0.0)
+    vector_similarity = Column(Float, default=0.0)
+    rule_weight = Column(Float, default=0.0)
+    final_score = Column(Float, default=0.0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "thread_id", name="uq_user_thread"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<EmailThread(user_id={self.user_id}, thread_id={self.thread_id}, action={self.action})>"
+
+
 # ── Feedback Record ──────────────────────────────────────
 
 class FeedbackRecord(Base):
@@ -94,5 +157,102 @@ class FeedbackRecord(Base):
     user = relationship("User", back_populates="feedback_records")
     email_record = relationship("EmailRecord")
 
+    __table_args__ = (
+        Index("ix_feedback_records_user_created", "user_id", "created_at"),
+    )
+
     def __repr__(self) -> str:
         return f"<Feedback(id={self.id}, override={self.is_override})>"
+
+
+# ── Inbox Backfill Job ───────────────────────────────────
+
+class BackfillStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class BackfillJob(Base):
+    """
+    Historical inbox walk for one user. `page_token` is the durable
+    checkpoint: it is committed together with each page's records, so a
+    restarted job resumes at the first unprocessed page.
+    """
+    __tablename__ = "email_backfill_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status = Column(String(20), default=BackfillStatus.PENDING.value, index=True)
+    query = Column(String(255), nullable=False)    # Gmail search, fixed at creation
+    page_token = Column(String(255))               # Next page to process (None → first)
+    pages_done = Column(Integer, default=0)
+    messages_seen = Column(Integer, default=0)
+    messages_processed = Column(Integer, default=0)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<BackfillJob(id={self.id}, user_id={self.user_id}, status={self.status})>"
+
+
+# ── Gmail Push ───────────────────────────────────────────
+
+class GmailPushState(Base):
+    """
+    Per-user Gmail push checkpoint. `history_id` is where the next
+    push-triggered run starts its `history.list`; it only advances past
+    messages that were processed and committed, so a failed or truncated
+    run is continued from the same point.
+    """
+    __tablename__ = "email_push_state"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    history_id = Column(BigInteger)                 # None → next run resyncs from a listing
+    watch_expires_at = Column(DateTime(timezone=True))
+    last_notified_at = Column(DateTime(timezone=True))
+    last_run_at = Column(DateTime(timezone=True))
+    notifications = Column(Integer, default=0)      # Received (all bursts)
+    runs = Column(Integer, default=0)               # Pipeline batches they coalesced into
+
+    def __repr__(self) -> str:
+        return f"<GmailPushState(user_id={self.user_id}, history_id={self.history_id})>"
+
+
+# ── Email History (archive) ──────────────────────────────
+
+class EmailHistoryRecord(Base):
+    """
+    Compressed archive of email + feedback records, one row per user per day.
+    Range-partitioned by `day` on Postgres (monthly partitions, see
+    archival.py); a plain table on SQLite.
+    """
+    __tablename__ = "email_record_history"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    record_count = Column(Integer, default=0)
+    feedback_count = Column(Integer, default=0)
+    payload = Column(LargeBinary, nullable=False)   # zlib(JSON {records, feedback})
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = {"postgresql_partition_by": "RANGE (day)"}
+
+    def __repr__(self) -> str:
+        return f"<EmailHistory(user_id={self.user_id}, day={self.day}, records={self.record_count})>"
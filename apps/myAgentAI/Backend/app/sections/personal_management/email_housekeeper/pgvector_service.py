@@ -0,0 +1,293 @@
+"""
+Email Housekeeper - pgvector Memory Backend
+==============================================
+Postgres implementation of the EmailVectorService interface, selected with
+VECTOR_BACKEND=pgvector. Memories live next to email_records and
+feedback_records, so they can be joined in SQL and there is no separate
+vector database to run.
+
+  email_memories  PARTITION BY HASH (user_id), PGVECTOR_PARTITIONS ways
+                  HNSW (vector_cosine_ops) index on every partition
+
+A user's top-k is one statement: `WHERE user_id = …` prunes to a single
+partition, whose HNSW index serves the ORDER BY. hnsw.ef_search and (on
+pgvector ≥ 0.8) iterative scans are set per connection at connect time, so
+the filtered query needs no extra round trip and still returns k rows when
+the partition holds other users' memories.
+
+The schema is raw DDL (pgvector has no SQLAlchemy type without an extra
+package); vectors travel as '[x,y,…]' text literals. It ships as Alembic
+revision u046_pgvector_memories, built from schema_statements() for the
+current settings — nothing is created at request time. Partition count is
+fixed when the table is first created. With PGVECTOR_URL set the table
+lives in another database, so it has no foreign key to users.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+
+from sqlalchemy import text as sql_text
+
+from app.services.openai_service import OpenAIService
+from app.core.config import get_settings
+from app.db.telemetry import instrument_engine, pool_args
+from app.sections.personal_management.email_housekeeper.vector_service import (
+    NATIVE_DIMENSIONS, VECTOR_SIZE,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+settings = get_settings()
+
+# Like the Qdrant collections: one table per embedding size
+TABLE_NAME = "email_memories" if VECTOR_SIZE == NATIVE_DIMENSIONS else f"email_memories_d{VECTOR_SIZE}"
+_COLUMNS = {"user_id", "text", "action", "priority", "votes", "created_at", "email_record_id"}
+
+_engine: Optional["AsyncEngine"] = None
+
+
+def _get_engine() -> "AsyncEngine":
+    """Process-wide engine for memory queries, created on first use."""
+    global _engine
+    if _engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        server_settings = {"hnsw.ef_search": str(settings.PGVECTOR_EF_SEARCH)}
+        if settings.PGVECTOR_ITERATIVE_SCAN:
+            server_settings["hnsw.iterative_scan"] = settings.PGVECTOR_ITERATIVE_SCAN
+        _engine = create_async_engine(
+            settings.PGVECTOR_URL or settings.DATABASE_URL,
+            connect_args={"server_settings": server_settings},  # asyncpg startup packet
+            **pool_args(
+                "pgvector",
+                pool_size=settings.PGVECTOR_POOL_SIZE,
+                max_overflow=settings.PGVECTOR_MAX_OVERFLOW,
+            ),
+        )
+        instrument_engine(_engine, "pgvector")
+    return _engine
+
+
+def _vector_literal(vector: List[float]) -> str:
+    return "[" + ",".join(repr(float(v)) for v in vector) + "]"
+
+
+def schema_statements(foreign_key: bool = True) -> List[str]:
+    """DDL for the memory table, its partitions and indexes (Alembic only)."""
+    references = " REFERENCES users(id) ON DELETE CASCADE" if foreign_key else ""
+    statements = [
+        "CREATE EXTENSION IF NOT EXISTS vector",
+        f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+            id UUID NOT NULL,
+            user_id INTEGER NOT NULL{references},
+            embedding vector({VECTOR_SIZE}) NOT NULL,
+            text TEXT NOT NULL DEFAULT '',
+            action VARCHAR(20) NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 3,
+            votes INTEGER NOT NULL DEFAULT 1,
+            email_record_id INTEGER,
+            payload JSONB NOT NULL DEFAULT '{{}}',
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (user_id, id)
+        ) PARTITION BY HASH (user_id)
+        """,
+    ]
+    statements += [
+        f"CREATE TABLE IF NOT EXISTS {TABLE_NAME}_p{i} PARTITION OF {TABLE_NAME} "
+        f"FOR VALUES WITH (MODULUS {settings.PGVECTOR_PARTITIONS}, REMAINDER {i})"
+        for i in range(settings.PGVECTOR_PARTITIONS)
+    ]
+    statements += [
+        f"""
+        CREATE INDEX IF NOT EXISTS {TABLE_NAME}_embedding_hnsw ON {TABLE_NAME}
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = {settings.PGVECTOR_HNSW_M}, ef_construction = {settings.PGVECTOR_HNSW_EF_CONSTRUCTION})
+        """,
+        f"CREATE INDEX IF NOT EXISTS {TABLE_NAME}_email_record ON {TABLE_NAME} (email_record_id)",
+    ]
+    return statements
+
+
+class PgVectorService:
+    """User-scoped vector memory in Postgres (drop-in for EmailVectorService)."""
+
+    def __init__(self, openai_service: OpenAIService):
+        self.engine = _get_engine()
+        self.openai_service = openai_service
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        """Generate an embedding vector for the given text."""
+        return await self.openai_service.create_embedding(text)
+
+    async def store_memory(
+        self,
+        user_id: int,
+        text: str,
+        embedding: List[float],
+        action: str,
+        priority: int,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Store an email decision in vector memory (user-scoped)."""
+        point_id = str(uuid.uuid4())
+        await self.upsert_memories([{
+            "id": point_id,
+            "vector": embedding,
+            "payload": {
+                "user_id": user_id,
+                "text": text,
+                "action": action,
+                "priority": priority,
+                "votes": 1,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                **(metadata or {}),
+            },
+        }])
+        return point_id
+
+    async def find_similar(
+        self,
+        user_id: int,
+        embedding: List[float],
+        top_k: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find similar past decisions for this user — one statement.
+        Returns list of matches with score, action, priority, votes.
+        """
+        # MATERIALIZED + outer ORDER BY: iterative scans may return rows
+        # slightly out of order (relaxed_order)
+        query = sql_text(f"""
+            WITH nearest AS MATERIALIZED (
+                SELECT action, priority, text, votes,
+                       embedding <=> CAST(CAST(:embedding AS text) AS vector) AS distance
+                FROM {TABLE_NAME}
+                WHERE user_id = :user_id
+                ORDER BY distance
+                LIMIT :top_k
+            )
+            SELECT * FROM nearest ORDER BY distance
+        """)
+        try:
+            async with self.engine.connect() as conn:
+                rows = (await conn.execute(query, {
+                    "embedding": _vector_literal(embedding),
+                    "user_id": user_id,
+                    "top_k": top_k,
+                })).mappings().all()
+        except Exception:
+            return []
+
+        return [
+            {
+                "score": 1.0 - row["distance"],
+                "action": row["action"],
+                "priority": row["priority"],
+                "text": row["text"],
+                "votes": row["votes"],
+            }
+            for row in rows
+        ]
+
+    # ── Maintenance (used by memory compaction) ──────────
+
+    async def list_user_ids(self) -> Set[int]:
+        """Return every user_id that owns at least one memory."""
+        async with self.engine.connect() as conn:
+            result = await conn.execute(sql_text(f"SELECT DISTINCT user_id FROM {TABLE_NAME}"))
+            return set(result.scalars().all())
+
+    async def scroll_user_memories(self, user_id: int) -> List[Dict[str, Any]]:
+        """Return all memories (payload + vector) for one user."""
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(
+                sql_text(f"""
+                    SELECT id, user_id, CAST(embedding AS text) AS embedding, text, action,
+                           priority, votes, email_record_id, payload, created_at
+                    FROM {TABLE_NAME}
+                    WHERE user_id = :user_id
+                """),
+                {"user_id": user_id},
+            )).mappings().all()
+
+        memories = []
+        for row in rows:
+            extra = row["payload"]
+            payload = {
+                **(json.loads(extra) if isinstance(extra, str) else extra or {}),
+                "user_id": row["user_id"],
+                "text": row["text"],
+                "action": row["action"],
+                "priority": row["priority"],
+                "votes": row["votes"],
+                "created_at": row["created_at"].isoformat(),
+            }
+            if row["email_record_id"] is not None:
+                payload["email_record_id"] = row["email_record_id"]
+            memories.append({
+                "id": str(row["id"]),
+                "vector": json.loads(row["embedding"]),
+                "payload": payload,
+            })
+        return memories
+
+    async def upsert_memories(self, memories: List[Dict[str, Any]]) -> None:
+        """Write pre-built memories ({id, vector, payload})."""
+        if not memories:
+            return
+        statement = sql_text(f"""
+            INSERT INTO {TABLE_NAME}
+                (id, user_id, embedding, text, action, priority, votes,
+                 email_record_id, payload, created_at)
+            VALUES
+                (CAST(:id AS uuid), :user_id, CAST(CAST(:embedding AS text) AS vector),
+                 :text, :action, :priority, :votes,
+                 :email_record_id, CAST(:payload AS jsonb), :created_at)
+            ON CONFLICT (user_id, id) DO UPDATE SET
+                embedding = EXCLUDED.embedding,
+                text = EXCLUDED.text,
+                action = EXCLUDED.action,
+                priority = EXCLUDED.priority,
+                votes = EXCLUDED.votes,
+                email_record_id = EXCLUDED.email_record_id,
+                payload = EXCLUDED.payload,
+                created_at = EXCLUDED.created_at
+        """)
+        params = []
+        for m in memories:
+            payload = m["payload"]
+            created_at = payload.get("created_at")
+            params.append({
+                "id": m["id"],
+                "user_id": payload["user_id"],
+                "embedding": _vector_literal(m["vector"]),
+                "text": payload.get("text", ""),
+                "action": payload.get("action", "needs_review"),
+                "priority": payload.get("priority", 3),
+                "votes": payload.get("votes", 1),
+                "email_record_id": payload.get("email_record_id"),
+                "payload": json.dumps({k: v for k, v in payload.items() if k not in _COLUMNS}),
+                "created_at": (
+                    datetime.fromisoformat(created_at) if created_at
+                    else datetime.now(timezone.utc)
+                ),
+            })
+        async with self.engine.begin() as conn:
+            await conn.execute(statement, params)
+
+    async def delete_memories(self, user_id: int, point_ids: List[str]) -> None:
+        """Delete one user's memories by id (user_id prunes to one partition)."""
+        if not point_ids:
+            return
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                sql_text(
+                    f"DELETE FROM {TABLE_NAME} "
+                    "WHERE user_id = :user_id AND id = ANY(CAST(:ids AS uuid[]))"
+                ),
+                {"user_id": user_id, "ids": list(point_ids)},
+            )
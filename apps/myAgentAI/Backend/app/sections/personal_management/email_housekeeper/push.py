@@ -0,0 +1,278 @@
+"""
+Email Housekeeper - Gmail Push Ingestion
+===========================================
+Turns Gmail push notifications (Cloud Pub/Sub push subscription) into
+incremental pipeline runs, so mail is processed shortly after it arrives
+instead of on a polling schedule.
+
+  Gmail → Pub/Sub → POST /email/push → PushDebouncer → run_push_sync
+
+A notification only says "this mailbox changed at historyId N"; runs work
+from the stored checkpoint instead, so the historyId is not kept. Bursts are
+coalesced per user: a run starts once the user's mailbox has been quiet for
+GMAIL_PUSH_DEBOUNCE_SECONDS, or at the latest GMAIL_PUSH_MAX_DELAY_SECONDS
+after the first notification of the burst. Notifications arriving while a
+run is in flight form the next burst — at most one run per user at a time.
+
+Each run fetches only messages added since the user's stored checkpoint
+(`history.list`), oldest first, in batches of GMAIL_PUSH_MAX_EMAILS. After
+each batch the checkpoint advances to the last history record that batch
+covered — never past a message that wasn't processed. If the checkpoint has
+expired (Gmail keeps about a week of history), the run resyncs from an inbox
+listing since the last run, page by page, and restarts from the mailbox's
+current historyId. Debounce state is per process; with several workers a
+burst may split into a few runs, which is harmless — the pipeline skips
+already-processed messages.
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.background import start_background_task
+from app.core.config import get_settings
+from app.db.session import async_session_factory
+from app.models.user import User
+from app.services.credential_service import credentials
+from app.sections.personal_management.email_housekeeper.models import GmailPushState
+from app.sections.personal_management.email_housekeeper.factory import build_service
+from app.sections.personal_management.email_housekeeper.gmail_client import (
+    GmailClient, HistoryExpired,
+)
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+# ── Pub/Sub envelope ─────────────────────────────────────
+
+def decode_push_envelope(envelope: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Extract (emailAddress, historyId) from a Pub/Sub push envelope:
+    {"message": {"data": base64(JSON), "messageId": ...}, "subscription": ...}
+    Raises ValueError on anything malformed.
+    """
+    try:
+        data = envelope["message"]["data"]
+        payload = json.loads(base64.b64decode(data))
+        return payload["emailAddress"].strip().lower(), int(payload["historyId"])
+    except (KeyError, TypeError, AttributeError, binascii.Error, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed push notification: {e}") from e
+
+
+async def find_user_by_address(db: AsyncSession, email_address: str) -> Optional[int]:
+    """Map the notified Gmail address to a user (matched on the account email)."""
+    result = await db.execute(
+        select(User.id).where(func.lower(User.email) == email_address)
+    )
+    return result.scalar_one_or_none()
+
+
+# ── Debouncer ────────────────────────────────────────────
+
+class _Burst:
+    """Notifications for one user not yet covered by a run."""
+
+    __slots__ = ("first_at", "last_at", "notifications", "notified_at")
+
+    def __init__(self, now: float):
+        self.first_at = now
+        self.last_at = now
+        self.notifications = 1
+        self.notified_at = datetime.now(timezone.utc)
+
+    def add(self, now: float) -> None:
+        self.last_at = now
+        self.notifications += 1
+        self.notified_at = datetime.now(timezone.utc)
+
+
+class PushDebouncer:
+    """Coalesces per-user notification bursts into single runs."""
+
+    def __init__(
+        self,
+        run: Callable[[int, "_Burst"], Awaitable[None]],
+        quiet_seconds: float,
+        max_delay_seconds: float,
+    ):
+        self.run = run
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._bursts: Dict[int, _Burst] = {}
+
+    def notify(self, user_id: int) -> None:
+        """Record a notification; starts the user's drain task if idle."""
+        now = time.monotonic()
+        burst = self._bursts.get(user_id)
+        if burst is None:
+            self._bursts[user_id] = _Burst(now)
+        else:
+            burst.add(now)
+        # No-op while the user's task runs — it picks the burst up itself
+        start_background_task(f"push:{user_id}", lambda: self._drain(user_id))
+
+    def pending(self) -> Dict[int, int]:
+        """user_id → notifications waiting for a run."""
+        return {uid: b.notifications for uid, b in self._bursts.items()}
+
+    async def _drain(self, user_id: int) -> None:
+        while True:
+            burst = self._bursts.get(user_id)
+            if burst is None:
+                return  # Same event-loop step as the task finishing: no lost notify
+            due = min(
+                burst.last_at + self.quiet_seconds,
+                burst.first_at + self.max_delay_seconds,
+            )
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            del self._bursts[user_id]
+            try:
+                await self.run(user_id, burst)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Checkpoint unchanged: the next notification retries the range
+                logger.error(f"Push run for user {user_id} failed: {e}")
+
+
+# ── Runs ─────────────────────────────────────────────────
+
+async def run_push_sync(user_id: int, burst: _Burst) -> None:
+    """Incremental pipeline runs covering a coalesced burst, batch by batch."""
+    processed = 0
+    async with async_session_factory() as db:
+        state = await db.get(GmailPushState, user_id)
+        if state is None:
+            state = GmailPushState(user_id=user_id)
+            db.add(state)
+
+        service = await build_service(user_id, db)
+        complete = False
+        while not complete:
+            try:
+                if state.history_id is None:
+                    raise HistoryExpired("No checkpoint yet")
+                stats = await service.process_emails(
+                    user_id=user_id,
+                    db=db,
+                    auto_mode=settings.GMAIL_PUSH_AUTO_MODE,
+                    max_emails=settings.GMAIL_PUSH_MAX_EMAILS,
+                    start_history_id=state.history_id,
+                )
+                checkpoint = stats["history_checkpoint"]
+                complete = stats["history_complete"]
+                processed += stats["total_processed"]
+            except HistoryExpired as e:
+                logger.warning(f"Push checkpoint for user {user_id} unusable ({e}); resyncing")
+                checkpoint, resynced = await _resync(db, service, user_id, state)
+                processed += resynced
+                complete = True
+
+            # This batch's records + checkpoint commit together
+            state.history_id = max(state.history_id or 0, checkpoint)
+            state.last_run_at = datetime.now(timezone.utc)
+            state.runs = (state.runs or 0) + 1
+            await db.commit()
+
+        state.last_notified_at = burst.notified_at
+        state.notifications = (state.notifications or 0) + burst.notifications
+        await db.commit()
+
+    logger.info(
+        f"Push run for user {user_id}: {burst.notifications} notification(s) → "
+        f"{processed} email(s)"
+    )
+
+
+# Resync listings start this far before the last run: a message can arrive
+# between a run's history fetch and its last_run_at stamp
+_RESYNC_OVERLAP = timedelta(hours=1)
+
+
+async def _resync(db: AsyncSession, service, user_id: int, state: GmailPushState) -> Tuple[int, int]:
+    """
+    Checkpoint expired (or never set): process every inbox message since the
+    last run, page by page, and return (new checkpoint, emails processed).
+
+    The new checkpoint is read before listing, so mail arriving during the
+    walk is picked up again by the next history fetch (and deduplicated).
+    """
+    token = await credentials.gmail_token(db, user_id)
+    if not token:
+        raise ValueError("No Gmail token configured for this user")
+    client = (service.gmail_client_factory or GmailClient)(token)
+    checkpoint = await run_in_threadpool(client.current_history_id)
+
+    if state.last_run_at is not None:
+        since = state.last_run_at - _RESYNC_OVERLAP
+    else:
+        since = datetime.now(timezone.utc) - timedelta(hours=24)
+    query = f"in:inbox after:{int(since.timestamp())}"
+
+    processed = 0
+    page_token = None
+    while True:
+        emails, page_token = await run_in_threadpool(
+            client.fetch_page, query, page_token, settings.GMAIL_PUSH_MAX_EMAILS
+        )
+        stats = await service.process_batch(
+            user_id=user_id,
+            db=db,
+            emails=emails,
+            auto_mode=settings.GMAIL_PUSH_AUTO_MODE,
+            body_fetcher=client.fetch_body,
+        )
+        await db.commit()
+        processed += stats["total_processed"]
+        if page_token is None:
+            return checkpoint, processed
+
+
+async def register_watch(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+    """
+    Start (or renew) Gmail push for the user on GMAIL_PUSH_TOPIC.
+    A first watch sets the checkpoint to the mailbox's current historyId.
+    """
+    if not settings.GMAIL_PUSH_TOPIC:
+        raise ValueError("GMAIL_PUSH_TOPIC is not configured")
+    token = await credentials.gmail_token(db, user_id)
+    if not token:
+        raise ValueError("No Gmail token configured for this user")
+
+    response = await run_in_threadpool(GmailClient(token).watch, settings.GMAIL_PUSH_TOPIC)
+    expires_at = datetime.fromtimestamp(int(response["expiration"]) / 1000, tz=timezone.utc)
+
+    state = await db.get(GmailPushState, user_id)
+    if state is None:
+        state = GmailPushState(user_id=user_id)
+        db.add(state)
+    if state.history_id is None:
+        state.history_id = int(response["historyId"])
+    state.watch_expires_at = expires_at
+    await db.flush()
+
+    return {
+        "history_id": state.history_id,
+        "watch_expires_at": expires_at.isoformat(),
+    }
+
+
+push_debouncer = PushDebouncer(
+    run=run_push_sync,
+    quiet_seconds=settings.GMAIL_PUSH_DEBOUNCE_SECONDS,
+    max_delay_seconds=settings.GMAIL_PUSH_MAX_DELAY_SECONDS,
+)
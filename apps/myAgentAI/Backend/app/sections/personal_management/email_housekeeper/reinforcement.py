@@ -8,11 +8,12 @@ When users override a decision, the correction is stored and influences
 future decisions via cosine similarity scoring.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from app.sections.personal_management.email_housekeeper.vector_service import (
     EmailVectorService,
 )
+from app.core.metrics import track_stage
 from app.utils.scoring import calculate_final_score, should_auto_execute
 from app.core.config import get_settings
 
@@ -43,11 +44,12 @@ class ReinforcementService:
         """
 
         # Find similar past decisions
-        similar_memories = await self.vector_service.find_similar(
-            user_id=user_id,
-            embedding=embedding,
-            top_k=5,
-        )
+        with track_stage("memory_search"):
+            similar_memories = await self.vector_service.find_similar(
+                user_id=user_id,
+                embedding=embedding,
+                top_k=5,
+            )
 
         # Extract best match
         vector_similarity = 0.0
@@ -100,16 +102,16 @@ class ReinforcementService:
         """
         Determine how consistent past actions were for similar emails.
         High consistency → high rule weight → more confidence.
+        Compacted memories count once per vote they absorbed.
         """
         if not similar_memories:
             return 0.5  # Neutral when no history
 
-        actions = [m["action"] for m in similar_memories]
-        if not actions:
-            return 0.5
+        votes: Dict[str, int] = {}
+        for m in similar_memories:
+            votes[m["action"]] = votes.get(m["action"], 0) + m.get("votes", 1)
 
-        most_common = max(set(actions), key=actions.count)
-        consistency = actions.count(most_common) / len(actions)
+        consistency = max(votes.values()) / sum(votes.values())
         return consistency
 
     async def store_feedback_memory(
@@ -119,6 +121,7 @@ class ReinforcementService:
         embedding: List[float],
         user_action: str,
         priority: int,
+        email_record_id: Optional[int] = None,
     ) -> str:
         """Store user feedback as a new memory point for future learning."""
         return await self.vector_service.store_memory(
@@ -127,5 +130,5 @@ class ReinforcementService:
             embedding=embedding,
             action=user_action,
             priority=priority,
-            metadata={"source": "user_feedback"},
+            metadata={"source": "user_feedback", "email_record_id": email_record_id},
         )
@@ -2,70 +2,97 @@
 Email Housekeeper - API Router
 =================================
 Endpoints:
-  POST /email/run      — Process emails through AI pipeline
-  GET  /email/stats    — 24h processing statistics
-  GET  /email/review   — Low-confidence emails for manual review
+  POST /email/run      — Process emails through AI pipeline (single-flight per user)
+  GET  /email/stats    — 24h processing statistics (ETag / 304)
+  GET  /email/review   — Low-confidence emails for manual review (ETag / 304)
+  GET  /email/review/{id}/explain — Why a decision was made (generated lazily)
   POST /email/feedback — User feedback for reinforcement learning
+  POST /email/backfill — Start a historical inbox backfill
+  GET  /email/backfill — Progress of the latest backfill
+  POST /email/watch    — Start/renew Gmail push notifications
+  POST /email/push     — Pub/Sub push endpoint (verification token, no JWT)
+
+Authenticated endpoints are admission-controlled per user and plan
+("pipeline" / "read" scopes, see app/core/admission.py): over the limit → 429.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import hmac
+
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
+from app.core.admission import admission, admitted
 from app.core.response import success_response, error_response
-from app.db.session import get_db
+from app.core.http_cache import etag_matches, make_etag, not_modified, set_etag
+from app.core.single_flight import FlightConflict, IdempotencyCache, SingleFlight
+from app.core.config import get_settings
+from app.db.session import async_session_factory, get_db, get_read_db
 from app.models.user import User
 
 from app.sections.personal_management.email_housekeeper.schemas import (
+    BackfillRequest,
     EmailRunRequest,
     FeedbackRequest,
 )
 from app.sections.personal_management.email_housekeeper.service import (
     EmailHousekeeperService,
 )
-from app.sections.personal_management.email_housekeeper.classifier import (
-    EmailClassifier,
+from app.sections.personal_management.email_housekeeper.factory import build_service
+from app.sections.personal_management.email_housekeeper.backfill import (
+    create_backfill_job,
+    get_latest_backfill_job,
+    job_to_dict,
+    start_backfill,
 )
-from app.sections.personal_management.email_housekeeper.reinforcement import (
-    ReinforcementService,
+from app.sections.personal_management.email_housekeeper.push import (
+    decode_push_envelope,
+    find_user_by_address,
+    push_debouncer,
+    register_watch,
 )
-from app.sections.personal_management.email_housekeeper.vector_service import (
-    EmailVectorService,
-)
-from app.services.openai_service import OpenAIService
-from app.core.config import get_settings
 
 
-router = APIRouter(prefix="/email", tags=["Email Housekeeper"])
 settings = get_settings()
+router = APIRouter(prefix="/email", tags=["Email Housekeeper"])
 
+# One in-flight /email/run per user; finished results replayable by Idempotency-Key
+run_flights = SingleFlight()
+run_results = IdempotencyCache(
+    ttl_seconds=settings.RUN_IDEMPOTENCY_TTL_SECONDS,
+    max_entries=settings.RUN_IDEMPOTENCY_MAX_ENTRIES,
+)
 
-def _build_service(user: User) -> EmailHousekeeperService:
-    """
-    Factory: builds the service with all dependencies wired up.
-    Resolves OpenAI key per user (fallback to system default).
-    """
-    # TODO: look up user's OpenAI key from DB; for now, use system default
-    openai_key = settings.OPENAI_API_KEY
-    openai_service = OpenAIService(api_key=openai_key)
-    vector_service = EmailVectorService(openai_service=openai_service)
-    classifier = EmailClassifier(openai_service=openai_service)
-    reinforcement = ReinforcementService(vector_service=vector_service)
 
-    return EmailHousekeeperService(
-        classifier=classifier,
-        reinforcement=reinforcement,
-        vector_service=vector_service,
-    )
+# ── POST /email/run ──────────────────────────────────────
+
+async def _run_in_own_session(user_id: int, auto_mode: bool, max_emails: int) -> dict:
+    """One pipeline run with its own session — it may outlive the request that started it."""
+    async with async_session_factory() as db:
+        service = await build_service(user_id, db)
+        stats = await service.process_emails(
+            user_id=user_id,
+            db=db,
+            auto_mode=auto_mode,
+            max_emails=max_emails,
+        )
+        await db.commit()
+        return stats
 
 
-# ── POST /email/run ──────────────────────────────────────
+async def _admitted_run(user: User, auto_mode: bool, max_emails: int) -> dict:
+    """The flight's work: only the caller that starts a run takes a pipeline slot."""
+    async with admitted(user, "pipeline"):
+        return await _run_in_own_session(user.id, auto_mode, max_emails)
+
 
 @router.post("/run")
 async def run_email_processing(
     request: EmailRunRequest,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    idempotency_key: str = Header(default="", max_length=255),
 ):
     """
     Process emails through the AI classification pipeline.
@@ -74,19 +101,53 @@ async def run_email_processing(
     - Classifies using OpenAI
     - Applies reinforcement memory
     - Returns processing stats
+
+    Concurrent calls for the same user join the run already in flight and
+    get its result (`X-Run-Shared: true`); a call with a different
+    auto_mode / max_emails gets 409 instead of another run's result. With
+    an `Idempotency-Key`, a retry within RUN_IDEMPOTENCY_TTL_SECONDS replays
+    the finished result (`Idempotent-Replayed: true`) instead of running
+    again. Admission is checked only when a new run starts, so joining or
+    replaying never uses a pipeline slot or the per-minute budget.
     """
+    user_id = current_user.id
+    fingerprint = f"{request.auto_mode}:{request.max_emails}"
     try:
-        service = _build_service(current_user)
-        stats = await service.process_emails(
-            user_id=current_user.id,
-            db=db,
-            auto_mode=request.auto_mode,
-            max_emails=request.max_emails,
+        if idempotency_key:
+            cached = run_results.get((user_id, idempotency_key), fingerprint)
+            if cached is not None:
+                response.headers["Idempotent-Replayed"] = "true"
+                return success_response(
+                    message="Email processing completed successfully",
+                    data=cached,
+                )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error_response(message=str(e)),
+        )
+
+    try:
+        stats, shared = await run_flights.do(
+            ("email_run", user_id),
+            lambda: _admitted_run(current_user, request.auto_mode, request.max_emails),
+            fingerprint=fingerprint,
         )
+        if idempotency_key:
+            run_results.put((user_id, idempotency_key), fingerprint, stats)
+        if shared:
+            response.headers["X-Run-Shared"] = "true"
         return success_response(
             message="Email processing completed successfully",
             data=stats,
         )
+    except FlightConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=error_response(message=str(e)),
+        )
+    except HTTPException:
+        raise  # 429 from admission, shared with anyone who joined
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -98,15 +159,26 @@ async def run_email_processing(
 
 # ── GET /email/stats ─────────────────────────────────────
 
-@router.get("/stats")
+@router.get("/stats", dependencies=[Depends(admission("read"))])
 async def get_email_stats(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get email processing statistics for the last 24 hours."""
+    """
+    Get email processing statistics for the last 24 hours.
+    Supports If-None-Match — unchanged polls get 304 without aggregating.
+    """
     try:
-        service = _build_service(current_user)
+        version = await EmailHousekeeperService.get_data_version(current_user.id, db)
+        etag = make_etag("stats", current_user.id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        service = await build_service(current_user.id, db)
         stats = await service.get_stats(user_id=current_user.id, db=db)
+        set_etag(response, etag)
         return success_response(
             message="Email stats retrieved successfully",
             data=stats,
@@ -122,17 +194,28 @@ async def get_email_stats(
 
 # ── GET /email/review ────────────────────────────────────
 
-@router.get("/review")
+@router.get("/review", dependencies=[Depends(admission("read"))])
 async def get_review_emails(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get emails marked for manual review (low-confidence decisions)."""
+    """
+    Get emails marked for manual review (low-confidence decisions).
+    Supports If-None-Match — unchanged polls get 304.
+    """
     try:
-        service = _build_service(current_user)
+        version = await EmailHousekeeperService.get_data_version(current_user.id, db)
+        etag = make_etag("review", current_user.id, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        service = await build_service(current_user.id, db)
         emails = await service.get_review_emails(
             user_id=current_user.id, db=db
         )
+        set_etag(response, etag)
         return success_response(
             message=f"Found {len(emails)} emails for review",
             data=emails,
@@ -146,9 +229,48 @@ async def get_review_emails(
         )
 
 
+# ── GET /email/review/{id}/explain ───────────────────────
+
+@router.get("/review/{email_record_id}/explain", dependencies=[Depends(admission("pipeline"))])
+async def explain_email_decision(
+    email_record_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Explain why an email was classified the way it was.
+
+    Runs skip reasoning to save output tokens; the explanation is
+    generated on first request and cached on the record.
+    """
+    try:
+        service = await build_service(current_user.id, db)
+        result = await service.explain_email(
+            user_id=current_user.id,
+            db=db,
+            email_record_id=email_record_id,
+        )
+        return success_response(
+            message="Explanation retrieved successfully",
+            data=result,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_response(message=str(e)),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_response(
+                message=f"Failed to explain email: {str(e)}"
+            ),
+        )
+
+
 # ── POST /email/feedback ─────────────────────────────────
 
-@router.post("/feedback")
+@router.post("/feedback", dependencies=[Depends(admission("pipeline"))])
 async def submit_feedback(
     request: FeedbackRequest,
     current_user: User = Depends(get_current_user),
@@ -163,7 +285,7 @@ async def submit_feedback(
     - Adjusts future decision confidence
     """
     try:
-        service = _build_service(current_user)
+        service = await build_service(current_user.id, db)
         result = await service.submit_feedback(
             user_id=current_user.id,
             db=db,
@@ -186,3 +308,125 @@ async def submit_feedback(
                 message=f"Failed to submit feedback: {str(e)}"
             ),
         )
+
+
+# ── POST /email/backfill ─────────────────────────────────
+
+@router.post(
+    "/backfill",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission("pipeline"))],
+)
+async def start_inbox_backfill(
+    request: BackfillRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Classify months of inbox history in the background.
+
+    Runs at a capped rate and yields to interactive /email/run calls;
+    progress is checkpointed per page and survives restarts.
+    """
+    try:
+        job = await create_backfill_job(db, current_user.id, request.months)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=error_response(message=str(e)),
+        )
+    # Commit before starting so the runner's own session sees the job
+    await db.commit()
+    await db.refresh(job)
+    start_backfill(job.id)
+    return success_response(
+        message="Backfill started",
+        data=job_to_dict(job),
+    )
+
+
+# ── GET /email/backfill ──────────────────────────────────
+
+@router.get("/backfill", dependencies=[Depends(admission("read"))])
+async def get_inbox_backfill(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Progress of the user's most recent backfill."""
+    job = await get_latest_backfill_job(db, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_response(message="No backfill has been started"),
+        )
+    return success_response(
+        message=f"Backfill {job.status}",
+        data=job_to_dict(job),
+    )
+
+
+# ── POST /email/watch ────────────────────────────────────
+
+@router.post("/watch", dependencies=[Depends(admission("pipeline"))])
+async def watch_inbox(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Register (or renew) Gmail push notifications for the user's inbox.
+    Gmail expires watches after 7 days — call this at least weekly.
+    """
+    try:
+        result = await register_watch(db, current_user.id)
+        return success_response(
+            message="Gmail push notifications enabled",
+            data=result,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response(message=str(e)),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=error_response(
+                message=f"Failed to register Gmail watch: {str(e)}"
+            ),
+        )
+
+
+# ── POST /email/push ─────────────────────────────────────
+
+@router.post("/push")
+async def receive_push_notification(
+    envelope: dict = Body(...),
+    token: str = Query(default=""),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Gmail push notification delivered by a Pub/Sub push subscription.
+
+    Authenticated by the shared `?token=` configured on the subscription.
+    Only records the notification — the run happens after the user's
+    burst settles. Anything that can't be acted on is still acknowledged
+    (2xx) so Pub/Sub doesn't redeliver it.
+    """
+    expected = settings.GMAIL_PUSH_VERIFICATION_TOKEN
+    if not expected or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=error_response(message="Invalid push verification token"),
+        )
+
+    try:
+        email_address, _ = decode_push_envelope(envelope)  # Runs use the stored checkpoint
+    except ValueError as e:
+        return success_response(message=f"Ignored: {e}")
+
+    user_id = await find_user_by_address(db, email_address)
+    if user_id is None:
+        return success_response(message="Ignored: unknown mailbox")
+
+    push_debouncer.notify(user_id)
+    return success_response(message="Notification queued")
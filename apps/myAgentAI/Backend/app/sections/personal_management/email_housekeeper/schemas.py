@@ -33,6 +33,14 @@ class FeedbackRequest(BaseModel):
     )
 
 
+class BackfillRequest(BaseModel):
+    """Request body for POST /email/backfill."""
+    months: int = Field(
+        default=6, ge=1, le=24,
+        description="How many months of inbox history to classify",
+    )
+
+
 # ── Response Schemas ─────────────────────────────────────
 
 class EmailRunResponse(BaseModel):
@@ -42,7 +50,15 @@ class EmailRunResponse(BaseModel):
     kept: int
     needs_review: int
     auto_executed: int
+    threads_classified: int = 0
+    threads_reused: int = 0
+    near_duplicates: int = 0
+    body_escalated: int = 0
     priority_breakdown: dict
+    stage_timings_ms: dict = Field(
+        default_factory=dict,
+        description="Per-stage {count, total_ms} breakdown for this run",
+    )
 
 
 class EmailReviewItem(BaseModel):
@@ -67,6 +83,10 @@ class EmailStatsResponse(BaseModel):
     auto_executed_count: int
     priority_breakdown: dict
     avg_confidence: float
+    tier_breakdown: dict = Field(
+        default_factory=dict,
+        description="Per cascade tier {count, cost_usd, avg_latency_ms}",
+    )
 
 
 class FeedbackResponse(BaseModel):
@@ -3,17 +3,29 @@ Email Housekeeper - Core Service
 ====================================
 Business logic for email processing pipeline.
 
-Pipeline: Fetch → Classify (LLM) → Embed → Reinforce (Memory) → Decide → Store
+Pipeline: Fetch → Group by thread → Cluster near-duplicates
+          → Classify (LLM) → Embed → Reinforce (Memory) → Decide → Store
 """
 
-from typing import List, Dict, Any
+import logging
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from datetime import datetime, timedelta, timezone
+from email.utils import parseaddr
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-
+from sqlalchemy import case, func, select, update
+
+from app.core.metrics import collect_stage_timings, track_stage
+from app.core.priority import pipeline_gate
+from app.db.upsert import insert_for
+from app.services.credential_service import credentials
+from app.core.config import get_settings
+from app.utils.scoring import should_auto_execute
 from app.sections.personal_management.email_housekeeper.models import (
-    EmailRecord, FeedbackRecord, EmailAction,
+    EmailRecord, EmailThreadRecord, FeedbackRecord, EmailAction,
+)
+from app.sections.personal_management.email_housekeeper.dedup import (
+    NearDuplicateClusterer,
 )
 from app.sections.personal_management.email_housekeeper.classifier import (
     EmailClassifier,
@@ -25,6 +37,9 @@ from app.sections.personal_management.email_housekeeper.vector_service import (
     EmailVectorService,
 )
 
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
 
 # ── Mock Email Data (replace with Gmail API later) ───────
 MOCK_EMAILS = [
@@ -99,10 +114,15 @@ class EmailHousekeeperService:
         classifier: EmailClassifier,
         reinforcement: ReinforcementService,
         vector_service: EmailVectorService,
+        gmail_client_factory: Optional[Callable[[str], Any]] = None,
     ):
         self.classifier = classifier
         self.reinforcement = reinforcement
         self.vector_service = vector_service
+        # Builds a Gmail client from a token; defaults to GmailClient.
+        # Overridable so the pipeline can run against local stand-ins.
+        self.gmail_client_factory = gmail_client_factory
+        self.clusterer = NearDuplicateClusterer()
 
     # ── POST /email/run ──────────────────────────────────
 
@@ -112,59 +132,126 @@ class EmailHousekeeperService:
         db: AsyncSession,
         auto_mode: bool = False,
         max_emails: int = 20,
+        start_history_id: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Process a batch of emails through the AI classification pipeline."""
-        
-        
-        # Check for User's Gmail Key
-        from app.models.api_keys import UserAPIKey
+        """
+        Process a batch of emails through the AI classification pipeline.
+
+        With `start_history_id` (push-triggered runs) only messages added
+        since that Gmail history point are fetched, oldest first, and fetch
+        errors are raised instead of yielding an empty batch so the caller
+        keeps its checkpoint. The stats then carry `history_checkpoint`
+        (what this run covered up to) and `history_complete` (False when
+        max_emails cut the range short — run again from the checkpoint).
+        """
+        # Interactive: background backfills pause between pages while this runs
+        async with pipeline_gate.interactive():
+            with collect_stage_timings() as timings:
+                with track_stage("run_total"):
+                    stats = await self._run_pipeline(
+                        user_id=user_id,
+                        db=db,
+                        auto_mode=auto_mode,
+                        max_emails=max_emails,
+                        start_history_id=start_history_id,
+                    )
+        stats["stage_timings_ms"] = timings.as_dict()
+        return stats
+
+    async def _run_pipeline(
+        self,
+        user_id: int,
+        db: AsyncSession,
+        auto_mode: bool,
+        max_emails: int,
+        start_history_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Fetch, dedupe and process one batch (timed by process_emails)."""
+
         from app.sections.personal_management.email_housekeeper.gmail_client import GmailClient
-        from app.core.config import get_settings
-        
-        settings = get_settings()
-        
-        result = await db.execute(
-            select(UserAPIKey).where(
-                UserAPIKey.user_id == user_id,
-                UserAPIKey.service_name == "gmail"
-            )
-        )
-        api_key_record = result.scalar_one_or_none()
-        
+
+        # User's Gmail token, else the server-wide default (cached resolver)
+        with track_stage("credentials_lookup"):
+            token_to_use = await credentials.gmail_token(db, user_id)
+
         emails = []
-        token_to_use = None
-        
-        # Priority 1: User-specific key from DB
-        if api_key_record:
-            token_to_use = api_key_record.api_key
-        # Priority 2: Server-wide default key (fallback)
-        elif settings.DEFAULT_GMAIL_TOKEN:
-            token_to_use = settings.DEFAULT_GMAIL_TOKEN
-            
+        client = None
+        history: Dict[str, Any] = {}
+
         if token_to_use:
             try:
-                client = GmailClient(token_to_use)
-                emails = client.fetch_emails(max_results=max_emails)
+                with track_stage("gmail_fetch"):
+                    client = (self.gmail_client_factory or GmailClient)(token_to_use)
+                    if start_history_id is not None:
+                        emails, checkpoint, complete = client.fetch_history(
+                            start_history_id, max_results=max_emails
+                        )
+                        history = {"history_checkpoint": checkpoint, "history_complete": complete}
+                    else:
+                        emails = client.fetch_emails(max_results=max_emails)
             except Exception as e:
                 print(f"Gmail fetch failed: {e}")
+                if start_history_id is not None:
+                    raise
                 emails = []
                 # Fallback disabled to ensure only real data is shown
                 # if not emails:
                 #     emails = MOCK_EMAILS[:max_emails]
+        elif start_history_id is not None:
+            raise ValueError("No Gmail token configured for this user")
         else:
              # Fallback disabled
              # emails = MOCK_EMAILS[:max_emails]
              emails = []
 
-        # Fetch existing email_ids for today to prevent duplicates
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-        existing_q = await db.execute(
-            select(EmailRecord.email_id).where(
-                EmailRecord.user_id == user_id,
-                EmailRecord.processed_at >= cutoff_time
-            )
+        stats = await self.process_batch(
+            user_id=user_id,
+            db=db,
+            emails=emails,
+            auto_mode=auto_mode,
+            body_fetcher=client.fetch_body if client is not None else None,
         )
-        existing_ids = set(existing_q.scalars().all())
+        stats.update(history)
+        return stats
+
+    async def process_batch(
+        self,
+        user_id: int,
+        db: AsyncSession,
+        emails: List[Dict[str, Any]],
+        auto_mode: bool = False,
+        body_fetcher: Optional[Callable[[str, int], str]] = None,
+        historical: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Dedupe and process already-fetched emails.
+
+        Messages are grouped by Gmail thread: each thread is classified once,
+        on its latest message, and every new message in it is stored with
+        that decision. A known thread with no newer message is not
+        re-classified at all.
+
+        `body_fetcher(email_id, max_tokens)` enables the second pass: emails
+        the classifier is less than BODY_ESCALATION_THRESHOLD confident about
+        on metadata are reclassified on their body.
+
+        `historical` batches (backfill) are stored with processed_at set to
+        the message date, so they stay out of the 24h dashboards and age
+        into the archive; confident decisions seed vector memory when
+        BACKFILL_SEED_MEMORY is on.
+        """
+        # Fetch already-processed ids from this batch to prevent duplicates
+        # (uq_email_records_user_email catches a concurrent run's inserts)
+        existing_ids = set()
+        if emails:
+            with track_stage("dedup_query"):
+                existing_q = await db.execute(
+                    select(EmailRecord.email_id).where(
+                        EmailRecord.user_id == user_id,
+                        EmailRecord.email_id.in_([e["email_id"] for e in emails]),
+                    )
+                )
+                existing_ids = set(existing_q.scalars().all())
 
         stats = {
             "total_processed": 0,
@@ -172,71 +259,309 @@ class EmailHousekeeperService:
             "kept": 0,
             "needs_review": 0,
             "auto_executed": 0,
+            "threads_classified": 0,
+            "threads_reused": 0,
+            "near_duplicates": 0,
+            "body_escalated": 0,
             "priority_breakdown": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
         }
 
-        for email_data in emails:
-            if email_data["email_id"] in existing_ids:
+        threads = self._group_by_thread(
+            [e for e in emails if e["email_id"] not in existing_ids]
+        )
+        with track_stage("thread_lookup"):
+            known_threads = await self._load_threads(user_id, db, list(threads))
+
+        # Threads with no new message reuse their stored decision
+        pending: List[str] = []
+        for thread_id, members in threads.items():
+            thread = known_threads.get(thread_id)
+            if self._has_new_message(thread, members):
+                pending.append(thread_id)
                 continue
-
             try:
-                result = await self._process_single_email(
+                results = await self._apply_decision(
                     user_id=user_id,
                     db=db,
-                    email_data=email_data,
+                    thread_id=thread_id,
+                    members=members,
+                    thread=thread,
+                    enhanced=self._stored_decision(thread),
+                    llm_result=None,
                     auto_mode=auto_mode,
+                    fresh=False,
+                    historical=historical,
                 )
+            except Exception:
+                continue  # Log error but don't stop the batch
+            stats["threads_reused"] += 1
+            self._tally(stats, results)
 
-                stats["total_processed"] += 1
-                stats["priority_breakdown"][result["priority"]] += 1
-
-                if result["action"] == EmailAction.DELETE.value:
-                    stats["deleted"] += 1
-                elif result["action"] == EmailAction.KEEP.value:
-                    stats["kept"] += 1
-                else:
-                    stats["needs_review"] += 1
-
-                if result.get("auto_executed"):
-                    stats["auto_executed"] += 1
+        # Near-duplicate threads (by latest message) share one classification
+        with track_stage("near_dup_cluster"):
+            clusters = self._cluster_near_duplicates([threads[t][-1] for t in pending])
 
+        for cluster in clusters:
+            representative_id = pending[cluster[0][0]]
+            representative = threads[representative_id][-1]
+            try:
+                llm_result, enhanced, embedding = await self._decide(
+                    user_id, representative, body_fetcher
+                )
+                if (
+                    historical
+                    and settings.BACKFILL_SEED_MEMORY
+                    and should_auto_execute(enhanced["final_score"])
+                ):
+                    await self.vector_service.store_memory(
+                        user_id=user_id,
+                        text=self._email_text(representative),
+                        embedding=embedding,
+                        action=enhanced["action"],
+                        priority=enhanced["priority"],
+                        metadata={"source": "backfill"},
+                    )
             except Exception:
                 continue  # Log error but don't stop the batch
+            stats["threads_classified"] += 1
+            stats["body_escalated"] += int(llm_result.get("body_escalated", False))
+
+            for index, similarity in cluster:
+                thread_id = pending[index]
+                is_representative = thread_id == representative_id
+                try:
+                    results = await self._apply_decision(
+                        user_id=user_id,
+                        db=db,
+                        thread_id=thread_id,
+                        members=threads[thread_id],
+                        thread=known_threads.get(thread_id),
+                        enhanced=enhanced,
+                        llm_result=llm_result if is_representative else None,
+                        auto_mode=auto_mode,
+                        fresh=True,
+                        duplicate_of=None if is_representative else representative["email_id"],
+                        similarity=None if is_representative else similarity,
+                        historical=historical,
+                    )
+                except Exception:
+                    continue
+                if not is_representative:
+                    stats["near_duplicates"] += len(results)
+                self._tally(stats, results)
 
         return stats
 
-    async def _process_single_email(
+    @staticmethod
+    def _tally(stats: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        for result in results:
+            stats["total_processed"] += 1
+            stats["priority_breakdown"][result["priority"]] += 1
+
+            if result["action"] == EmailAction.DELETE.value:
+                stats["deleted"] += 1
+            elif result["action"] == EmailAction.KEEP.value:
+                stats["kept"] += 1
+            else:
+                stats["needs_review"] += 1
+
+            if result.get("auto_executed"):
+                stats["auto_executed"] += 1
+
+    # ── Thread grouping ──────────────────────────────────
+
+    @staticmethod
+    def _group_by_thread(
+        emails: List[Dict[str, Any]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """thread_id → messages, oldest first. Unthreaded mail stands alone."""
+        threads: Dict[str, List[Dict[str, Any]]] = {}
+        for email_data in emails:
+            key = email_data.get("thread_id") or email_data["email_id"]
+            threads.setdefault(key, []).append(email_data)
+        for members in threads.values():
+            members.sort(key=lambda e: e.get("internal_date") or 0)
+        return threads
+
+    @staticmethod
+    async def _load_threads(
+        user_id: int, db: AsyncSession, thread_ids: List[str]
+    ) -> Dict[str, EmailThreadRecord]:
+        if not thread_ids:
+            return {}
+        result = await db.execute(
+            select(EmailThreadRecord).where(
+                EmailThreadRecord.user_id == user_id,
+                EmailThreadRecord.thread_id.in_(thread_ids),
+            )
+        )
+        return {t.thread_id: t for t in result.scalars().all()}
+
+    @staticmethod
+    def _has_new_message(
+        thread: Optional[EmailThreadRecord], members: List[Dict[str, Any]]
+    ) -> bool:
+        if thread is None:
+            return True
+        return (members[-1].get("internal_date") or 0) > (thread.last_internal_date or 0)
+
+    @staticmethod
+    def _stored_decision(thread: EmailThreadRecord) -> Dict[str, Any]:
+        return {
+            "action": thread.action,
+            "priority": thread.priority,
+            "llm_confidence": thread.llm_confidence,
+            "vector_similarity": thread.vector_similarity,
+            "rule_weight": thread.rule_weight,
+            "final_score": thread.final_score,
+            "auto_execute": should_auto_execute(thread.final_score),
+        }
+
+    def _cluster_near_duplicates(
+        self, emails: List[Dict[str, Any]]
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Index clusters over `emails`; singletons when clustering is off.
+        Only mail from the same sender address can cluster — the classifier
+        weighs the sender, so a template shared by two senders is not one
+        decision.
+        """
+        if not settings.NEAR_DUP_ENABLED:
+            return [[(i, 1.0)] for i in range(len(emails))]
+        return self.clusterer.cluster(
+            [f"{e['subject']} {e['snippet']}" for e in emails],
+            groups=[parseaddr(e["sender"] or "")[1].lower() for e in emails],
+        )
+
+    async def _apply_decision(
         self,
         user_id: int,
         db: AsyncSession,
-        email_data: Dict[str, Any],
+        thread_id: str,
+        members: List[Dict[str, Any]],
+        thread: Optional[EmailThreadRecord],
+        enhanced: Dict[str, Any],
+        llm_result: Optional[Dict[str, Any]],
         auto_mode: bool,
-    ) -> Dict[str, Any]:
+        fresh: bool,
+        duplicate_of: Optional[str] = None,
+        similarity: Optional[float] = None,
+        historical: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Store a record for every thread member with the given decision.
+        `fresh` decisions are saved on the thread record for reuse;
+        `llm_result` is passed only for the thread that was classified.
+        Members a concurrent run already stored are left out of the results.
+        """
+        latest = members[-1]
+        results = []
+        for email_data in members:
+            # Only the classified message carries the LLM cost
+            classified = llm_result is not None and email_data is latest
+            stored = await self._store_record(
+                user_id=user_id,
+                db=db,
+                email_data=email_data,
+                enhanced=enhanced,
+                llm_result=llm_result if classified else None,
+                auto_mode=auto_mode,
+                duplicate_of=duplicate_of,
+                similarity=similarity,
+                historical=historical,
+            )
+            if stored is not None:
+                results.append(stored)
+
+        if fresh:
+            await self._upsert_thread(user_id, db, thread_id, latest, enhanced, len(results))
+        elif results:
+            await db.execute(
+                update(EmailThreadRecord)
+                .where(EmailThreadRecord.id == thread.id)
+                .values(message_count=EmailThreadRecord.message_count + len(results))
+                .execution_options(synchronize_session=False)
+            )
+        return results
+
+    @staticmethod
+    async def _upsert_thread(
+        user_id: int,
+        db: AsyncSession,
+        thread_id: str,
+        latest: Dict[str, Any],
+        enhanced: Dict[str, Any],
+        message_count: int,
+    ) -> None:
+        """
+        Save a fresh thread decision in one INSERT … ON CONFLICT statement.
+
+        Two runs can classify the same new thread at once (push + manual
+        run, or a backfill page); the loser updates the row instead of
+        failing on uq_user_thread. Counts add up, and the decision is only
+        replaced by one made on a message at least as new as the stored one.
+        """
+        table = EmailThreadRecord.__table__
+        fields = (
+            "action", "priority", "llm_confidence",
+            "vector_similarity", "rule_weight", "final_score",
+        )
+        stmt = insert_for(db, table).values(
+            user_id=user_id,
+            thread_id=thread_id,
+            last_message_id=latest["email_id"],
+            last_internal_date=latest.get("internal_date") or 0,
+            message_count=message_count,
+            **{field: enhanced[field] for field in fields},
+        )
+        newer = stmt.excluded.last_internal_date >= func.coalesce(table.c.last_internal_date, 0)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.thread_id],
+            set_={
+                "message_count": func.coalesce(table.c.message_count, 0) + stmt.excluded.message_count,
+                "updated_at": func.now(),
+                **{
+                    column: case((newer, stmt.excluded[column]), else_=table.c[column])
+                    for column in ("last_message_id", "last_internal_date") + fields
+                },
+            },
+        )
+        await db.execute(stmt)
+
+    # ── Single-message decision ──────────────────────────
+
+    async def _decide(
+        self,
+        user_id: int,
+        email_data: Dict[str, Any],
+        body_fetcher: Optional[Callable[[str, int], str]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[float]]:
         """
-        Pipeline for a single email:
-        1. Classify with LLM
+        Decision for one message:
+        1. Classify with LLM (metadata + snippet)
         2. Generate embedding
         3. Enhance with reinforcement memory
-        4. Determine final action
-        5. Store record in DB
-        6. Store in vector memory
+        4. If the classifier was unsure and memory didn't settle it,
+           reclassify on the body
+        Returns (llm_result, enhanced, embedding).
         """
 
-        email_text = (
-            f"{email_data['subject']} {email_data['sender']} {email_data['snippet']}"
-        )
+        email_text = self._email_text(email_data)
 
-        # Step 1: LLM classification
-        llm_result = await self.classifier.classify(
-            subject=email_data["subject"],
-            sender=email_data["sender"],
-            snippet=email_data["snippet"],
-        )
+        # Step 1: LLM classification (no reasoning — see explain_email)
+        with track_stage("llm_classify"):
+            llm_result = await self.classifier.classify(
+                subject=email_data["subject"],
+                sender=email_data["sender"],
+                snippet=email_data["snippet"],
+                compact=True,
+            )
 
         # Step 2: Generate embedding
-        embedding = await self.vector_service.generate_embedding(email_text)
+        with track_stage("embedding"):
+            embedding = await self.vector_service.generate_embedding(email_text)
 
-        # Step 3: Reinforce with memory
+        # Step 3: Reinforce with memory (Qdrant search timed inside)
         enhanced = await self.reinforcement.enhance_decision(
             user_id=user_id,
             email_text=email_text,
@@ -244,20 +569,112 @@ class EmailHousekeeperService:
             embedding=embedding,
         )
 
-        # Step 4: Final action decision
+        # Step 4: Second pass on the full body, only where accuracy is at stake.
+        # Gated on the classifier's own confidence: final_score tops out at
+        # 0.65 for a user with no memory yet, so gating on it would escalate
+        # every email. A strong memory match overrides the action anyway.
+        if (
+            body_fetcher is not None
+            and settings.BODY_ESCALATION_ENABLED
+            and llm_result.get("confidence", 0.0) < settings.BODY_ESCALATION_THRESHOLD
+            and enhanced["vector_similarity"] <= settings.SIMILARITY_BOOST_THRESHOLD
+        ):
+            llm_result, enhanced = await self._escalate_to_body(
+                user_id, email_data, email_text, embedding, llm_result, enhanced, body_fetcher
+            )
+
+        # Vector memory is only written on feedback ("Wrong Category" loop)
+        # and by backfill seeding, not for every processed email.
+        return llm_result, enhanced, embedding
+
+    @staticmethod
+    def _email_text(email_data: Dict[str, Any]) -> str:
+        return f"{email_data['subject']} {email_data['sender']} {email_data['snippet']}"
+
+    async def _escalate_to_body(
+        self,
+        user_id: int,
+        email_data: Dict[str, Any],
+        email_text: str,
+        embedding: List[float],
+        llm_result: Dict[str, Any],
+        enhanced: Dict[str, Any],
+        body_fetcher: Callable[[str, int], str],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Reclassify on the body; usage and cost accumulate across both passes."""
+        try:
+            with track_stage("body_fetch"):
+                body = body_fetcher(
+                    email_data["email_id"], settings.BODY_ESCALATION_TOKEN_BUDGET
+                )
+        except Exception as e:
+            logger.warning("Body fetch failed for %s: %s", email_data["email_id"], e)
+            return llm_result, enhanced
+        if not body:
+            return llm_result, enhanced
+
+        with track_stage("llm_reclassify"):
+            second = await self.classifier.classify(
+                subject=email_data["subject"],
+                sender=email_data["sender"],
+                snippet=body,
+                compact=True,
+                token_budget=settings.BODY_ESCALATION_TOKEN_BUDGET,
+            )
+        # Same embedding (metadata text) — memory search stays comparable
+        enhanced = await self.reinforcement.enhance_decision(
+            user_id=user_id,
+            email_text=email_text,
+            llm_result=second,
+            embedding=embedding,
+        )
+
+        for key in ("prompt_tokens", "completion_tokens"):
+            second["usage"][key] += llm_result["usage"][key]
+        second["cost_usd"] = round(second["cost_usd"] + llm_result["cost_usd"], 8)
+        second["latency_ms"] = round(second["latency_ms"] + llm_result["latency_ms"], 1)
+        second["body_escalated"] = True
+        return second, enhanced
+
+    async def _store_record(
+        self,
+        user_id: int,
+        db: AsyncSession,
+        email_data: Dict[str, Any],
+        enhanced: Dict[str, Any],
+        llm_result: Optional[Dict[str, Any]],
+        auto_mode: bool,
+        duplicate_of: Optional[str] = None,
+        similarity: Optional[float] = None,
+        historical: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply the final action gate and persist an EmailRecord.
+        `llm_result` is None for messages that reuse a thread's or a
+        near-duplicate's decision. Returns None if the message already has
+        a record (INSERT … ON CONFLICT DO NOTHING on user_id + email_id).
+        """
         action = enhanced["action"]
         auto_executed = False
 
-        if auto_mode and enhanced["auto_execute"]:
+        # A near-duplicate borrows another email's decision; never act on it
+        if auto_mode and enhanced["auto_execute"] and not duplicate_of:
             auto_executed = True
         elif not auto_mode:
             if enhanced["final_score"] < 0.85:
                 action = EmailAction.REVIEW.value
 
-        # Step 5: Persist to database
-        record = EmailRecord(
+        usage = llm_result["usage"] if llm_result else {}
+        if llm_result:
+            tier = llm_result["tier"]
+        else:
+            tier = "duplicate" if duplicate_of else "thread"
+        values = dict(
             user_id=user_id,
             email_id=email_data["email_id"],
+            thread_id=email_data.get("thread_id"),
+            duplicate_of=duplicate_of,
+            duplicate_similarity=similarity,
             subject=email_data["subject"],
             sender=email_data["sender"],
             snippet=email_data["snippet"],
@@ -267,23 +684,30 @@ class EmailHousekeeperService:
             vector_similarity=enhanced["vector_similarity"],
             rule_weight=enhanced["rule_weight"],
             final_score=enhanced["final_score"],
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            classifier_tier=tier,
+            classification_cost_usd=llm_result["cost_usd"] if llm_result else 0.0,
+            classification_latency_ms=llm_result["latency_ms"] if llm_result else 0.0,
+            body_escalated=bool(llm_result and llm_result.get("body_escalated")),
             auto_executed=auto_executed,
         )
-        db.add(record)
-        await db.flush()
-
-        # Step 6: Store in vector memory - DISABLED per user request
-        # We only store in vector memory when user checks "Wrong Category" (Feedback Loop)
-        # await self.vector_service.store_memory(
-        #     user_id=user_id,
-        #     text=email_text,
-        #     embedding=embedding,
-        #     action=action,
-        #     priority=enhanced["priority"],
-        # )
+        if historical and email_data.get("internal_date"):
+            values["processed_at"] = datetime.fromtimestamp(
+                email_data["internal_date"] / 1000, tz=timezone.utc
+            )
+        with track_stage("db_write"):
+            record_id = (await db.execute(
+                insert_for(db, EmailRecord.__table__)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["user_id", "email_id"])
+                .returning(EmailRecord.id)
+            )).scalar()
+        if record_id is None:
+            return None
 
         return {
-            "id": record.id,
+            "id": record_id,
             "action": action,
             "priority": enhanced["priority"],
             "final_score": enhanced["final_score"],
@@ -292,6 +716,31 @@ class EmailHousekeeperService:
 
     # ── GET /email/stats ─────────────────────────────────
 
+    @staticmethod
+    async def get_data_version(user_id: int, db: AsyncSession) -> str:
+        """
+        Cheap version stamp for the user's dashboard data (stats, review).
+
+        Both payloads only change when rows are added or removed, or when
+        feedback (which inserts a FeedbackRecord) changes an action;
+        explanations are written in place but appear in neither. So
+        count(*) and max(id) per table change whenever the payloads can.
+        A timestamp would not do: concurrent runs for the same user can
+        commit rows older than a max another poll has already seen, and
+        SQLite's now() has whole-second resolution. A time bucket covers
+        rows ageing out of the 24h window.
+        """
+        records = (await db.execute(
+            select(func.count(EmailRecord.id), func.max(EmailRecord.id))
+            .where(EmailRecord.user_id == user_id)
+        )).one()
+        feedback = (await db.execute(
+            select(func.count(FeedbackRecord.id), func.max(FeedbackRecord.id))
+            .where(FeedbackRecord.user_id == user_id)
+        )).one()
+        bucket = int(datetime.now(timezone.utc).timestamp() // settings.DASHBOARD_ETAG_WINDOW_SECONDS)
+        return f"{records[0]}:{records[1]}|{feedback[0]}:{feedback[1]}|{bucket}"
+
     async def get_stats(
         self, user_id: int, db: AsyncSession
     ) -> Dict[str, Any]:
@@ -349,6 +798,29 @@ class EmailHousekeeperService:
         )
         avg_confidence = round(float(avg_q.scalar() or 0), 3)
 
+        # Cascade tier breakdown (for tuning CASCADE_CONFIDENCE_THRESHOLD)
+        tier_q = await db.execute(
+            select(
+                EmailRecord.classifier_tier,
+                func.count(EmailRecord.id),
+                func.sum(EmailRecord.classification_cost_usd),
+                func.avg(EmailRecord.classification_latency_ms),
+            )
+            .where(
+                EmailRecord.user_id == user_id,
+                EmailRecord.processed_at >= since,
+            )
+            .group_by(EmailRecord.classifier_tier)
+        )
+        tier_breakdown = {
+            (row[0] or "unknown"): {
+                "count": row[1],
+                "cost_usd": round(float(row[2] or 0), 6),
+                "avg_latency_ms": round(float(row[3] or 0), 1),
+            }
+            for row in tier_q.all()
+        }
+
         return {
             "total_processed_24h": total,
             "deleted_count": action_counts.get("delete", 0),
@@ -357,6 +829,7 @@ class EmailHousekeeperService:
             "auto_executed_count": auto_count,
             "priority_breakdown": priority_counts,
             "avg_confidence": avg_confidence,
+            "tier_breakdown": tier_breakdown,
         }
 
     # ── GET /email/review ────────────────────────────────
@@ -397,6 +870,46 @@ class EmailHousekeeperService:
             for r in records
         ]
 
+    # ── GET /email/review/{id}/explain ───────────────────
+
+    async def explain_email(
+        self, user_id: int, db: AsyncSession, email_record_id: int
+    ) -> Dict[str, Any]:
+        """Return the decision's explanation, generating and caching it once."""
+        result = await db.execute(
+            select(EmailRecord).where(
+                EmailRecord.id == email_record_id,
+                EmailRecord.user_id == user_id,
+            )
+        )
+        email_record = result.scalar_one_or_none()
+
+        if not email_record:
+            raise ValueError(
+                "Email record not found or does not belong to this user"
+            )
+
+        cached = email_record.explanation is not None
+        if not cached:
+            email_record.explanation = await self.classifier.explain(
+                subject=email_record.subject,
+                sender=email_record.sender,
+                snippet=email_record.snippet,
+                priority=email_record.priority,
+                action=email_record.action,
+            )
+            email_record.explained_at = datetime.now(timezone.utc)
+            await db.flush()
+
+        return {
+            "email_record_id": email_record.id,
+            "priority": email_record.priority,
+            "action": email_record.action,
+            "explanation": email_record.explanation,
+            "explained_at": email_record.explained_at.isoformat(),
+            "cached": cached,
+        }
+
     # ── POST /email/feedback ─────────────────────────────
 
     async def submit_feedback(
@@ -432,22 +945,12 @@ class EmailHousekeeperService:
         # If action is DELETE, move to Trash in Gmail
         if user_action == EmailAction.DELETE.value:
             try:
-                from app.models.api_keys import UserAPIKey
                 from app.sections.personal_management.email_housekeeper.gmail_client import GmailClient
-                from app.core.config import get_settings
-                
-                settings = get_settings()
-                key_q = await db.execute(
-                    select(UserAPIKey.api_key).where(
-                        UserAPIKey.user_id == user_id, 
-                        UserAPIKey.service_name == 'gmail'
-                    )
-                )
-                user_token = key_q.scalar_one_or_none()
-                token = user_token or settings.DEFAULT_GMAIL_TOKEN
-                
+
+                token = await credentials.gmail_token(db, user_id)
+
                 if token:
-                    client = GmailClient(token)
+                    client = (self.gmail_client_factory or GmailClient)(token)
                     success = client.trash_email(email_record.email_id)
                     if success:
                         print(f"Successfully trashed email {email_record.email_id} in Gmail")
@@ -467,8 +970,23 @@ class EmailHousekeeperService:
         )
         db.add(feedback)
 
-        # Update the email record's action
+        # Update the email record's action — and its thread's, which later
+        # messages in the thread would otherwise reuse
         email_record.action = user_action
+        if email_record.thread_id:
+            await db.execute(
+                update(EmailThreadRecord)
+                .where(
+                    EmailThreadRecord.user_id == user_id,
+                    EmailThreadRecord.thread_id == email_record.thread_id,
+                )
+                .values(action=user_action)
+                .execution_options(synchronize_session=False)
+            )
+        if is_override:
+            # The cached explanation argued for the old action
+            email_record.explanation = None
+            email_record.explained_at = None
 
         # Store correction in vector memory for future learning
         try:
@@ -483,6 +1001,7 @@ class EmailHousekeeperService:
                 embedding=embedding,
                 user_action=user_action,
                 priority=email_record.priority,
+                email_record_id=email_record.id,
             )
         except Exception as e:
             print(f"Warning: Failed to learn from feedback (Vector/Embedding service offline?): {e}")
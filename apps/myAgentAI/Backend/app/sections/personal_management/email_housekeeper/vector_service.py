@@ -3,51 +3,120 @@ Email Housekeeper - Vector Service
 =====================================
 Handles embedding storage and similarity search in Qdrant.
 All data is user-scoped — no cross-user memory leakage.
+
+qdrant_client is imported on first use, and one client per process is
+reused; the collection check runs once rather than per request.
+
+Embeddings may be shortened with EMBEDDING_DIMENSIONS; each dimension gets
+its own collection (the native 1536-d one keeps the original name), filled
+from the old one with migrate_embeddings.py. New collections keep int8
+scalar-quantized vectors in RAM and the full-precision originals on disk;
+searches over-fetch top_k × VECTOR_OVERSAMPLING candidates on the int8
+vectors and re-rank them against the originals (VECTOR_RESCORE).
 """
 
 import uuid
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Set, TYPE_CHECKING
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import (
-    VectorParams, Distance, PointStruct,
-    Filter, FieldCondition, MatchValue,
-)
+from starlette.concurrency import run_in_threadpool
 
 from app.services.openai_service import OpenAIService
 from app.core.config import get_settings
 
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Filter, SearchParams
+
 settings = get_settings()
 
-COLLECTION_NAME = "email_housekeeper_memories"
-VECTOR_SIZE = 1536  # text-embedding-3-small output dimension
+NATIVE_DIMENSIONS = 1536  # text-embedding-3-small full output
+VECTOR_SIZE = settings.EMBEDDING_DIMENSIONS or NATIVE_DIMENSIONS
 
 
-class EmailVectorService:
-    """User-scoped vector memory for email classification decisions."""
+def collection_name(dimensions: int) -> str:
+    """One collection per embedding size; vectors of different sizes can't mix."""
+    base = "email_housekeeper_memories"
+    return base if dimensions == NATIVE_DIMENSIONS else f"{base}_d{dimensions}"
 
-    def __init__(self, openai_service: OpenAIService):
-        self.client = QdrantClient(
+
+COLLECTION_NAME = collection_name(VECTOR_SIZE)
+
+
+_client: Optional["QdrantClient"] = None
+_collection_ready = False
+
+
+def _get_client() -> "QdrantClient":
+    """Process-wide Qdrant client, created on first use."""
+    global _client
+    if _client is None:
+        from qdrant_client import QdrantClient
+
+        _client = QdrantClient(
             host=settings.QDRANT_HOST,
             port=settings.QDRANT_PORT,
         )
+    return _client
+
+
+def create_memory_collection(client: "QdrantClient", name: str, size: int) -> None:
+    """Create a memory collection (quantized per VECTOR_QUANTIZATION)."""
+    from qdrant_client.models import (
+        Distance, ScalarQuantization, ScalarQuantizationConfig, ScalarType, VectorParams,
+    )
+
+    quantization = None
+    if settings.VECTOR_QUANTIZATION:
+        quantization = ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    client.create_collection(
+        collection_name=name,
+        vectors_config=VectorParams(
+            size=size,
+            distance=Distance.COSINE,
+            on_disk=settings.VECTOR_QUANTIZATION,  # Originals only read to re-rank
+        ),
+        quantization_config=quantization,
+    )
+
+
+def search_params(rescore: Optional[bool] = None) -> Optional["SearchParams"]:
+    """Quantized search with optional full-precision re-rank of the candidates."""
+    from qdrant_client.models import QuantizationSearchParams, SearchParams
+
+    if not settings.VECTOR_QUANTIZATION:
+        return None
+    return SearchParams(
+        quantization=QuantizationSearchParams(
+            rescore=settings.VECTOR_RESCORE if rescore is None else rescore,
+            oversampling=settings.VECTOR_OVERSAMPLING,
+        )
+    )
+
+
+class EmailVectorService:
+    """User-scoped vector memory for email classification decisions."""
+
+    def __init__(self, openai_service: OpenAIService):
+        self.client = _get_client()
         self.openai_service = openai_service
         self._ensure_collection()
 
     def _ensure_collection(self):
-        """Create the Qdrant collection if it doesn't exist."""
+        """Create the Qdrant collection if it doesn't exist (once per process)."""
+        global _collection_ready
+        if _collection_ready:
+            return
+
         try:
             collections = self.client.get_collections().collections
             if not any(c.name == COLLECTION_NAME for c in collections):
-                self.client.create_collection(
-                    collection_name=COLLECTION_NAME,
-                    vectors_config=VectorParams(
-                        size=VECTOR_SIZE,
-                        distance=Distance.COSINE,
-                    ),
-                )
+                create_memory_collection(self.client, COLLECTION_NAME, VECTOR_SIZE)
+            _collection_ready = True
         except Exception:
-            pass  # Qdrant may not be available during startup
+            pass  # Qdrant may not be available during startup; retry next time
 
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate an embedding vector for the given text."""
@@ -63,12 +132,16 @@ class EmailVectorService:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Store an email decision in vector memory (user-scoped)."""
+        from qdrant_client.models import PointStruct
+
         point_id = str(uuid.uuid4())
         payload = {
             "user_id": user_id,
             "text": text,
             "action": action,
             "priority": priority,
+            "votes": 1,
+            "created_at": datetime.now(timezone.utc).isoformat(),
             **(metadata or {}),
         }
 
@@ -88,20 +161,14 @@ class EmailVectorService:
     ) -> List[Dict[str, Any]]:
         """
         Find similar past decisions for this user.
-        Returns list of matches with score, action, priority.
+        Returns list of matches with score, action, priority, votes.
         """
         try:
             results = self.client.search(
                 collection_name=COLLECTION_NAME,
                 query_vector=embedding,
-                query_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="user_id",
-                            match=MatchValue(value=user_id),
-                        )
-                    ]
-                ),
+                query_filter=self._user_filter(user_id),
+                search_params=search_params(),
                 limit=top_k,
             )
 
@@ -111,8 +178,91 @@ class EmailVectorService:
                     "action": hit.payload.get("action", "needs_review"),
                     "priority": hit.payload.get("priority", 3),
                     "text": hit.payload.get("text", ""),
+                    "votes": hit.payload.get("votes", 1),
                 }
                 for hit in results
             ]
         except Exception:
             return []
+
+    # ── Maintenance (used by memory compaction) ──────────
+    # Whole-collection scans and bulk writes: the blocking client calls run
+    # in the threadpool so compaction doesn't stall request handling.
+
+    @staticmethod
+    def _user_filter(user_id: int) -> "Filter":
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
+
+        return Filter(
+            must=[
+                FieldCondition(
+                    key="user_id",
+                    match=MatchValue(value=user_id),
+                )
+            ]
+        )
+
+    async def list_user_ids(self) -> Set[int]:
+        """Return every user_id that owns at least one memory point."""
+        user_ids: Set[int] = set()
+        offset = None
+        while True:
+            points, offset = await run_in_threadpool(
+                self.client.scroll,
+                collection_name=COLLECTION_NAME,
+                limit=256,
+                offset=offset,
+                with_payload=["user_id"],
+                with_vectors=False,
+            )
+            user_ids.update(p.payload["user_id"] for p in points)
+            if offset is None:
+                return user_ids
+
+    async def scroll_user_memories(self, user_id: int) -> List[Dict[str, Any]]:
+        """Return all memory points (payload + vector) for one user."""
+        memories: List[Dict[str, Any]] = []
+        offset = None
+        while True:
+            points, offset = await run_in_threadpool(
+                self.client.scroll,
+                collection_name=COLLECTION_NAME,
+                scroll_filter=self._user_filter(user_id),
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            memories.extend(
+                {"id": str(p.id), "vector": p.vector, "payload": p.payload}
+                for p in points
+            )
+            if offset is None:
+                return memories
+
+    async def upsert_memories(self, memories: List[Dict[str, Any]]) -> None:
+        """Write pre-built memory points ({id, vector, payload})."""
+        from qdrant_client.models import PointStruct
+
+        if not memories:
+            return
+        await run_in_threadpool(
+            self.client.upsert,
+            collection_name=COLLECTION_NAME,
+            points=[
+                PointStruct(id=m["id"], vector=m["vector"], payload=m["payload"])
+                for m in memories
+            ],
+        )
+
+    async def delete_memories(self, user_id: int, point_ids: List[str]) -> None:
+        """Delete memory points by id (point ids are collection-wide in Qdrant)."""
+        from qdrant_client.models import PointIdsList
+
+        if not point_ids:
+            return
+        await run_in_threadpool(
+            self.client.delete,
+            collection_name=COLLECTION_NAME,
+            points_selector=PointIdsList(points=point_ids),
+        )
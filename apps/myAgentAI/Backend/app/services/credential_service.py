@@ -0,0 +1,144 @@
+"""
+myAgentAI - Credential Resolver
+=================================
+Single place where per-user service credentials are read and decrypted.
+
+Keys are Fernet-encrypted at rest (key derived from CREDENTIAL_ENCRYPTION_KEY,
+or SECRET_KEY when unset). Rows written before encryption was introduced
+are still read as plaintext. A Fernet token that fails to decrypt (the
+encryption key was rotated or lost) resolves to "no key stored" and is
+logged — the ciphertext is never handed to a client as if it were a key.
+
+Resolved keys are cached in-process for CREDENTIAL_CACHE_TTL_SECONDS, keyed
+by (user_id, service_name) — including "no key stored", so users on the
+system default don't hit the DB either. The /api-keys handlers invalidate
+the entry on change; other workers converge within the TTL.
+
+Fallback rules (see app/models/api_keys.py):
+  - OpenAI: user key, else the system OPENAI_API_KEY
+  - Gmail:  user token, else DEFAULT_GMAIL_TOKEN (dev convenience)
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.api_keys import UserAPIKey
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+# ── Encryption at rest ───────────────────────────────────
+
+@lru_cache
+def _fernet() -> Fernet:
+    secret = settings.CREDENTIAL_ENCRYPTION_KEY or settings.SECRET_KEY
+    key = base64.urlsafe_b64encode(hashlib.sha256(secret.encode("utf-8")).digest())
+    return Fernet(key)
+
+
+def encrypt_secret(plaintext: str) -> str:
+    """Encrypt a credential for storage in `UserAPIKey.encrypted_key`."""
+    return _fernet().encrypt(plaintext.encode("utf-8")).decode("ascii")
+
+
+_FERNET_VERSION = 0x80
+
+
+def _is_fernet_token(stored: str) -> bool:
+    """True if `stored` is shaped like a Fernet token (url-safe b64, version 0x80)."""
+    try:
+        raw = base64.urlsafe_b64decode(stored.encode("ascii"))
+    except (binascii.Error, UnicodeEncodeError, ValueError):
+        return False
+    return len(raw) > 0 and raw[0] == _FERNET_VERSION
+
+
+def decrypt_secret(stored: str) -> Optional[str]:
+    """
+    Decrypt a stored credential. Legacy plaintext rows are returned as-is;
+    a Fernet token that will not decrypt under the current key gives None.
+    """
+    if not _is_fernet_token(stored):
+        return stored
+    try:
+        return _fernet().decrypt(stored.encode("ascii")).decode("utf-8")
+    except InvalidToken:
+        logger.error(
+            "Stored credential could not be decrypted — "
+            "was CREDENTIAL_ENCRYPTION_KEY (or SECRET_KEY) changed?"
+        )
+        return None
+
+
+# ── Cached resolver ──────────────────────────────────────
+
+class CredentialResolver:
+    """TTL cache over `user_api_keys`, keyed by (user_id, service_name)."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # (user_id, service) → (decrypted key or None, expires_at monotonic)
+        self._cache: Dict[Tuple[int, str], Tuple[Optional[str], float]] = {}
+
+    async def resolve(
+        self, db: AsyncSession, user_id: int, service_name: str
+    ) -> Optional[str]:
+        """Return the user's decrypted key for `service_name`, or None."""
+        key = (user_id, service_name)
+        entry = self._cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        result = await db.execute(
+            select(UserAPIKey.encrypted_key).where(
+                UserAPIKey.user_id == user_id,
+                UserAPIKey.service_name == service_name,
+            )
+        )
+        stored = result.scalar_one_or_none()
+        value = decrypt_secret(stored) if stored else None
+        self._put(key, value)
+        return value
+
+    def _put(self, key: Tuple[int, str], value: Optional[str]) -> None:
+        if len(self._cache) >= self.max_entries:
+            now = time.monotonic()
+            for k in [k for k, (_, exp) in self._cache.items() if exp <= now]:
+                del self._cache[k]
+            while len(self._cache) >= self.max_entries:
+                del self._cache[next(iter(self._cache))]  # Oldest insertion
+        self._cache[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, user_id: int, service_name: Optional[str] = None) -> None:
+        """Drop one cached credential, or all of a user's when no service given."""
+        if service_name is not None:
+            self._cache.pop((user_id, service_name), None)
+            return
+        for key in [k for k in self._cache if k[0] == user_id]:
+            self._cache.pop(key, None)
+
+    # ── Per-service helpers (with system fallbacks) ──────
+
+    async def openai_key(self, db: AsyncSession, user_id: int) -> str:
+        return await self.resolve(db, user_id, "openai") or settings.OPENAI_API_KEY
+
+    async def gmail_token(self, db: AsyncSession, user_id: int) -> Optional[str]:
+        return await self.resolve(db, user_id, "gmail") or settings.DEFAULT_GMAIL_TOKEN or None
+
+
+credentials = CredentialResolver(
+    ttl_seconds=settings.CREDENTIAL_CACHE_TTL_SECONDS,
+    max_entries=settings.CREDENTIAL_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,111 @@
+"""
+myAgentAI - OpenAI Client Registry
+====================================
+Process-wide pool of AsyncOpenAI clients keyed by API key fingerprint.
+
+All clients share ONE httpx connection pool (keep-alive, HTTP/2 capable),
+so a new OpenAIService no longer means a new pool and TLS handshake.
+Auth is a per-request header, so sharing the pool across keys is safe.
+
+Per-user keys are evicted LRU once the registry is full or a key has been
+idle for OPENAI_CLIENT_IDLE_SECONDS; the system key is never evicted.
+Everything is closed on app shutdown.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+from app.core.config import get_settings
+from app.services.rate_limiter import api_key_fingerprint
+
+if TYPE_CHECKING:  # Imported lazily — keeps app import fast
+    import httpx
+    from openai import AsyncOpenAI
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class OpenAIClientRegistry:
+    """LRU registry of AsyncOpenAI clients over a shared HTTP pool."""
+
+    def __init__(self, max_clients: int, idle_seconds: float):
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self._http_client: Optional["httpx.AsyncClient"] = None
+        self._clients: "OrderedDict[str, Tuple[AsyncOpenAI, float]]" = OrderedDict()
+        self._pinned = api_key_fingerprint(settings.OPENAI_API_KEY)
+
+    def _shared_http_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                http2=settings.OPENAI_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=60.0,
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+        return self._http_client
+
+    def get(self, api_key: str) -> "AsyncOpenAI":
+        """Return the pooled client for `api_key`, creating it if needed."""
+        fingerprint = api_key_fingerprint(api_key)
+        now = time.monotonic()
+
+        entry = self._clients.get(fingerprint)
+        if entry is not None:
+            self._clients[fingerprint] = (entry[0], now)
+            self._clients.move_to_end(fingerprint)
+            return entry[0]
+
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=self._shared_http_client(),
+            max_retries=0,  # OpenAIService retries under the shared limiter
+        )
+        self._clients[fingerprint] = (client, now)
+        self._evict(now)
+        return client
+
+    def _evict(self, now: float) -> None:
+        """Drop idle per-user clients, then LRU until under capacity."""
+        # Clients are not closed individually — that would close the shared pool.
+        for fingerprint, (_, last_used) in list(self._clients.items()):
+            if fingerprint != self._pinned and now - last_used > self.idle_seconds:
+                del self._clients[fingerprint]
+
+        for fingerprint in list(self._clients):
+            if len(self._clients) <= self.max_clients:
+                break
+            if fingerprint != self._pinned:
+                del self._clients[fingerprint]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._clients),
+            "max_clients": self.max_clients,
+            "http2": settings.OPENAI_HTTP2,
+            "pool_open": self._http_client is not None and not self._http_client.is_closed,
+        }
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool (app shutdown)."""
+        self._clients.clear()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+        logger.info("OpenAI client pool closed")
+
+
+openai_clients = OpenAIClientRegistry(
+    max_clients=settings.OPENAI_CLIENT_CACHE_SIZE,
+    idle_seconds=settings.OPENAI_CLIENT_IDLE_SECONDS,
+)
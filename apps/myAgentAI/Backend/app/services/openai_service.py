@@ -3,21 +3,101 @@ myAgentAI - OpenAI Service
 ============================
 Shared async service for chat completions and embeddings.
 Used by all utilities that need LLM or embedding capabilities.
+
+Every call goes through the per-key shared rate limiter and is retried with
+jittered exponential backoff on 429 / transient errors, honouring Retry-After.
+A 429 `insufficient_quota` is raised at once — it is a billing state, not
+a rate limit.
 """
 
-from typing import List, Dict, Optional
-from openai import AsyncOpenAI
+import asyncio
+import json
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Tuple, Callable, Awaitable
+
 from app.core.config import get_settings
+from app.core.metrics import registry
+from app.services.openai_clients import openai_clients
+from app.services.rate_limiter import get_rate_limiter
+from app.utils.tokens import estimate_tokens
 
 settings = get_settings()
 
+TOKEN_USAGE = registry.counter(
+    "openai_tokens_total",
+    "Tokens consumed by OpenAI calls.",
+    ["model", "kind"],
+)
+RETRIES = registry.counter(
+    "openai_retries_total",
+    "OpenAI calls retried after a rate limit or transient error.",
+    ["reason"],
+)
+
+
+# The openai SDK is imported on first call, not at app import time.
+
+@lru_cache
+def _retryable_errors() -> Tuple[type, ...]:
+    from openai import (
+        APIConnectionError,
+        APITimeoutError,
+        InternalServerError,
+        RateLimitError,
+    )
+    return (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True if `error` is an OpenAI 429 (after this service's retries)."""
+    return isinstance(error, _retryable_errors()[0])
+
+
+def is_quota_exhausted(error: Exception) -> bool:
+    """
+    True for a 429 `insufficient_quota`: the account is out of credit, not
+    over its rate — no amount of backing off will make the call succeed.
+    """
+    return is_rate_limit_error(error) and "insufficient_quota" in (
+        getattr(error, "code", None), getattr(error, "type", None)
+    )
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read Retry-After (seconds or HTTP date) / retry-after-ms from a response."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            delta = parsedate_to_datetime(value) - datetime.now(timezone.utc)
+            return max(0.0, delta.total_seconds())
+        except (TypeError, ValueError):
+            return None
+
 
 class OpenAIService:
     """Async wrapper for OpenAI API operations."""
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.OPENAI_API_KEY
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # Pooled per key: shared keep-alive connections, no per-request TLS
+        self.client = openai_clients.get(self.api_key)
+        self.limiter = get_rate_limiter(self.api_key)
         self.model = settings.OPENAI_MODEL
         self.embedding_model = settings.EMBEDDING_MODEL
 
@@ -28,18 +108,118 @@ class OpenAIService:
         max_tokens: int = 500,
     ) -> str:
         """Send a chat completion request and return the assistant message."""
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+        response = await self._call(
+            lambda: self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            ),
+            estimated_tokens=self._estimate_chat_tokens(messages, max_tokens),
         )
+        self._record_usage(response.usage)
         return response.choices[0].message.content
 
-    async def create_embedding(self, text: str) -> List[float]:
-        """Generate an embedding vector for the given text."""
-        response = await self.client.embeddings.create(
-            model=self.embedding_model,
-            input=text,
+    async def structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        schema: Dict[str, Any],
+        schema_name: str,
+        temperature: float = 0.0,
+        max_tokens: int = 200,
+        model: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """
+        Chat completion constrained to a strict JSON schema.
+        Returns (parsed_result, usage). Raises ValueError on refusal.
+        `model` overrides the default model for this call.
+        """
+        model = model or self.model
+        response = await self._call(
+            lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {"name": schema_name, "strict": True, "schema": schema},
+                },
+            ),
+            estimated_tokens=self._estimate_chat_tokens(messages, max_tokens),
+        )
+        usage = self._record_usage(response.usage, model=model)
+        message = response.choices[0].message
+        if getattr(message, "refusal", None) or not message.content:
+            raise ValueError(f"Model returned no structured output: {message.refusal}")
+        return json.loads(message.content), usage
+
+    async def create_embedding(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        """
+        Generate an embedding vector for the given text.
+        `dimensions` (default EMBEDDING_DIMENSIONS; 0 → the model's native
+        size) shortens text-embedding-3-* output server-side.
+        """
+        dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
+        extra = {"dimensions": dimensions} if dimensions else {}
+        response = await self._call(
+            lambda: self.client.embeddings.create(
+                model=self.embedding_model,
+                input=text,
+                **extra,
+            ),
+            estimated_tokens=estimate_tokens(text),
         )
+        self._record_usage(response.usage, model=self.embedding_model)
         return response.data[0].embedding
+
+    # ── Rate limiting & retries ──────────────────────────
+
+    async def _call(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+    ) -> Any:
+        """Run `request` under the shared limiter with jittered backoff."""
+        for attempt in range(settings.OPENAI_MAX_RETRIES + 1):
+            await self.limiter.acquire(estimated_tokens)
+            try:
+                response = await request()
+            except _retryable_errors() as e:
+                if attempt == settings.OPENAI_MAX_RETRIES or is_quota_exhausted(e):
+                    raise
+                retry_after = _retry_after_seconds(e)
+                # Full jitter: spread concurrent retries across the window
+                backoff = random.uniform(
+                    0,
+                    min(
+                        settings.OPENAI_BACKOFF_MAX_SECONDS,
+                        settings.OPENAI_BACKOFF_BASE_SECONDS * (2 ** attempt),
+                    ),
+                )
+                if is_rate_limit_error(e):
+                    RETRIES.inc(reason="rate_limit")
+                    self.limiter.penalize(retry_after or backoff)
+                else:
+                    RETRIES.inc(reason="transient")
+                await asyncio.sleep(retry_after if retry_after is not None else backoff)
+                continue
+
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                self.limiter.reconcile(estimated_tokens, usage.total_tokens)
+            return response
+
+    @staticmethod
+    def _estimate_chat_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        return sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+
+    def _record_usage(self, usage: Any, model: Optional[str] = None) -> Dict[str, int]:
+        """Export token usage to metrics and return it as a plain dict."""
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        model = model or self.model
+        TOKEN_USAGE.inc(prompt_tokens, model=model, kind="prompt")
+        if completion_tokens:
+            TOKEN_USAGE.inc(completion_tokens, model=model, kind="completion")
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
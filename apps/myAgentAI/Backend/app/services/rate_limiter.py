@@ -0,0 +1,170 @@
+"""
+myAgentAI - OpenAI Rate Limiter
+=================================
+Token-bucket limiter, one per OpenAI API key, per worker process.
+
+OpenAI enforces RPM/TPM per key across every process using it, while these
+buckets live in process memory. Each worker therefore takes an equal share
+of the configured limits: OPENAI_*_PER_MINUTE / OPENAI_LIMITER_WORKERS
+(default WEB_CONCURRENCY, the worker count uvicorn also reads). Set
+OPENAI_LIMITER_WORKERS to the total across hosts when several share a key.
+
+Each limiter holds two buckets that refill continuously:
+  - requests per minute (RPM)
+  - tokens per minute   (TPM) — charged with an estimate up front and
+    reconciled with the real usage once the response arrives
+
+When OpenAI answers 429 the limiter is paused for the Retry-After window,
+so every concurrent caller on that key backs off together instead of
+each one discovering the limit on its own.
+
+Limiters for per-user keys are evicted like their pooled clients
+(openai_clients.py): once idle for OPENAI_CLIENT_IDLE_SECONDS, or LRU when
+more than OPENAI_CLIENT_CACHE_SIZE are held. An idle limiter's buckets have
+long since refilled, so evicting it loses nothing. The system key's
+limiter is never evicted.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """Stable, non-reversible identifier for an API key."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class TokenBucket:
+    """Continuously refilling bucket of `capacity` units per minute."""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Adjust for the difference between estimated and actual usage."""
+        self.available = min(self.capacity, self.available + amount)
+
+
+class RateLimiter:
+    """RPM + TPM limiter shared by every caller using the same API key."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self.throttled = 0       # Times a caller had to wait
+        self.rate_limited = 0    # 429s reported by OpenAI
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait until one request and `estimated_tokens` fit in the budget."""
+        while True:
+            # No await between check and consume → atomic on the event loop
+            now = time.monotonic()
+            wait = max(
+                self._paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(estimated_tokens, now),
+            )
+            if wait <= 0:
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+                return
+            self.throttled += 1
+            await asyncio.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Refund over-estimates / charge under-estimates after a call."""
+        self.tokens.refund(estimated_tokens - actual_tokens)
+
+    def penalize(self, retry_after: float) -> None:
+        """Pause all callers on this key after a 429."""
+        self.rate_limited += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def state(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self.requests._refill(now)
+        self.tokens._refill(now)
+        return {
+            "requests_available": round(self.requests.available, 1),
+            "requests_per_minute": int(self.requests.capacity),
+            "tokens_available": round(self.tokens.available),
+            "tokens_per_minute": int(self.tokens.capacity),
+            "worker_share": worker_share(),    # Limits above are this worker's slice
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 2),
+            "throttled": self.throttled,
+            "rate_limited": self.rate_limited,
+        }
+
+
+_limiters: "OrderedDict[str, Tuple[RateLimiter, float]]" = OrderedDict()
+
+
+def worker_share() -> int:
+    """Number of processes the configured per-key limits are split across."""
+    return max(1, settings.OPENAI_LIMITER_WORKERS or settings.WEB_CONCURRENCY)
+
+
+def get_rate_limiter(api_key: str) -> RateLimiter:
+    """Return the shared limiter for this API key, creating it on first use."""
+    fingerprint = api_key_fingerprint(api_key)
+    now = time.monotonic()
+
+    entry = _limiters.get(fingerprint)
+    if entry is not None:
+        _limiters[fingerprint] = (entry[0], now)
+        _limiters.move_to_end(fingerprint)
+        return entry[0]
+
+    limiter = RateLimiter(
+        requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE / worker_share(),
+        tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE / worker_share(),
+    )
+    _limiters[fingerprint] = (limiter, now)
+    _evict(now)
+    return limiter
+
+
+def _evict(now: float) -> None:
+    """Drop idle per-user limiters, then LRU until under capacity."""
+    pinned = api_key_fingerprint(settings.OPENAI_API_KEY)
+    for fingerprint, (_, last_used) in list(_limiters.items()):
+        if fingerprint != pinned and now - last_used > settings.OPENAI_CLIENT_IDLE_SECONDS:
+            del _limiters[fingerprint]
+
+    for fingerprint in list(_limiters):
+        if len(_limiters) <= settings.OPENAI_CLIENT_CACHE_SIZE:
+            break
+        if fingerprint != pinned:
+            del _limiters[fingerprint]
+
+
+def get_limiter_states() -> Dict[str, Dict[str, Any]]:
+    """Current state of every limiter, keyed by API key fingerprint."""
+    return {fingerprint: limiter.state() for fingerprint, (limiter, _) in _limiters.items()}
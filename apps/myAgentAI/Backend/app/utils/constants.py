@@ -9,6 +9,40 @@ SUPPORTED_SERVICES = ["openai", "gmail"]
 USER_ONLY_SERVICES = ["gmail"]           # No system fallback allowed
 SYSTEM_FALLBACK_SERVICES = ["openai"]    # Uses system key if user doesn't provide one
 
+# ── OpenAI Pricing (USD per 1M tokens: input, output) ────
+# Used for per-email cost accounting; unknown models count as zero cost.
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+# ── Plans & Admission Limits ─────────────────────────────
+# Per user, enforced on the housekeeper router (app/core/admission.py).
+#   concurrency — requests of that scope in flight at once
+#   per_minute  — sustained request rate (token bucket, burst = per_minute)
+# "pipeline" covers endpoints that spend LLM / embedding / Gmail quota;
+# "read" covers dashboard polling.
+DEFAULT_PLAN = "free"
+PLAN_LIMITS = {
+    "free": {
+        "pipeline": {"concurrency": 2, "per_minute": 10},
+        "read": {"concurrency": 4, "per_minute": 120},
+    },
+    "pro": {
+        "pipeline": {"concurrency": 4, "per_minute": 60},
+        "read": {"concurrency": 8, "per_minute": 600},
+    },
+    "team": {
+        "pipeline": {"concurrency": 8, "per_minute": 240},
+        "read": {"concurrency": 16, "per_minute": 1200},
+    },
+}
+
 # ── Email Priority Labels ────────────────────────────────
 PRIORITY_LABELS = {
     1: "Critical",
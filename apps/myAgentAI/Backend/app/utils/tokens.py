@@ -0,0 +1,40 @@
+"""
+myAgentAI - Token Budget Helpers
+==================================
+Cheap token estimates for prompt budgeting (no tokenizer dependency).
+
+OpenAI models average ~4 characters per token for English text, which is
+close enough for capping prompt inputs.
+"""
+
+import math
+from typing import Dict
+
+from app.utils.constants import MODEL_PRICING
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of `text`."""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim `text` to roughly `max_tokens`, cutting on a word boundary."""
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max_tokens * CHARS_PER_TOKEN
+    cut = text[:limit]
+    if " " in cut:
+        cut = cut[: cut.rfind(" ")]
+    return cut.rstrip() + "…"
+
+
+def estimate_cost_usd(model: str, usage: Dict[str, int]) -> float:
+    """Dollar cost of one call from its token usage."""
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (
+        usage.get("prompt_tokens", 0) * input_price
+        + usage.get("completion_tokens", 0) * output_price
+    ) / 1_000_000
@@ -0,0 +1 @@
+# Offline benchmarks — run without OpenAI, Qdrant or Gmail
@@ -0,0 +1,230 @@
+"""
+myAgentAI - Benchmark Stand-ins
+=================================
+Deterministic local replacements for the external services used by the
+email pipeline. Each one mimics the real interface and sleeps for a
+configurable latency so throughput numbers stay comparable between runs.
+
+  FakeOpenAIService   → OpenAIService       (async sleep, hash-based output)
+  FakeVectorService   → EmailVectorService  (in-memory cosine search)
+  FakeGmailClient     → GmailClient         (blocking sleep, like the real SDK)
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.tokens import estimate_tokens, truncate_to_tokens
+
+
+@dataclass
+class LatencyProfile:
+    """Injected latency per external call, in milliseconds."""
+    llm_ms: float = 400.0
+    embedding_ms: float = 80.0
+    vector_search_ms: float = 15.0
+    gmail_list_ms: float = 150.0
+    gmail_get_ms: float = 60.0
+    jitter: float = 0.1         # ± fraction applied to every sleep
+    seed: int = 42
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Latency:
+    """Seeded jittered sleeps shared by all stand-ins of one benchmark."""
+
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+        self._rng = random.Random(profile.seed)
+
+    def seconds(self, ms: float) -> float:
+        spread = ms * self.profile.jitter
+        return max(0.0, ms + self._rng.uniform(-spread, spread)) / 1000
+
+    async def async_sleep(self, ms: float) -> None:
+        await asyncio.sleep(self.seconds(ms))
+
+    def blocking_sleep(self, ms: float) -> None:
+        time.sleep(self.seconds(ms))
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+# ── OpenAI ───────────────────────────────────────────────
+
+class FakeOpenAIService:
+    """Drop-in for OpenAIService with deterministic answers."""
+
+    VECTOR_SIZE = 1536
+
+    def __init__(self, latency: _Latency):
+        self.latency = latency
+        self.model = "fake-llm"
+        self.embedding_model = "fake-embedding"
+        self.calls = {"chat": 0, "embedding": 0}
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+    ) -> str:
+        self.calls["chat"] += 1
+        await self.latency.async_sleep(self.latency.profile.llm_ms)
+        digest = _digest(messages[-1]["content"])
+        priority = digest[0] % 5 + 1
+        action = ("keep", "delete", "needs_review")[digest[1] % 3]
+        confidence = round(0.5 + (digest[2] / 255) * 0.5, 3)
+        return json.dumps({
+            "priority": priority,
+            "action": action,
+            "confidence": confidence,
+            "reasoning": "benchmark",
+        })
+
+    async def structured_completion(
+        self,
+        messages: List[Dict[str, str]],
+        schema: Dict[str, Any],
+        schema_name: str,
+        temperature: float = 0.0,
+        max_tokens: int = 200,
+        model: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        result = json.loads(await self.chat_completion(messages, temperature, max_tokens))
+        if "reasoning" not in schema["properties"]:
+            result.pop("reasoning")
+        usage = {
+            "prompt_tokens": estimate_tokens(messages[-1]["content"]),
+            "completion_tokens": estimate_tokens(json.dumps(result)),
+        }
+        return result, usage
+
+    async def create_embedding(self, text: str, dimensions: Optional[int] = None) -> List[float]:
+        self.calls["embedding"] += 1
+        await self.latency.async_sleep(self.latency.profile.embedding_ms)
+        return _embed(text, dimensions or self.VECTOR_SIZE)
+
+
+def _embed(text: str, size: int) -> List[float]:
+    """Stable pseudo-embedding: seeded from the text hash, unit length."""
+    rng = random.Random(_digest(text))
+    vector = [rng.uniform(-1.0, 1.0) for _ in range(size)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+# ── Vector Memory ────────────────────────────────────────
+
+class FakeVectorService:
+    """In-memory, user-scoped replacement for EmailVectorService."""
+
+    def __init__(self, openai_service: FakeOpenAIService, latency: _Latency):
+        self.openai_service = openai_service
+        self.latency = latency
+        self._points: Dict[int, List[Dict[str, Any]]] = {}
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        return await self.openai_service.create_embedding(text)
+
+    async def store_memory(
+        self,
+        user_id: int,
+        text: str,
+        embedding: List[float],
+        action: str,
+        priority: int,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        point_id = hashlib.md5(f"{user_id}:{text}".encode()).hexdigest()
+        self._points.setdefault(user_id, []).append({
+            "id": point_id,
+            "vector": embedding,
+            "action": action,
+            "priority": priority,
+            "text": text,
+            "votes": 1,
+        })
+        return point_id
+
+    async def find_similar(
+        self,
+        user_id: int,
+        embedding: List[float],
+        top_k: int = 5,
+    ) -> List[Dict[str, Any]]:
+        await self.latency.async_sleep(self.latency.profile.vector_search_ms)
+        scored = [
+            {
+                "score": sum(a * b for a, b in zip(embedding, p["vector"])),
+                "action": p["action"],
+                "priority": p["priority"],
+                "text": p["text"],
+                "votes": p["votes"],
+            }
+            for p in self._points.get(user_id, [])
+        ]
+        scored.sort(key=lambda m: m["score"], reverse=True)
+        return scored[:top_k]
+
+
+# ── Gmail ────────────────────────────────────────────────
+
+_SUBJECTS = [
+    "URGENT: Server Down - Production Alert",
+    "Weekly Newsletter - Tech Updates",
+    "Your Order Has Shipped",
+    "Meeting Tomorrow at 10 AM",
+    "You've Won a Free Phone!!!",
+    "Invoice #{n}",
+    "Pull Request Review Requested",
+    "Lunch plans?",
+    "Password Reset Request",
+    "50% OFF Everything - Limited Time!",
+]
+
+
+class FakeGmailClient:
+    """Synthetic inbox; every fetch returns fresh, never-seen message ids."""
+
+    _sequence = itertools.count()
+
+    def __init__(self, token_data: str, latency: _Latency):
+        self.token_data = token_data
+        self.latency = latency
+
+    def fetch_emails(self, max_results: int = 50) -> List[Dict[str, Any]]:
+        self.latency.blocking_sleep(self.latency.profile.gmail_list_ms)
+        emails = []
+        for _ in range(max_results):
+            self.latency.blocking_sleep(self.latency.profile.gmail_get_ms)
+            n = next(self._sequence)
+            subject = _SUBJECTS[n % len(_SUBJECTS)].format(n=n)
+            emails.append({
+                "email_id": f"bench_{n:08d}",
+                "thread_id": f"bench_{n:08d}",  # One message per thread
+                "internal_date": n,
+                "subject": subject,
+                "sender": f"sender{n % 37}@example.com",
+                "snippet": f"{subject} — synthetic body #{n} for throughput testing.",
+            })
+        return emails
+
+    def fetch_body(self, email_id: str, max_tokens: int) -> str:
+        self.latency.blocking_sleep(self.latency.profile.gmail_get_ms)
+        body = f"Full body of {email_id}. " + "Lorem ipsum dolor sit amet. " * 40
+        return truncate_to_tokens(body, max_tokens)
+
+    def trash_email(self, email_id: str) -> bool:
+        self.latency.blocking_sleep(self.latency.profile.gmail_get_ms)
+        return True
@@ -0,0 +1,214 @@
+"""
+Move Qdrant memories to a reduced embedding size and measure the recall cost.
+
+    python migrate_embeddings.py --target-dims 256                  # copy + recall report
+    python migrate_embeddings.py --target-dims 256 --mode reembed   # call the embeddings API
+    python migrate_embeddings.py --target-dims 256 --recall-only    # re-measure, no copy
+    python migrate_embeddings.py --target-dims 256 --json
+
+Modes:
+  truncate  Keep the first N components and re-normalise. For
+            text-embedding-3-* this is what the API's `dimensions` does, so
+            it costs no API calls and also works for compacted (centroid)
+            memories, which have no single source text.
+  reembed   Embed each memory's stored text again with `dimensions=N`.
+
+Point ids and payloads are preserved, so the old collection stays intact as
+a rollback. Recall@k compares, for sampled memories, the user-filtered
+top-k of the old collection (exact search) with the new one (quantized,
+with and without re-rank). Switch over by setting EMBEDDING_DIMENSIONS=N.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from typing import Any, Dict, List
+
+from app.core.config import get_settings
+from app.services.openai_service import OpenAIService
+from app.sections.personal_management.email_housekeeper.vector_service import (
+    EmailVectorService,
+    NATIVE_DIMENSIONS,
+    _get_client,
+    collection_name,
+    create_memory_collection,
+    search_params,
+)
+
+settings = get_settings()
+
+
+def truncate_vector(vector: List[float], dimensions: int) -> List[float]:
+    head = vector[:dimensions]
+    norm = math.sqrt(sum(v * v for v in head)) or 1.0
+    return [v / norm for v in head]
+
+
+async def copy_points(args, client, source: str, target: str) -> int:
+    openai_service = OpenAIService() if args.mode == "reembed" else None
+    copied, offset = 0, None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source,
+            limit=args.batch,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        batch = []
+        for p in points:
+            if args.mode == "reembed" and p.payload.get("text"):
+                vector = await openai_service.create_embedding(
+                    p.payload["text"], dimensions=args.target_dims
+                )
+            else:
+                vector = truncate_vector(p.vector, args.target_dims)
+            batch.append({"id": str(p.id), "vector": vector, "payload": p.payload})
+        if batch:
+            client.upsert(
+                collection_name=target,
+                points=[_point(m) for m in batch],
+            )
+            copied += len(batch)
+            print(f"   copied {copied} points")
+        if offset is None:
+            return copied
+
+
+def _point(memory: Dict[str, Any]):
+    from qdrant_client.models import PointStruct
+
+    return PointStruct(id=memory["id"], vector=memory["vector"], payload=memory["payload"])
+
+
+def measure_recall(args, client, source: str, target: str) -> Dict[str, Any]:
+    from qdrant_client.models import SearchParams
+
+    # Sample memories to use as queries (reservoir over the source collection)
+    rng = random.Random(args.seed)
+    sample, seen, offset = [], 0, None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source, limit=256, offset=offset,
+            with_payload=["user_id"], with_vectors=True,
+        )
+        for p in points:
+            seen += 1
+            if len(sample) < args.recall_samples:
+                sample.append(p)
+            elif (j := rng.randrange(seen)) < args.recall_samples:
+                sample[j] = p
+        if offset is None:
+            break
+    if not sample:
+        return {"samples": 0}
+
+    reduced = {
+        str(p.id): p.vector
+        for p in client.retrieve(
+            collection_name=target, ids=[p.id for p in sample], with_vectors=True,
+        )
+    }
+
+    timings: Dict[str, List[float]] = {}
+
+    def top_ids(collection, vector, user_id, params) -> List[str]:
+        started = time.perf_counter()
+        hits = client.search(
+            collection_name=collection,
+            query_vector=vector,
+            query_filter=EmailVectorService._user_filter(user_id),
+            search_params=params,
+            limit=args.top_k + 1,  # The query memory itself is in the collection
+        )
+        timings[collection].append(time.perf_counter() - started)
+        return [str(h.id) for h in hits]
+
+    results = {}
+    for label, params in (
+        ("rescored", search_params(rescore=True)),
+        ("quantized_only", search_params(rescore=False)),
+    ):
+        timings.update({source: [], target: []})
+        recalls = []
+        for p in sample:
+            if str(p.id) not in reduced:
+                continue
+            user_id = p.payload["user_id"]
+            truth = [i for i in top_ids(source, p.vector, user_id, SearchParams(exact=True))
+                     if i != str(p.id)][:args.top_k]
+            found = [i for i in top_ids(target, reduced[str(p.id)], user_id, params)
+                     if i != str(p.id)][:args.top_k]
+            if truth:
+                recalls.append(len(set(truth) & set(found)) / len(truth))
+        results[label] = {
+            f"recall@{args.top_k}": round(sum(recalls) / len(recalls), 4) if recalls else None,
+            "target_search_ms": round(1000 * sum(timings[target]) / max(len(timings[target]), 1), 2),
+            "source_exact_ms": round(1000 * sum(timings[source]) / max(len(timings[source]), 1), 2),
+        }
+    results["samples"] = len(sample)
+    return results
+
+
+async def run(args) -> Dict[str, Any]:
+    client = _get_client()
+    source = collection_name(args.source_dims)
+    target = collection_name(args.target_dims)
+    if source == target:
+        raise SystemExit("Source and target dimensions are the same")
+
+    report: Dict[str, Any] = {
+        "source": source,
+        "target": target,
+        "mode": args.mode,
+        # RAM per vector: float32 originals vs int8 (when quantized, originals go to disk)
+        "ram_bytes_per_vector": {
+            "source": args.source_dims * 4,
+            "target": args.target_dims * (1 if settings.VECTOR_QUANTIZATION else 4),
+        },
+    }
+    if not args.recall_only:
+        existing = {c.name for c in client.get_collections().collections}
+        if target not in existing:
+            create_memory_collection(client, target, args.target_dims)
+        report["copied"] = await copy_points(args, client, source, target)
+    report["recall"] = measure_recall(args, client, source, target)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate memories to reduced-dimension embeddings")
+    parser.add_argument("--source-dims", type=int, default=NATIVE_DIMENSIONS)
+    parser.add_argument("--target-dims", type=int, default=settings.EMBEDDING_DIMENSIONS)
+    parser.add_argument("--mode", choices=("truncate", "reembed"), default="truncate")
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--recall-only", action="store_true", help="Skip the copy")
+    parser.add_argument("--recall-samples", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args()
+    if not 0 < args.target_dims < args.source_dims:
+        parser.error("--target-dims must be between 1 and --source-dims")
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\n📦 {report['source']} → {report['target']} ({report['mode']})")
+    if "copied" in report:
+        print(f"   copied: {report['copied']} points")
+    ram = report["ram_bytes_per_vector"]
+    print(f"   RAM per vector: {ram['source']} B → {ram['target']} B")
+    for label, result in report["recall"].items():
+        if isinstance(result, dict):
+            print(f"   {label}: {result}")
+    print(f"   samples: {report['recall'].get('samples', 0)}")
+
+
+if __name__ == "__main__":
+    main()
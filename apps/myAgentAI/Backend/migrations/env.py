@@ -0,0 +1,56 @@
+"""
+myAgentAI - Alembic Environment
+=================================
+Runs revisions against settings.DATABASE_URL over the async driver.
+
+New tables are still created by `create_all` at startup; revisions cover
+what create_all cannot do — columns, indexes and constraints on tables that
+already exist, and raw-DDL tables outside the ORM (the pgvector memory
+table, u046). Every revision checks the live schema first (see helpers.py),
+so `alembic upgrade head` is safe on any database: one created before the
+change, one create_all already built in full, or an empty one.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.db.base import Base
+
+# Register every model on Base.metadata (autogenerate compares against it)
+from app.models import api_keys, job_lease, user  # noqa: F401
+from app.sections.personal_management.email_housekeeper import models  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+settings = get_settings()
+target_metadata = Base.metadata
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",  # SQLite can't ALTER constraints
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    raise SystemExit("Offline (--sql) mode is not supported: revisions inspect the live schema")
+
+asyncio.run(run_migrations_online())
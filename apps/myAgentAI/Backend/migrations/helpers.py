@@ -0,0 +1,76 @@
+"""
+myAgentAI - Idempotent Schema Operations
+==========================================
+Wrappers around alembic `op` that look at the live schema first:
+
+  - a missing table is skipped — create_all builds it whole at startup
+  - a column / index that already exists is left alone
+
+so a revision applies cleanly whether or not create_all got there first.
+"""
+
+from typing import List
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def _inspector() -> sa.engine.Inspector:
+    return sa.inspect(op.get_bind())  # Fresh each call: no stale reflection cache
+
+
+def dialect() -> str:
+    return op.get_bind().dialect.name
+
+
+def has_table(table: str) -> bool:
+    return _inspector().has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    return any(c["name"] == column for c in _inspector().get_columns(table))
+
+
+def has_index(table: str, name: str) -> bool:
+    return any(i["name"] == name for i in _inspector().get_indexes(table))
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    if has_table(table) and not has_column(table, column.name):
+        op.add_column(table, column)
+
+
+def drop_column(table: str, column: str) -> None:
+    if has_table(table) and has_column(table, column):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(column)
+
+
+def create_index(name: str, table: str, columns: List[str], unique: bool = False) -> None:
+    if has_table(table) and not has_index(table, name):
+        op.create_index(name, table, columns, unique=unique)
+
+
+def drop_index(name: str, table: str) -> None:
+    if has_table(table) and has_index(table, name):
+        op.drop_index(name, table_name=table)
+
+
+def execute_on(url: str, statements: List[str]) -> None:
+    """
+    Run raw DDL on another database (e.g. PGVECTOR_URL). Revisions execute
+    inside env.py's run_sync greenlet, so the async engine can be awaited.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.util import await_only
+
+    async def run() -> None:
+        engine = create_async_engine(url, poolclass=sa.pool.NullPool)
+        try:
+            async with engine.begin() as conn:
+                for statement in statements:
+                    await conn.execute(sa.text(statement))
+        finally:
+            await engine.dispose()
+
+    await_only(run())
@@ -0,0 +1,29 @@
+"""Add LLM token usage to email_records
+
+Revision ID: u029_token_usage
+Revises: 
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u029_token_usage'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("email_records", sa.Column("prompt_tokens", sa.Integer()))
+    add_column("email_records", sa.Column("completion_tokens", sa.Integer()))
+
+
+def downgrade() -> None:
+    drop_column("email_records", "completion_tokens")
+    drop_column("email_records", "prompt_tokens")
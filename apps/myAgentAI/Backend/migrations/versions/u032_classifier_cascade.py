@@ -0,0 +1,31 @@
+"""Add classifier cascade accounting to email_records
+
+Revision ID: u032_classifier_cascade
+Revises: u029_token_usage
+Create Date: 2026-10-19 09:01:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u032_classifier_cascade'
+down_revision: Union[str, None] = 'u029_token_usage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("email_records", sa.Column("classifier_tier", sa.String(20)))
+    add_column("email_records", sa.Column("classification_cost_usd", sa.Float()))
+    add_column("email_records", sa.Column("classification_latency_ms", sa.Float()))
+
+
+def downgrade() -> None:
+    drop_column("email_records", "classification_latency_ms")
+    drop_column("email_records", "classification_cost_usd")
+    drop_column("email_records", "classifier_tier")
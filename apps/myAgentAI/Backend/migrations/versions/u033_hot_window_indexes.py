@@ -0,0 +1,29 @@
+"""Index the (user, time) windows used by hot queries
+
+Revision ID: u033_hot_window_indexes
+Revises: u032_classifier_cascade
+Create Date: 2026-10-19 09:02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index, drop_index
+
+# revision identifiers, used by Alembic.
+revision: str = 'u033_hot_window_indexes'
+down_revision: Union[str, None] = 'u032_classifier_cascade'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index("ix_email_records_user_processed", "email_records", ["user_id", "processed_at"])
+    create_index("ix_feedback_records_user_created", "feedback_records", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    drop_index("ix_feedback_records_user_created", "feedback_records")
+    drop_index("ix_email_records_user_processed", "email_records")
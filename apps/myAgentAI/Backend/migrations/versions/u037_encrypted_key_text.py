@@ -0,0 +1,36 @@
+"""Widen user_api_keys.encrypted_key to TEXT for Fernet tokens
+
+Revision ID: u037_encrypted_key_text
+Revises: u033_hot_window_indexes
+Create Date: 2026-10-19 09:03:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import dialect, has_table
+
+# revision identifiers, used by Alembic.
+revision: str = 'u037_encrypted_key_text'
+down_revision: Union[str, None] = 'u033_hot_window_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite doesn't enforce VARCHAR lengths; only Postgres needs the change
+    if dialect() == "postgresql" and has_table("user_api_keys"):
+        op.alter_column(
+            "user_api_keys", "encrypted_key",
+            type_=sa.Text(), existing_type=sa.String(500), existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    if dialect() == "postgresql" and has_table("user_api_keys"):
+        op.alter_column(
+            "user_api_keys", "encrypted_key",
+            type_=sa.String(500), existing_type=sa.Text(), existing_nullable=False,
+        )
@@ -0,0 +1,29 @@
+"""Add cached decision explanations to email_records
+
+Revision ID: u039_explanations
+Revises: u037_encrypted_key_text
+Create Date: 2026-10-19 09:04:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u039_explanations'
+down_revision: Union[str, None] = 'u037_encrypted_key_text'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("email_records", sa.Column("explanation", sa.Text()))
+    add_column("email_records", sa.Column("explained_at", sa.DateTime(timezone=True)))
+
+
+def downgrade() -> None:
+    drop_column("email_records", "explained_at")
+    drop_column("email_records", "explanation")
@@ -0,0 +1,28 @@
+"""Add Gmail thread_id to email_records
+
+Revision ID: u040_thread_id
+Revises: u039_explanations
+Create Date: 2026-10-19 09:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u040_thread_id'
+down_revision: Union[str, None] = 'u039_explanations'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # email_thread_records is a new table; create_all creates it at startup
+    add_column("email_records", sa.Column("thread_id", sa.String(255)))
+
+
+def downgrade() -> None:
+    drop_column("email_records", "thread_id")
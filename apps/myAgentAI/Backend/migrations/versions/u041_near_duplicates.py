@@ -0,0 +1,29 @@
+"""Add near-duplicate links to email_records
+
+Revision ID: u041_near_duplicates
+Revises: u040_thread_id
+Create Date: 2026-10-19 09:06:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u041_near_duplicates'
+down_revision: Union[str, None] = 'u040_thread_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("email_records", sa.Column("duplicate_of", sa.String(255)))
+    add_column("email_records", sa.Column("duplicate_similarity", sa.Float()))
+
+
+def downgrade() -> None:
+    drop_column("email_records", "duplicate_similarity")
+    drop_column("email_records", "duplicate_of")
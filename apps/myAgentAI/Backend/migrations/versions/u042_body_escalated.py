@@ -0,0 +1,27 @@
+"""Flag body-escalated classifications on email_records
+
+Revision ID: u042_body_escalated
+Revises: u041_near_duplicates
+Create Date: 2026-10-19 09:07:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u042_body_escalated'
+down_revision: Union[str, None] = 'u041_near_duplicates'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column("email_records", sa.Column("body_escalated", sa.Boolean()))
+
+
+def downgrade() -> None:
+    drop_column("email_records", "body_escalated")
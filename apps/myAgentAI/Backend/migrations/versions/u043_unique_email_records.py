@@ -0,0 +1,56 @@
+"""One email_records row per (user_id, email_id)
+
+Revision ID: u043_unique_email_records
+Revises: u042_body_escalated
+Create Date: 2026-10-19 11:02:00
+
+Overlapping runs (live, push, a re-claimed backfill page) could store the
+same message twice. Duplicates are collapsed onto the oldest row — feedback
+pointing at a dropped copy is moved to it — before the unique index is
+built.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import create_index, drop_index, has_index, has_table
+
+# revision identifiers, used by Alembic.
+revision: str = 'u043_unique_email_records'
+down_revision: Union[str, None] = 'u042_body_escalated'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "uq_email_records_user_email"
+
+
+def upgrade() -> None:
+    if not has_table("email_records") or has_index("email_records", INDEX):
+        return
+    if has_table("feedback_records"):
+        op.execute(sa.text("""
+            UPDATE feedback_records SET email_record_id = (
+                SELECT MIN(keep.id) FROM email_records keep
+                JOIN email_records dup
+                  ON dup.user_id = keep.user_id AND dup.email_id = keep.email_id
+                WHERE dup.id = feedback_records.email_record_id
+            )
+            WHERE email_record_id IN (
+                SELECT r.id FROM email_records r
+                WHERE r.id > (
+                    SELECT MIN(k.id) FROM email_records k
+                    WHERE k.user_id = r.user_id AND k.email_id = r.email_id
+                )
+            )
+        """))
+    op.execute(sa.text("""
+        DELETE FROM email_records WHERE id NOT IN (
+            SELECT MIN(id) FROM email_records GROUP BY user_id, email_id
+        )
+    """))
+    create_index(INDEX, "email_records", ["user_id", "email_id"], unique=True)
+
+
+def downgrade() -> None:
+    drop_index(INDEX, "email_records")
@@ -0,0 +1,54 @@
+"""Create the pgvector memory table, partitions and HNSW index
+
+Revision ID: u046_pgvector_memories
+Revises: u048_user_plan
+Create Date: 2026-10-19 14:05:00
+
+Only with VECTOR_BACKEND=pgvector. The DDL comes from
+pgvector_service.schema_statements() for the current settings (table name
+by EMBEDDING_DIMENSIONS, PGVECTOR_PARTITIONS, HNSW parameters). With
+PGVECTOR_URL set it runs against that database, without the foreign key
+to users. CREATE EXTENSION needs a role allowed to create it.
+
+Switching to pgvector, or changing EMBEDDING_DIMENSIONS, after this has
+run: `alembic downgrade u048_user_plan && alembic upgrade head`. The
+downgrade only drops the table for the new settings, which doesn't exist
+yet.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import get_settings
+from app.sections.personal_management.email_housekeeper.pgvector_service import (
+    TABLE_NAME, schema_statements,
+)
+from migrations.helpers import dialect, execute_on
+
+# revision identifiers, used by Alembic.
+revision: str = 'u046_pgvector_memories'
+down_revision: Union[str, None] = 'u048_user_plan'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+settings = get_settings()
+
+
+def _run(statements) -> None:
+    if settings.VECTOR_BACKEND != "pgvector":
+        return
+    if settings.PGVECTOR_URL:
+        execute_on(settings.PGVECTOR_URL, statements)
+    elif dialect() == "postgresql":
+        for statement in statements:
+            op.execute(sa.text(statement))
+
+
+def upgrade() -> None:
+    _run(schema_statements(foreign_key=not settings.PGVECTOR_URL))
+
+
+def downgrade() -> None:
+    # Partitions and their indexes go with the parent; the extension stays
+    _run([f"DROP TABLE IF EXISTS {TABLE_NAME}"])
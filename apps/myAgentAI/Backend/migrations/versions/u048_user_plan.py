@@ -0,0 +1,31 @@
+"""Add users.plan for per-plan admission limits
+
+Revision ID: u048_user_plan
+Revises: u043_unique_email_records
+Create Date: 2026-10-19 11:20:00
+
+Existing users get the "free" plan through the server default.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_column, drop_column
+
+# revision identifiers, used by Alembic.
+revision: str = 'u048_user_plan'
+down_revision: Union[str, None] = 'u043_unique_email_records'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    add_column(
+        "users",
+        sa.Column("plan", sa.String(20), nullable=False, server_default="free"),
+    )
+
+
+def downgrade() -> None:
+    drop_column("users", "plan")
@@ -0,0 +1,77 @@
+"""
+Local stand-in for the Gmail → Pub/Sub push path.
+
+Posts Pub/Sub-shaped envelopes to /email/push, the way a push subscription
+would, so the debounce/coalescing behaviour can be exercised without a
+Google Cloud project.
+
+    python push_stub.py --email you@example.com                  # one burst of 10
+    python push_stub.py --email you@example.com --burst 25 --interval 0.2
+    python push_stub.py --email you@example.com --bursts 3 --gap 40
+
+Requires GMAIL_PUSH_VERIFICATION_TOKEN to be set on the server (and passed
+here with --token, defaulting to the same setting). Watch the server log for
+"Push run for user ..." — one line per burst, not per notification.
+
+historyIds are synthetic, which is harmless: the server only validates them.
+Each run starts from the checkpoint stored in gmail_push_state (and resyncs
+from an inbox listing when there is none), not from the notification.
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import time
+
+import httpx
+
+from app.core.config import get_settings
+
+_message_ids = itertools.count(1)
+
+
+def envelope(email_address: str, history_id: int) -> dict:
+    data = json.dumps({"emailAddress": email_address, "historyId": history_id})
+    return {
+        "message": {
+            "data": base64.b64encode(data.encode("utf-8")).decode("ascii"),
+            "messageId": str(next(_message_ids)),
+            "publishTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "subscription": "projects/local/subscriptions/gmail-push-stub",
+    }
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Publish fake Gmail push notifications")
+    parser.add_argument("--email", required=True, help="Mailbox address (a user's email)")
+    parser.add_argument("--url", default="http://localhost:8000/email/push")
+    parser.add_argument("--token", default=settings.GMAIL_PUSH_VERIFICATION_TOKEN)
+    parser.add_argument("--burst", type=int, default=10, help="Notifications per burst")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between notifications")
+    parser.add_argument("--bursts", type=int, default=1)
+    parser.add_argument("--gap", type=float, default=30.0, help="Seconds between bursts")
+    parser.add_argument("--history-id", type=int, default=int(time.time()))
+    args = parser.parse_args()
+
+    history_id = args.history_id
+    with httpx.Client(timeout=10) as client:
+        for burst in range(args.bursts):
+            if burst:
+                time.sleep(args.gap)
+            for _ in range(args.burst):
+                history_id += 1
+                response = client.post(
+                    args.url,
+                    params={"token": args.token},
+                    json=envelope(args.email, history_id),
+                )
+                print(f"   historyId={history_id} → {response.status_code} {response.json().get('message')}")
+                time.sleep(args.interval)
+            print(f"📨 Burst {burst + 1}/{args.bursts}: {args.burst} notifications sent")
+
+
+if __name__ == "__main__":
+    main()
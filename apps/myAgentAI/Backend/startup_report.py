@@ -0,0 +1,56 @@
+"""
+Startup cost report for the API worker.
+
+    python startup_report.py            # import costs + init_models timing
+    python startup_report.py --no-db    # import costs only
+    python startup_report.py --json     # machine-readable (CI / diffing)
+
+Run it before and after a change — a regression shows up as a module
+climbing the list or a heavy SDK appearing in `heavy_modules_loaded`.
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.core.startup_profile import measure_import_costs
+
+
+async def _measure_init_models() -> dict:
+    # Imported here so the report's own imports don't skew the numbers above
+    import app.main  # noqa: F401  — records the import_app phase
+    from app.core.startup_profile import get_startup_report, profile_phase
+    from app.db.init_db import init_models
+
+    with profile_phase("init_models"):
+        await init_models()
+    return get_startup_report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report API worker startup cost")
+    parser.add_argument("--top", type=int, default=20, help="Modules to list")
+    parser.add_argument("--no-db", action="store_true", help="Skip init_models")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    args = parser.parse_args()
+
+    report = {"imports": measure_import_costs("app.main", top=args.top)}
+    if not args.no_db:
+        report.update(asyncio.run(_measure_init_models()))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("\n⏱️  Import cost of app.main (cumulative)")
+    for entry in report["imports"]:
+        print(f"   {entry['cumulative_us'] / 1000:9.1f} ms  {entry['module']}")
+    for phase, ms in report.get("phases_ms", {}).items():
+        print(f"\n   {phase}: {ms} ms")
+    if "heavy_modules_loaded" in report:
+        loaded = report["heavy_modules_loaded"]
+        print(f"\n   Heavy SDKs loaded at startup: {', '.join(loaded) if loaded else 'none ✅'}")
+
+
+if __name__ == "__main__":
+    main()